@@ -27,6 +27,7 @@ from .ansi import (
     EightBitFg,
     RgbBg,
     RgbFg,
+    StyledText,
     TextStyle,
     style,
 )
@@ -78,6 +79,7 @@ __all__: List[str] = [
     'EightBitFg',
     'RgbBg',
     'RgbFg',
+    'StyledText',
     'TextStyle',
     'style',
     # Argparse Exports
@@ -11,13 +11,16 @@ from enum import (
 from typing import (
     IO,
     Any,
+    Iterable,
     List,
+    NamedTuple,
     Optional,
     cast,
 )
 
 from wcwidth import (  # type: ignore[import]
     wcswidth,
+    wcwidth,
 )
 
 #######################################################
@@ -90,9 +93,44 @@ def strip_style(text: str) -> str:
     :param text: string which may contain ANSI style sequences
     :return: the same string with any ANSI style sequences removed
     """
+    if isinstance(text, StyledText):
+        return text.plain
     return ANSI_STYLE_RE.sub('', text)
 
 
+# Maximum number of characters whose widths are remembered by _char_width()
+_CHAR_WIDTH_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_CHAR_WIDTH_CACHE_SIZE)
+def _char_width(char: str) -> int:
+    """Cached wrapper around wcwidth for a single character"""
+    return cast(int, wcwidth(char))
+
+
+def _unstyled_wcswidth(text: str) -> int:
+    """
+    Return the same width as wcswidth for a string which has no ANSI style sequences
+
+    :param text: the string being measured
+    :return: width of text or -1 if it contains characters with no absolute width
+    """
+    # Printable ASCII characters are always one column wide
+    if text.isascii() and text.isprintable():
+        return len(text)
+
+    # wcswidth measures zero width joiner and variation selector 16 sequences as a whole
+    if '\u200d' in text or '\ufe0f' in text:
+        return cast(int, wcswidth(text))
+
+    width = 0
+    for char_width in map(_char_width, text):
+        if char_width < 0:
+            return -1
+        width += char_width
+    return width
+
+
 def style_aware_wcswidth(text: str) -> int:
     """
     Wrap wcswidth to make it compatible with strings that contain ANSI style sequences.
@@ -104,8 +142,27 @@ def style_aware_wcswidth(text: str) -> int:
              If text contains characters with no absolute width (i.e. tabs),
              then this function returns -1. Replace tabs with spaces before calling this.
     """
+    if isinstance(text, StyledText):
+        return text.width
+
     # Strip ANSI style sequences since they cause wcswidth to return -1
-    return cast(int, wcswidth(strip_style(text)))
+    if ESC in text:
+        text = strip_style(text)
+    return _unstyled_wcswidth(text)
+
+
+def style_aware_wcswidths(texts: Iterable[str]) -> List[int]:
+    """
+    Measure several strings at once. This returns the same widths as calling style_aware_wcswidth()
+    on each string, but is faster when measuring many strings.
+
+    :param texts: the strings being measured
+    :return: list containing the width of each string, or -1 for strings which style_aware_wcswidth() can't measure
+    """
+    return [
+        len(text) if text.isascii() and text.isprintable() else _unstyled_wcswidth(strip_style(text) if ESC in text else text)
+        for text in texts
+    ]
 
 
 def widest_line(text: str) -> int:
@@ -121,13 +178,149 @@ def widest_line(text: str) -> int:
     if not text:
         return 0
 
-    lines_widths = [style_aware_wcswidth(line) for line in text.splitlines()]
+    lines_widths = style_aware_wcswidths(text.splitlines())
     if -1 in lines_widths:
         return -1
 
     return max(lines_widths)
 
 
+class StyledSegment(NamedTuple):
+    """A run of text in a StyledText along with the ANSI style sequences which precede it"""
+
+    style: str
+    text: str
+    width: int
+
+
+class StyledText(str):
+    """
+    String which is split into its text and ANSI style sequences when it is created
+
+    Since StyledText is a str, it can be used anywhere a string is expected. strip_style(), style_aware_wcswidth(),
+    utils.align_text(), utils.truncate_line(), TableCreator.generate_row(), and Cmd.poutput() recognize it and use
+    the results of this split instead of searching the string for style sequences again. This helps when the
+    same styled string is measured and rendered multiple times.
+
+    Methods inherited from str (e.g. replace() and upper()) return a str, not a StyledText.
+    """
+
+    def __new__(cls, value: object = '') -> 'StyledText':
+        return super(StyledText, cls).__new__(cls, value)
+
+    def __init__(self, value: object = '') -> None:
+        """
+        StyledText Initializer
+
+        :param value: object to convert to a string and split
+        """
+        super().__init__()
+        self._width: Optional[int] = None
+        self._segments: Optional[List[StyledSegment]] = None
+
+        # Index in self.plain where each style sequence occurs
+        self.style_indexes: List[int] = []
+
+        # The style sequences found in this string
+        self.styles: List[str] = []
+
+        # This string without its style sequences
+        self.plain = ''
+
+        # Don't split a StyledText again
+        if isinstance(value, StyledText):
+            self._width = value._width
+            self._segments = value._segments
+            self.style_indexes = value.style_indexes
+            self.styles = value.styles
+            self.plain = value.plain
+            return
+
+        text_parts: List[str] = []
+        text_len = 0
+        prev_end = 0
+        for match in ANSI_STYLE_RE.finditer(self):
+            text_part = self[prev_end : match.start()]
+            text_parts.append(text_part)
+            text_len += len(text_part)
+            self.style_indexes.append(text_len)
+            self.styles.append(match.group())
+            prev_end = match.end()
+        text_parts.append(self[prev_end:])
+        self.plain = ''.join(text_parts)
+
+    @classmethod
+    def from_parts(cls, plain: str, style_indexes: List[int], styles: List[str]) -> 'StyledText':
+        """
+        Build a StyledText from text and the style sequences to insert into it without searching for style sequences
+
+        :param plain: text which contains no style sequences
+        :param style_indexes: index in plain where each style sequence occurs. These must be in ascending order.
+        :param styles: style sequences to insert into plain
+        :return: the StyledText
+        """
+        parts: List[str] = []
+        prev_index = 0
+        for style_index, style in zip(style_indexes, styles):
+            parts.append(plain[prev_index:style_index])
+            parts.append(style)
+            prev_index = style_index
+        parts.append(plain[prev_index:])
+
+        styled_text = super(StyledText, cls).__new__(cls, ''.join(parts))
+        styled_text._width = None
+        styled_text._segments = None
+        styled_text.style_indexes = list(style_indexes)
+        styled_text.styles = list(styles)
+        styled_text.plain = plain
+        return styled_text
+
+    @property
+    def width(self) -> int:
+        """
+        The display width of this string. This has the same value and restrictions as style_aware_wcswidth().
+        If the text contains characters with no absolute width (i.e. tabs or newlines), then this is -1.
+        """
+        if self._width is None:
+            self._width = _unstyled_wcswidth(self.plain)
+        return self._width
+
+    @property
+    def segments(self) -> List[StyledSegment]:
+        """This string split into runs of text and the style sequences which precede each run"""
+        if self._segments is None:
+            segments: List[StyledSegment] = []
+            pending_styles: List[str] = []
+            prev_index = 0
+            for style_index, style in zip(self.style_indexes, self.styles):
+                if style_index > prev_index:
+                    text = self.plain[prev_index:style_index]
+                    segments.append(StyledSegment(''.join(pending_styles), text, _unstyled_wcswidth(text)))
+                    pending_styles = []
+                    prev_index = style_index
+                pending_styles.append(style)
+
+            if pending_styles or prev_index < len(self.plain):
+                text = self.plain[prev_index:]
+                segments.append(StyledSegment(''.join(pending_styles), text, _unstyled_wcswidth(text)))
+            self._segments = segments
+        return self._segments
+
+    def __add__(self, other: str) -> 'StyledText':  # type: ignore[override]
+        """Concatenating a string to a StyledText creates a StyledText without splitting this one again"""
+        if not isinstance(other, str):
+            return NotImplemented
+        if not isinstance(other, StyledText):
+            other = StyledText(other)
+
+        offset = len(self.plain)
+        return StyledText.from_parts(
+            self.plain + other.plain,
+            self.style_indexes + [style_index + offset for style_index in other.style_indexes],
+            self.styles + other.styles,
+        )
+
+
 def style_aware_write(fileobj: IO[str], msg: str) -> None:
     """
     Write a string to a fileobject and strip its ANSI style sequences if required by allow_style setting
@@ -9,6 +9,7 @@ See the header of argparse_custom.py for instructions on how to use these featur
 import argparse
 import inspect
 import numbers
+import weakref
 from collections import (
     deque,
 )
@@ -16,14 +17,17 @@ from typing import (
     TYPE_CHECKING,
     Dict,
     List,
+    NamedTuple,
     Optional,
+    Tuple,
     Type,
     Union,
     cast,
 )
 
 from .ansi import (
-    style_aware_wcswidth,
+    style_aware_wcswidths,
+    style_warning,
     widest_line,
 )
 from .constants import (
@@ -171,6 +175,81 @@ class _NoResultsError(CompletionError):
         super().__init__(_build_hint(parser, arg_action), apply_style=False)
 
 
+class _ActionTables(NamedTuple):
+    """Lookup tables for a parser's actions which ArgparseCompleter builds from parser._actions"""
+
+    # Identity and flags of each action the parser had when these tables were built
+    actions_key: Tuple[Tuple[int, Tuple[str, ...]], ...]
+
+    # All flags in the parser
+    flags: List[str]
+
+    # Maps flags to the argparse action object
+    flag_to_action: Dict[str, argparse.Action]
+
+    # Actions for positional arguments (by position index)
+    positional_actions: List[argparse.Action]
+
+    # This will be set if the parser has subcommands
+    subcommand_action: Optional[argparse._SubParsersAction]  # type: ignore[type-arg]
+
+
+# Action tables of each parser which has been completed. Parsers are weakly referenced
+# so the tables of parsers which are no longer used are discarded.
+_action_tables_cache: 'weakref.WeakKeyDictionary[argparse.ArgumentParser, _ActionTables]' = weakref.WeakKeyDictionary()
+
+
+# noinspection PyProtectedMember
+def _get_action_tables(parser: argparse.ArgumentParser) -> _ActionTables:
+    """
+    Get the action tables of a parser, building them if they aren't cached or the parser's actions have changed
+
+    :param parser: the parser whose actions are being looked up
+    :return: the parser's action tables. These are shared and must not be modified.
+    """
+    # The tables hold references to the actions, so their ids can't be reused while the tables are cached
+    actions_key = tuple((id(action), tuple(action.option_strings)) for action in parser._actions)
+    tables = _action_tables_cache.get(parser)
+    if tables is not None and tables.actions_key == actions_key:
+        return tables
+
+    flags: List[str] = []
+    flag_to_action: Dict[str, argparse.Action] = {}
+    positional_actions: List[argparse.Action] = []
+    subcommand_action = None
+
+    # Start digging through the argparse structures.
+    # _actions is the top level container of parameter definitions
+    for action in parser._actions:
+        # if the parameter is flag based, it will have option_strings
+        if action.option_strings:
+            # record each option flag
+            for option in action.option_strings:
+                flags.append(option)
+                flag_to_action[option] = action
+
+        # Otherwise this is a positional parameter
+        else:
+            positional_actions.append(action)
+            # Check if this action defines subcommands
+            if isinstance(action, argparse._SubParsersAction):
+                subcommand_action = action
+
+    tables = _ActionTables(actions_key, flags, flag_to_action, positional_actions, subcommand_action)
+    _action_tables_cache[parser] = tables
+    return tables
+
+
+def _invalidate_action_tables(parser: argparse.ArgumentParser) -> None:
+    """
+    Discard the cached action tables of a parser. Changes to which actions a parser has and to their flags
+    are detected automatically, so this is only needed for other changes which affect completion.
+
+    :param parser: the parser whose actions changed
+    """
+    _action_tables_cache.pop(parser, None)
+
+
 # noinspection PyProtectedMember
 class ArgparseCompleter:
     """Automatic command line tab completion based on argparse parameters"""
@@ -194,27 +273,12 @@ class ArgparseCompleter:
             parent_tokens = dict()
         self._parent_tokens = parent_tokens
 
-        self._flags = []  # all flags in this command
-        self._flag_to_action = {}  # maps flags to the argparse action object
-        self._positional_actions = []  # actions for positional arguments (by position index)
-        self._subcommand_action = None  # this will be set if self._parser has subcommands
-
-        # Start digging through the argparse structures.
-        # _actions is the top level container of parameter definitions
-        for action in self._parser._actions:
-            # if the parameter is flag based, it will have option_strings
-            if action.option_strings:
-                # record each option flag
-                for option in action.option_strings:
-                    self._flags.append(option)
-                    self._flag_to_action[option] = action
-
-            # Otherwise this is a positional parameter
-            else:
-                self._positional_actions.append(action)
-                # Check if this action defines subcommands
-                if isinstance(action, argparse._SubParsersAction):
-                    self._subcommand_action = action
+        # The parser's action tables are cached since building them on every tab press is slow for large parsers
+        tables = _get_action_tables(parser)
+        self._flags = tables.flags  # all flags in this command
+        self._flag_to_action = tables.flag_to_action  # maps flags to the argparse action object
+        self._positional_actions = tables.positional_actions  # actions for positional arguments (by position index)
+        self._subcommand_action = tables.subcommand_action  # this will be set if self._parser has subcommands
 
     def complete(
         self, text: str, line: str, begidx: int, endidx: int, tokens: List[str], *, cmd_set: Optional[CommandSet] = None
@@ -598,12 +662,10 @@ class ArgparseCompleter:
             desc_header = desc_header.replace('\t', four_spaces)
 
             # Calculate needed widths for the token and description columns of the table
-            token_width = style_aware_wcswidth(destination)
+            token_width = max(style_aware_wcswidths([destination, *completion_items]))
             desc_width = widest_line(desc_header)
 
             for item in completion_items:
-                token_width = max(style_aware_wcswidth(item), token_width)
-
                 # Replace tabs with 4 spaces so we can calculate width
                 item.description = item.description.replace('\t', four_spaces)
                 desc_width = max(widest_line(item.description), desc_width)
@@ -752,7 +814,17 @@ class ArgparseCompleter:
             if isinstance(arg_choices, ChoicesCallable):
                 if not arg_choices.is_completer:
                     choices_func = arg_choices.choices_provider
-                    if isinstance(choices_func, ChoicesProviderFuncWithTokens):
+                    choices_cache = arg_state.action.get_choices_provider_cache()  # type: ignore[attr-defined]
+                    if choices_cache is not None:
+                        # Results are cached for each instance the function is called on and each set of arg_tokens
+                        arg_tokens = kwargs.get(ARG_TOKENS, {})
+                        key = (id(args[0]), tuple((name, tuple(tokens)) for name, tokens in arg_tokens.items()))
+                        completion_items, stale = choices_cache.get(key, lambda: choices_func(*args, **kwargs))
+                        if stale:
+                            self._cmd2_app.completion_notice = style_warning(
+                                'Timed out while getting choices. These may be out of date.'
+                            )
+                    elif isinstance(choices_func, ChoicesProviderFuncWithTokens):
                         completion_items = choices_func(*args, **kwargs)  # type: ignore[arg-type]
                     else:  # pragma: no cover
                         # This won't hit because runtime checking doesn't check function argument types and will always
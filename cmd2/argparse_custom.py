@@ -118,6 +118,30 @@ values. All tokens are stored in the dictionary as the raw strings provided on
 the command line. It is up to the developer to determine if the user entered
 the correct argument type (e.g. int) and validate their values.
 
+Choices providers which are slow, like ones that query a remote service, can
+cache their results and limit how long tab completion waits for them using 2
+more parameters of add_argument(). These can only be used with
+``choices_provider``.
+
+``choices_cache_ttl`` - number of seconds to reuse the choices a
+choices_provider returned instead of calling it again. Results are cached
+separately for each set of arg_tokens the choices_provider is passed.
+
+``choices_timeout`` - number of seconds tab completion waits for a
+choices_provider to return. If it takes longer, then tab completion shows the
+last choices it returned for the same arg_tokens, even if they are older than
+``choices_cache_ttl``, along with a notice that they may be out of date. If
+there are no previous choices, then a message is displayed instead. The
+choices_provider keeps running in a background thread and its results are
+cached when it finishes, so they are shown the next time tab is pressed. Since
+it runs in another thread, a choices_provider used with this setting must be
+safe to call outside of the main thread.
+
+    Example::
+
+        parser.add_argument('host', choices_provider=query_inventory,
+                            choices_cache_ttl=60, choices_timeout=0.5)
+
 CompletionItem Class - This class was added to help in cases where
 uninformative data is being tab completed. For instance, tab completing ID
 numbers isn't very helpful to a user without context. Returning a list of
@@ -204,6 +228,10 @@ for cases in which you need to manually access the cmd2-specific attributes.
   :func:`_action_set_choices_provider` for more details.
 - ``argparse.Action.set_completer()`` - See
   :func:`_action_set_completer` for more details.
+- ``argparse.Action.get_choices_provider_cache()`` - See
+  :func:`_action_get_choices_provider_cache` for more details.
+- ``argparse.Action.set_choices_provider_cache()`` - See
+  :func:`_action_set_choices_provider_cache` for more details.
 - ``argparse.Action.get_descriptive_header()`` - See
   :func:`_action_get_descriptive_header` for more details.
 - ``argparse.Action.set_descriptive_header()`` - See
@@ -237,6 +265,17 @@ sub-parser from a sub-parsers group. See
 import argparse
 import re
 import sys
+import threading
+import time
+from collections import (
+    OrderedDict,
+)
+from concurrent.futures import (
+    Future,
+)
+from concurrent.futures import (
+    TimeoutError as FutureTimeoutError,
+)
 
 # noinspection PyUnresolvedReferences,PyProtectedMember
 from argparse import (
@@ -253,6 +292,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Hashable,
     Iterable,
     List,
     NoReturn,
@@ -269,6 +309,9 @@ from . import (
     ansi,
     constants,
 )
+from .exceptions import (
+    CompletionError,
+)
 
 try:
     from typing import (
@@ -454,6 +497,110 @@ class ChoicesCallable:
         return self.to_call
 
 
+class ChoicesProviderCache:
+    """
+    Caches the results of an argument's choices_provider and limits how long tab completion waits for it.
+    This is created by add_argument() when its choices_cache_ttl or choices_timeout parameters are used.
+
+    See header of this file for more information
+    """
+
+    # Maximum number of results which are kept
+    max_entries = 100
+
+    def __init__(self, *, ttl: Optional[float] = None, timeout: Optional[float] = None) -> None:
+        """
+        Initializer
+        :param ttl: number of seconds that results are reused. If None, then they are only reused after a timeout.
+        :param timeout: number of seconds to wait for the choices_provider. If None, then there is no limit.
+        :raises: ValueError if ttl or timeout is not greater than 0
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("choices_cache_ttl must be greater than 0")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("choices_timeout must be greater than 0")
+
+        self.ttl = ttl
+        self.timeout = timeout
+
+        # Maps keys to the time their results were cached and the results, from least to most recently used
+        self._entries: 'OrderedDict[Hashable, Tuple[float, List[str]]]' = OrderedDict()
+
+        # Calls which timed out and are still running
+        self._pending: Dict[Hashable, 'Future[List[str]]'] = {}
+
+        # Background threads store results
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Discard all cached results"""
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key: Hashable, choices_provider: Callable[[], List[str]]) -> Tuple[List[str], bool]:
+        """
+        Get the results for a key, calling choices_provider if they aren't cached or have expired
+
+        :param key: identifies the arguments choices_provider is called with
+        :param choices_provider: returns the results
+        :return: tuple of the results and whether they are out of date because choices_provider timed out
+        :raises: CompletionError if choices_provider timed out and there are no previous results.
+                 Anything else choices_provider raises is also raised.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if self.ttl is not None and time.monotonic() - entry[0] < self.ttl:
+                    return entry[1], False
+
+        if self.timeout is None:
+            results = choices_provider()
+            self._store(key, results)
+            return results, False
+
+        # Wait for a call which previously timed out before starting another one
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = Future()
+                self._pending[key] = future
+                threading.Thread(
+                    name='choices_provider',
+                    target=self._run,
+                    kwargs={'key': key, 'choices_provider': choices_provider, 'future': future},
+                    daemon=True,
+                ).start()
+
+        try:
+            return future.result(timeout=self.timeout), False
+        except FutureTimeoutError:
+            if entry is None:
+                raise CompletionError('Timed out while getting choices. Press tab again to see them when they are ready.')
+            return entry[1], True
+
+    def _run(self, key: Hashable, choices_provider: Callable[[], List[str]], future: 'Future[List[str]]') -> None:
+        """Thread function which calls choices_provider and caches its results"""
+        try:
+            results = choices_provider()
+        except BaseException as ex:
+            future.set_exception(ex)
+        else:
+            self._store(key, results)
+            future.set_result(results)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _store(self, key: Hashable, results: List[str]) -> None:
+        """Cache the results for a key"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
 ############################################################################################################
 # The following are names of custom argparse Action attributes added by cmd2
 ############################################################################################################
@@ -461,6 +608,9 @@ class ChoicesCallable:
 # ChoicesCallable object that specifies the function to be called which provides choices to the argument
 ATTR_CHOICES_CALLABLE = 'choices_callable'
 
+# ChoicesProviderCache object which caches the results of the argument's choices_provider
+ATTR_CHOICES_PROVIDER_CACHE = 'choices_provider_cache'
+
 # Descriptive header that prints when using CompletionItems
 ATTR_DESCRIPTIVE_HEADER = 'descriptive_header'
 
@@ -563,6 +713,43 @@ def _action_set_completer(
 setattr(argparse.Action, 'set_completer', _action_set_completer)
 
 
+############################################################################################################
+# Patch argparse.Action with accessors for choices_provider_cache attribute
+############################################################################################################
+def _action_get_choices_provider_cache(self: argparse.Action) -> Optional[ChoicesProviderCache]:
+    """
+    Get the choices_provider_cache attribute of an argparse Action.
+
+    This function is added by cmd2 as a method called ``get_choices_provider_cache()`` to ``argparse.Action`` class.
+
+    To call: ``action.get_choices_provider_cache()``
+
+    :param self: argparse Action being queried
+    :return: A ChoicesProviderCache instance or None if attribute does not exist
+    """
+    return cast(Optional[ChoicesProviderCache], getattr(self, ATTR_CHOICES_PROVIDER_CACHE, None))
+
+
+setattr(argparse.Action, 'get_choices_provider_cache', _action_get_choices_provider_cache)
+
+
+def _action_set_choices_provider_cache(self: argparse.Action, choices_provider_cache: Optional[ChoicesProviderCache]) -> None:
+    """
+    Set the choices_provider_cache attribute of an argparse Action.
+
+    This function is added by cmd2 as a method called ``set_choices_provider_cache()`` to ``argparse.Action`` class.
+
+    To call: ``action.set_choices_provider_cache(choices_provider_cache)``
+
+    :param self: argparse Action being updated
+    :param choices_provider_cache: value being assigned
+    """
+    setattr(self, ATTR_CHOICES_PROVIDER_CACHE, choices_provider_cache)
+
+
+setattr(argparse.Action, 'set_choices_provider_cache', _action_set_choices_provider_cache)
+
+
 ############################################################################################################
 # Patch argparse.Action with accessors for descriptive_header attribute
 ############################################################################################################
@@ -756,6 +943,8 @@ def _add_argument_wrapper(
     nargs: Union[int, str, Tuple[int], Tuple[int, int], Tuple[int, float], None] = None,
     choices_provider: Optional[ChoicesProviderFunc] = None,
     completer: Optional[CompleterFunc] = None,
+    choices_cache_ttl: Optional[float] = None,
+    choices_timeout: Optional[float] = None,
     suppress_tab_hint: bool = False,
     descriptive_header: Optional[str] = None,
     **kwargs: Any,
@@ -774,6 +963,9 @@ def _add_argument_wrapper(
     # Added args used by ArgparseCompleter
     :param choices_provider: function that provides choices for this argument
     :param completer: tab completion function that provides choices for this argument
+    :param choices_cache_ttl: number of seconds to reuse the results of choices_provider. Defaults to None.
+    :param choices_timeout: number of seconds to wait for choices_provider before showing its previous results.
+                            Defaults to None.
     :param suppress_tab_hint: when ArgparseCompleter has no results to show during tab completion, it displays the
                               current argument's help text as a hint. Set this to True to suppress the hint. If this
                               argument's help text is set to argparse.SUPPRESS, then tab hints will not display
@@ -800,6 +992,12 @@ def _add_argument_wrapper(
         err_msg = "Only one of the following parameters may be used at a time:\n" "choices_provider, completer"
         raise (ValueError(err_msg))
 
+    choices_provider_cache = None
+    if choices_cache_ttl is not None or choices_timeout is not None:
+        if choices_provider is None:
+            raise ValueError("choices_cache_ttl and choices_timeout can only be used with choices_provider")
+        choices_provider_cache = ChoicesProviderCache(ttl=choices_cache_ttl, timeout=choices_timeout)
+
     # Pre-process special ranged nargs
     nargs_range = None
 
@@ -870,6 +1068,7 @@ def _add_argument_wrapper(
 
     if choices_provider:
         new_arg.set_choices_provider(choices_provider)  # type: ignore[attr-defined]
+        new_arg.set_choices_provider_cache(choices_provider_cache)  # type: ignore[attr-defined]
     elif completer:
         new_arg.set_completer(completer)  # type: ignore[attr-defined]
 
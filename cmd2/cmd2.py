@@ -31,7 +31,6 @@ Git repository on GitHub at https://github.com/python-cmd2/cmd2
 import argparse
 import cmd
 import functools
-import glob
 import inspect
 import os
 import pydoc
@@ -114,6 +113,7 @@ from .exceptions import (
 from .history import (
     History,
     HistoryItem,
+    HistoryLog,
 )
 from .parsing import (
     Macro,
@@ -192,6 +192,132 @@ class _SavedCmd2Env:
         self.sys_stdin: Optional[TextIO] = None
 
 
+class _BatchState:
+    """State shared by the commands which runcmds_plus_hooks() runs as a batch"""
+
+    def __init__(self) -> None:
+        # File which the previous command appended its output to. It's kept open
+        # in case the next command appends its output to the same file.
+        self.redirect_path = ''
+        self.redirect_file: Optional[TextIO] = None
+
+        # Elapsed time messages which are printed after the batch runs
+        self.timings: List[str] = []
+
+    def keep_redirect_file(self, path: str, redirect_file: TextIO) -> bool:
+        """
+        Keep a command's redirection file open for the next command
+
+        :param path: path of the file as it was given in the command
+        :param redirect_file: the open file
+        :return: False if the file can't be kept, like when it isn't a regular file opened for appending
+        """
+        import stat
+
+        if redirect_file.mode != 'a':
+            return False
+
+        try:
+            if not stat.S_ISREG(os.fstat(redirect_file.fileno()).st_mode):
+                return False
+        except (OSError, ValueError):
+            return False
+
+        redirect_file.flush()
+        self.close_redirect_file()
+        self.redirect_path = path
+        self.redirect_file = redirect_file
+        return True
+
+    def reuse_redirect_file(self, path: str, mode: str) -> Optional[TextIO]:
+        """
+        Return the kept redirection file if the command is appending to the same file
+
+        :param path: path of the file as it was given in the command
+        :param mode: 'w' to overwrite the file or 'a' to append to it
+        :return: the file or None if it can't be reused
+        """
+        redirect_file = self.redirect_file
+        if redirect_file is None or mode != 'a' or path != self.redirect_path:
+            self.close_redirect_file()
+            return None
+
+        self.redirect_file = None
+        try:
+            # Make sure the path still refers to this file
+            path_stat = os.stat(path)
+            file_stat = os.fstat(redirect_file.fileno())
+            if (path_stat.st_dev, path_stat.st_ino) == (file_stat.st_dev, file_stat.st_ino):
+                return redirect_file
+        except OSError:
+            pass
+
+        redirect_file.close()
+        return None
+
+    def close_redirect_file(self) -> None:
+        """Close the kept redirection file"""
+        if self.redirect_file is not None:
+            self.redirect_file.close()
+            self.redirect_file = None
+
+
+class _CommandRegistry:
+    """
+    Index of the names of a cmd2.Cmd instance's command and help functions.
+    This avoids scanning dir() every time commands or help topics are listed.
+    """
+
+    def __init__(self, cmd2_app: 'Cmd', attr_names: Iterable[str]) -> None:
+        """
+        Initializer which builds the index from the attributes cmd2_app currently has
+
+        :param cmd2_app: the cmd2.Cmd instance being indexed
+        :param attr_names: names of cmd2_app's attributes, as returned by its get_names()
+        """
+        self.commands: Set[str] = set()
+        self.help_topics: Set[str] = set()
+
+        # Names of the attributes of cmd2_app and of each class in its MRO. Since functions can be added to
+        # or removed from any of them after the index is built, the index is rebuilt when these change.
+        self._namespace_names = [frozenset(namespace) for namespace in self._namespaces(cmd2_app)]
+
+        for attr_name in attr_names:
+            if attr_name.startswith(COMMAND_FUNC_PREFIX):
+                names = self.commands
+                name = attr_name[len(COMMAND_FUNC_PREFIX) :]
+            elif attr_name.startswith(HELP_FUNC_PREFIX):
+                names = self.help_topics
+                name = attr_name[len(HELP_FUNC_PREFIX) :]
+            else:
+                continue
+
+            if callable(getattr(cmd2_app, attr_name, None)):
+                names.add(name)
+
+        # Alphabetized lists of commands and help topics
+        self.sorted_commands = sorted(self.commands)
+        self.sorted_help_topics = sorted(self.help_topics)
+
+    @staticmethod
+    def _namespaces(cmd2_app: 'Cmd') -> List[Mapping[str, Any]]:
+        """Return the __dict__ of cmd2_app and of each class in its MRO"""
+        return [cmd2_app.__dict__] + [cls.__dict__ for cls in type(cmd2_app).__mro__]
+
+    def is_current(self, cmd2_app: 'Cmd') -> bool:
+        """
+        Check if the index still matches cmd2_app. Comparing attribute names is much faster than
+        rebuilding the index. Replacing an attribute with another of the same name isn't detected.
+
+        :param cmd2_app: the cmd2.Cmd instance being indexed
+        :return: False if an attribute has been added to or removed from cmd2_app or its classes
+        """
+        namespaces = self._namespaces(cmd2_app)
+        return len(namespaces) == len(self._namespace_names) and all(
+            namespace.keys() == names for namespace, names in zip(namespaces, self._namespace_names)
+        )
+
+
 # Contains data about a disabled command which is used to restore its original functions when the command is enabled
 DisabledCommand = namedtuple('DisabledCommand', ['command_function', 'help_function', 'completer_function'])
 
@@ -215,6 +341,14 @@ class Cmd(cmd.Cmd):
     ALPHABETICAL_SORT_KEY = utils.norm_fold
     NATURAL_SORT_KEY = utils.natural_keys
 
+    # Format of the compiled scripts saved in script_cache_dir
+    _compiled_script_version = '1.0.0'
+    _compiled_script_version_field = 'compiled_script_version'
+    _compiled_script_statements_field = 'statements'
+
+    # Maximum number of compiled scripts kept in script_cache_dir
+    script_cache_max_entries = 256
+
     def __init__(
         self,
         completekey: str = 'tab',
@@ -223,18 +357,25 @@ class Cmd(cmd.Cmd):
         *,
         persistent_history_file: str = '',
         persistent_history_length: int = 1000,
+        append_persistent_history: bool = False,
+        readline_history_length: Optional[int] = None,
         startup_script: str = '',
         silence_startup_script: bool = False,
         include_py: bool = False,
         include_ipy: bool = False,
         allow_cli_args: bool = True,
         transcript_files: Optional[List[str]] = None,
+        transcript_workers: int = 1,
+        transcript_app_factory: Optional[Callable[[], 'Cmd']] = None,
         allow_redirection: bool = True,
         multiline_commands: Optional[List[str]] = None,
         terminators: Optional[List[str]] = None,
         shortcuts: Optional[Dict[str, str]] = None,
         command_sets: Optional[Iterable[CommandSet]] = None,
         auto_load_commands: bool = True,
+        parse_cache_size: int = 0,
+        single_pass_lexer: bool = False,
+        script_cache_dir: Optional[str] = None,
     ) -> None:
         """An easy but powerful framework for writing line-oriented command
         interpreters. Extends Python's cmd package.
@@ -245,6 +386,17 @@ class Cmd(cmd.Cmd):
         :param persistent_history_file: file path to load a persistent cmd2 command history from
         :param persistent_history_length: max number of history items to write
                                           to the persistent history file
+        :param append_persistent_history: If ``True``, then each command is appended to the persistent
+                                          history file as soon as it is added to history, instead of the
+                                          whole history being written when the application exits. This
+                                          uses a different file format which is faster to load and is
+                                          not lost if the application crashes. An existing file in the
+                                          default format is converted. The items loaded from this
+                                          format are only decoded when they are first accessed.
+        :param readline_history_length: max number of the most recent persistent history items to load into
+                                        readline history at startup. If ``None``, then all of them are loaded.
+                                        Items loaded into readline history are decoded at startup, so set
+                                        this along with ``append_persistent_history`` for the fastest startup.
         :param startup_script: file path to a script to execute at startup
         :param silence_startup_script: if ``True``, then the startup script's output will be
                                        suppressed. Anything written to stderr will still display.
@@ -259,6 +411,13 @@ class Cmd(cmd.Cmd):
                                  This allows running transcript tests when ``allow_cli_args``
                                  is ``False``. If ``allow_cli_args`` is ``True`` this parameter
                                  is ignored.
+        :param transcript_workers: number of processes which run transcript files in parallel. When
+                                   this is greater than 1, each transcript file is run by a new app
+                                   created by ``transcript_app_factory``. Defaults to 1, which runs
+                                   all transcript files in this app.
+        :param transcript_app_factory: picklable callable which creates the app that runs each transcript
+                                       file when ``transcript_workers`` is greater than 1. Defaults to
+                                       None, which calls the class of this app with no arguments.
         :param allow_redirection: If ``False``, prevent output redirection and piping to shell
                                   commands. This parameter prevents redirection and piping, but
                                   does not alter parsing behavior. A user can still type
@@ -282,6 +441,17 @@ class Cmd(cmd.Cmd):
                                    that are currently loaded by Python and automatically
                                    instantiate and register all commands. If False, CommandSets
                                    must be manually installed with `register_command_set`.
+        :param parse_cache_size: number of parsed command lines to cache so that repeated lines,
+                                 like those in frequently run scripts, do not need to be parsed
+                                 again. Defaults to 0, which disables the cache.
+        :param single_pass_lexer: If ``True``, then command lines are tokenized in a single scan
+                                  instead of with ``shlex``. This produces the same tokens, but
+                                  reduces the time it takes to parse each command.
+        :param script_cache_dir: directory where ``run_script`` saves the parsed commands of the scripts it runs.
+                                 When the same script is run again with the same aliases, shortcuts, terminators,
+                                 and multiline commands, its commands are loaded from there instead of being parsed.
+                                 At most ``script_cache_max_entries`` compiled scripts are kept. The least recently
+                                 used ones are removed when more are saved. Defaults to None, which disables this.
         """
         # Check if py or ipy need to be disabled in this instance
         if not include_py:
@@ -300,6 +470,14 @@ class Cmd(cmd.Cmd):
         self.default_to_shell = False  # Attempt to run unrecognized commands as shell commands
         self.allow_redirection = allow_redirection  # Security setting to prevent redirection of stdout
 
+        # After each command, cmd2 fixes terminal problems like those caused by certain binary characters having
+        # been printed to it. By default, it restores the terminal settings saved when cmdloop() started, but only
+        # if they changed. Set this to True to run 'stty sane' after every command instead.
+        self.always_run_stty_sane = False
+
+        # Terminal settings of stdin saved when cmdloop() starts
+        self._saved_termios_attrs: Optional[List[Any]] = None
+
         # Attributes which ARE dynamically settable via the set command at runtime
         self.always_show_hint = False
         self.debug = False
@@ -335,7 +513,15 @@ class Cmd(cmd.Cmd):
 
         # Initialize history
         self._persistent_history_length = persistent_history_length
-        self._initialize_history(persistent_history_file)
+        self._history_log: Optional[HistoryLog] = None
+
+        # Index of command and help functions. Built the first time it is needed.
+        self._command_registry: Optional[_CommandRegistry] = None
+        if readline_history_length is not None and readline_history_length < 0:
+            raise ValueError("readline_history_length cannot be less than 0")
+        self._initialize_history(
+            persistent_history_file, append=append_persistent_history, readline_length=readline_history_length
+        )
 
         # Commands to exclude from the history command
         self.exclude_from_history = ['eof', 'history']
@@ -356,7 +542,11 @@ class Cmd(cmd.Cmd):
         self._in_py = False
 
         self.statement_parser = StatementParser(
-            terminators=terminators, multiline_commands=multiline_commands, shortcuts=shortcuts
+            terminators=terminators,
+            multiline_commands=multiline_commands,
+            shortcuts=shortcuts,
+            parse_cache_size=parse_cache_size,
+            single_pass_lexer=single_pass_lexer,
         )
 
         # Stores results from the last command run to enable usage of results in Python shells and pyscripts
@@ -365,6 +555,9 @@ class Cmd(cmd.Cmd):
         # Used by run_script command to store current script dir as a LIFO queue to support _relative_run_script command
         self._script_dir: List[str] = []
 
+        # Directory where run_script saves the parsed commands of scripts
+        self.script_cache_dir = script_cache_dir
+
         # Context manager used to protect critical sections in the main thread from stopping due to a KeyboardInterrupt
         self.sigint_protection = utils.ContextFlag()
 
@@ -375,6 +568,9 @@ class Cmd(cmd.Cmd):
         # Used to keep track of whether we are redirecting or piping output
         self._redirecting = False
 
+        # State of the commands being run by runcmds_plus_hooks() as a batch
+        self._batch_state: Optional[_BatchState] = None
+
         # Used to keep track of whether a continuation prompt is being displayed
         self._at_continuation_prompt = False
 
@@ -408,6 +604,11 @@ class Cmd(cmd.Cmd):
         # Transcript files to run instead of interactive command loop
         self._transcript_files: Optional[List[str]] = None
 
+        if transcript_workers < 1:
+            raise ValueError("transcript_workers must be greater than 0")
+        self.transcript_workers = transcript_workers
+        self.transcript_app_factory = transcript_app_factory
+
         # Check for command line args
         if allow_cli_args:
             parser = argparse_custom.DEFAULT_ARGUMENT_PARSER()
@@ -479,6 +680,10 @@ class Cmd(cmd.Cmd):
         # An optional hint which prints above tab completion suggestions
         self.completion_hint = ''
 
+        # An optional notice which prints above tab completion suggestions, even if always_show_hint is False.
+        # ArgparseCompleter uses this when it shows previous results because a choices_provider timed out.
+        self.completion_notice = ''
+
         # Normally cmd2 uses readline's formatter to columnize the list of completion suggestions.
         # If a custom format is preferred, write the formatted completions to this string. cmd2 will
         # then print it instead of the readline format. ANSI style sequences and newlines are supported
@@ -866,6 +1071,9 @@ class Cmd(cmd.Cmd):
 
                     # Set what instance the handler is bound to
                     setattr(attached_parser, constants.PARSER_ATTR_COMMANDSET, cmdset)
+
+                    # noinspection PyProtectedMember
+                    argparse_completer._invalidate_action_tables(target_parser)
                     break
 
     def _unregister_subcommands(self, cmdset: Union[CommandSet, 'Cmd']) -> None:
@@ -914,6 +1122,9 @@ class Cmd(cmd.Cmd):
             for action in command_parser._actions:
                 if isinstance(action, argparse._SubParsersAction):
                     action.remove_parser(subcommand_name)  # type: ignore[arg-type,attr-defined]
+
+                    # noinspection PyProtectedMember
+                    argparse_completer._invalidate_action_tables(command_parser)
                     break
 
     @property
@@ -1065,8 +1276,10 @@ class Cmd(cmd.Cmd):
         :param msg: object to print
         :param end: string appended after the end of the message, default a newline
         """
+        # Appending to a StyledText keeps the style sequences it has already found
+        final_msg = msg + end if isinstance(msg, ansi.StyledText) else f"{msg}{end}"
         try:
-            ansi.style_aware_write(self.stdout, f"{msg}{end}")
+            ansi.style_aware_write(self.stdout, final_msg)
         except BrokenPipeError:
             # This occurs if a command's output is being piped to another
             # process and that process closes before the command is
@@ -1212,6 +1425,7 @@ class Cmd(cmd.Cmd):
         self.allow_appended_space = True
         self.allow_closing_quote = True
         self.completion_hint = ''
+        self.completion_notice = ''
         self.formatted_completions = ''
         self.completion_matches = []
         self.display_matches = []
@@ -1511,20 +1725,16 @@ class Cmd(cmd.Cmd):
                         user += os.path.sep
                     users.append(user)
             else:
-                import pwd
-
-                # Iterate through a list of users from the password database
-                for cur_pw in pwd.getpwall():
+                # Iterate through the users from the password database who have an existing home dir
+                # noinspection PyProtectedMember
+                for user_name in utils._path_completion_cache.users():
 
-                    # Check if the user has an existing home dir
-                    if os.path.isdir(cur_pw.pw_dir):
-
-                        # Add a ~ to the user to match against text
-                        cur_user = '~' + cur_pw.pw_name
-                        if cur_user.startswith(text):
-                            if add_trailing_sep_if_dir:
-                                cur_user += os.path.sep
-                            users.append(cur_user)
+                    # Add a ~ to the user to match against text
+                    cur_user = '~' + user_name
+                    if cur_user.startswith(text):
+                        if add_trailing_sep_if_dir:
+                            cur_user += os.path.sep
+                        users.append(cur_user)
 
             if users:
                 # We are returning ~user strings that resolve to directories,
@@ -1547,9 +1757,9 @@ class Cmd(cmd.Cmd):
         orig_tilde_path = ''
         expanded_tilde_path = ''
 
-        # If the search text is blank, then search in the CWD for *
+        # If the search text is blank, then search in the CWD for everything
         if not text:
-            search_str = os.path.join(os.getcwd(), '*')
+            search_str = os.path.join(os.getcwd(), '')
             cwd_added = True
         else:
             # Purposely don't match any path containing wildcards
@@ -1559,7 +1769,7 @@ class Cmd(cmd.Cmd):
                     return []
 
             # Start the search string
-            search_str = text + '*'
+            search_str = text
 
             # Handle tilde expansion and completion
             if text.startswith('~'):
@@ -1583,7 +1793,8 @@ class Cmd(cmd.Cmd):
                 cwd_added = True
 
         # Find all matching path completions
-        matches = glob.glob(search_str)
+        # noinspection PyProtectedMember
+        matches, dir_matches = utils._path_completion_cache.match(search_str)
 
         # Filter out results that don't belong
         if path_filter is not None:
@@ -1594,7 +1805,7 @@ class Cmd(cmd.Cmd):
             self.matches_delimited = True
 
             # Don't append a space or closing quote to directory
-            if len(matches) == 1 and os.path.isdir(matches[0]):
+            if len(matches) == 1 and matches[0] in dir_matches:
                 self.allow_appended_space = False
                 self.allow_closing_quote = False
 
@@ -1609,7 +1820,7 @@ class Cmd(cmd.Cmd):
                 self.display_matches.append(os.path.basename(cur_match))
 
                 # Add a separator after directories if the next character isn't already a separator
-                if os.path.isdir(cur_match) and add_trailing_sep_if_dir:
+                if cur_match in dir_matches and add_trailing_sep_if_dir:
                     matches[index] += os.path.sep
                     self.display_matches[index] += os.path.sep
 
@@ -1766,8 +1977,11 @@ class Cmd(cmd.Cmd):
         """
         if rl_type == RlType.GNU:
 
-            # Print hint if one exists and we are supposed to display it
+            # Print notice and hint if they exist and we are supposed to display them
             hint_printed = False
+            if self.completion_notice:
+                hint_printed = True
+                sys.stdout.write('\n' + self.completion_notice)
             if self.always_show_hint and self.completion_hint:
                 hint_printed = True
                 sys.stdout.write('\n' + self.completion_hint)
@@ -1785,12 +1999,7 @@ class Cmd(cmd.Cmd):
                     matches_to_display = self.display_matches
 
                     # Recalculate longest_match_length for display_matches
-                    longest_match_length = 0
-
-                    for cur_match in matches_to_display:
-                        cur_length = ansi.style_aware_wcswidth(cur_match)
-                        if cur_length > longest_match_length:
-                            longest_match_length = cur_length
+                    longest_match_length = max(ansi.style_aware_wcswidths(matches_to_display), default=0)
                 else:
                     matches_to_display = matches
 
@@ -1826,8 +2035,11 @@ class Cmd(cmd.Cmd):
         """
         if rl_type == RlType.PYREADLINE:
 
-            # Print hint if one exists and we are supposed to display it
+            # Print notice and hint if they exist and we are supposed to display them
             hint_printed = False
+            if self.completion_notice:
+                hint_printed = True
+                readline.rl.mode.console.write('\n' + self.completion_notice)
             if self.always_show_hint and self.completion_hint:
                 hint_printed = True
                 readline.rl.mode.console.write('\n' + self.completion_hint)
@@ -1924,7 +2136,7 @@ class Cmd(cmd.Cmd):
                 completer_func = self.path_complete
 
             # Check if a command was entered
-            elif command in self.get_all_commands():
+            elif command in self._get_command_registry().commands:
                 # Get the completer function for this command
                 func_attr = getattr(self, constants.COMPLETER_FUNC_PREFIX + command, None)
 
@@ -2173,17 +2385,25 @@ class Cmd(cmd.Cmd):
         """Read-only property to access the aliases stored in the StatementParser"""
         return self.statement_parser.aliases
 
+    def _get_command_registry(self) -> _CommandRegistry:
+        """Return the registry of this instance's command and help functions"""
+        # An overridden get_names() can return different names on each call, so its results aren't kept
+        if type(self).get_names is not Cmd.get_names:
+            return _CommandRegistry(self, self.get_names())
+
+        registry: Optional[_CommandRegistry] = self.__dict__.get('_command_registry')
+        if registry is None or not registry.is_current(self):
+            registry = _CommandRegistry(self, self.get_names())
+            self._command_registry = registry
+        return registry
+
     def get_names(self) -> List[str]:
         """Return an alphabetized list of names comprising the attributes of the cmd2 class instance."""
         return dir(self)
 
     def get_all_commands(self) -> List[str]:
         """Return a list of all commands"""
-        return [
-            name[len(constants.COMMAND_FUNC_PREFIX) :]
-            for name in self.get_names()
-            if name.startswith(constants.COMMAND_FUNC_PREFIX) and callable(getattr(self, name))
-        ]
+        return list(self._get_command_registry().sorted_commands)
 
     def get_visible_commands(self) -> List[str]:
         """Return a list of commands that have not been hidden or disabled"""
@@ -2241,14 +2461,12 @@ class Cmd(cmd.Cmd):
 
     def get_help_topics(self) -> List[str]:
         """Return a list of help topics"""
-        all_topics = [
-            name[len(constants.HELP_FUNC_PREFIX) :]
-            for name in self.get_names()
-            if name.startswith(constants.HELP_FUNC_PREFIX) and callable(getattr(self, name))
-        ]
-
         # Filter out hidden and disabled commands
-        return [topic for topic in all_topics if topic not in self.hidden_commands and topic not in self.disabled_commands]
+        return [
+            topic
+            for topic in self._get_command_registry().sorted_help_topics
+            if topic not in self.hidden_commands and topic not in self.disabled_commands
+        ]
 
     # noinspection PyUnusedLocal
     def sigint_handler(self, signum: int, _: FrameType) -> None:
@@ -2409,7 +2627,11 @@ class Cmd(cmd.Cmd):
                 stop = self.postcmd(stop, statement)
 
                 if self.timing:
-                    self.pfeedback(f'Elapsed: {datetime.datetime.now() - timestart}')
+                    elapsed = datetime.datetime.now() - timestart
+                    if self._batch_state is not None:
+                        self._batch_state.timings.append(f'Elapsed: {elapsed}  {statement.command_and_args}')
+                    else:
+                        self.pfeedback(f'Elapsed: {elapsed}')
             finally:
                 # Get sigint protection while we restore stuff
                 with self.sigint_protection:
@@ -2458,10 +2680,13 @@ class Cmd(cmd.Cmd):
             if not sys.platform.startswith('win') and self.stdin.isatty():
                 # Before the next command runs, fix any terminal problems like those
                 # caused by certain binary characters having been printed to it.
-                import subprocess
+                if self.always_run_stty_sane or self._saved_termios_attrs is None:
+                    import subprocess
 
-                proc = subprocess.Popen(['stty', 'sane'])
-                proc.communicate()
+                    proc = subprocess.Popen(['stty', 'sane'])
+                    proc.communicate()
+                else:
+                    self._restore_termios_attrs()
 
         data = plugin.CommandFinalizationData(stop, statement)
         for func in self._cmdfinalization_hooks:
@@ -2470,12 +2695,40 @@ class Cmd(cmd.Cmd):
         # modifications to the statement
         return data.stop
 
+    def _save_termios_attrs(self) -> None:
+        """Save the terminal settings of stdin so _restore_termios_attrs() can restore them after each command"""
+        self._saved_termios_attrs = None
+        if not sys.platform.startswith('win') and self.stdin.isatty():
+            import termios
+
+            try:
+                self._saved_termios_attrs = termios.tcgetattr(self.stdin.fileno())
+            except (termios.error, OSError, ValueError):
+                # Fall back to running 'stty sane' after each command
+                pass
+
+    def _restore_termios_attrs(self) -> None:
+        """Restore the terminal settings saved by _save_termios_attrs() if a command changed them"""
+        import termios
+
+        saved_attrs = self._saved_termios_attrs
+        if saved_attrs is None:
+            return
+
+        try:
+            fd = self.stdin.fileno()
+            if termios.tcgetattr(fd) != saved_attrs:
+                termios.tcsetattr(fd, termios.TCSANOW, saved_attrs)
+        except (termios.error, OSError, ValueError):
+            pass
+
     def runcmds_plus_hooks(
         self,
         cmds: Union[List[HistoryItem], List[str]],
         *,
         add_to_history: bool = True,
         stop_on_keyboard_interrupt: bool = False,
+        batch: bool = False,
     ) -> bool:
         """
         Used when commands are being run in an automated fashion like text scripts or history replays.
@@ -2486,24 +2739,53 @@ class Cmd(cmd.Cmd):
         :param stop_on_keyboard_interrupt: if True, then stop running contents of cmds if Ctrl-C is pressed instead of moving
                                            to the next command in the list. This is used when the commands are part of a
                                            group, like a text script, which should stop upon Ctrl-C. Defaults to False.
+        :param batch: if True, then reduce the overhead of running each command, which helps when running a long list
+                      of commands. Blank lines and comments are skipped without running any hooks. When consecutive
+                      commands append their output to the same file, the file is kept open between them. If timing
+                      is enabled, the elapsed times of all commands are printed after they have run. Defaults to False.
         :return: True if running of commands should stop
         """
-        for line in cmds:
-            if isinstance(line, HistoryItem):
-                line = line.raw
+        saved_batch_state = self._batch_state
+        skip_comments = False
 
-            if self.echo:
-                self.poutput(f'{self.prompt}{line}')
+        if batch:
+            self._batch_state = _BatchState()
 
-            try:
-                if self.onecmd_plus_hooks(
-                    line, add_to_history=add_to_history, raise_keyboard_interrupt=stop_on_keyboard_interrupt
-                ):
-                    return True
-            except KeyboardInterrupt as ex:
-                if stop_on_keyboard_interrupt:
-                    self.perror(ex)
-                    break
+            # A line starting with the comment character is only a comment if it isn't a shortcut
+            skip_comments = not any(
+                shortcut.startswith(constants.COMMENT_CHAR) for shortcut, _ in self.statement_parser.shortcuts
+            )
+
+        try:
+            for line in cmds:
+                if isinstance(line, HistoryItem):
+                    line = line.raw
+
+                if self.echo:
+                    self.poutput(f'{self.prompt}{line}')
+
+                if batch:
+                    stripped = line.lstrip()
+                    if not stripped or (skip_comments and stripped.startswith(constants.COMMENT_CHAR)):
+                        continue
+
+                try:
+                    if self.onecmd_plus_hooks(
+                        line, add_to_history=add_to_history, raise_keyboard_interrupt=stop_on_keyboard_interrupt
+                    ):
+                        return True
+                except KeyboardInterrupt as ex:
+                    if stop_on_keyboard_interrupt:
+                        self.perror(ex)
+                        break
+        finally:
+            if batch:
+                with self.sigint_protection:
+                    batch_state = cast(_BatchState, self._batch_state)
+                    self._batch_state = saved_batch_state
+                    batch_state.close_redirect_file()
+                    if batch_state.timings:
+                        self.pfeedback('\n'.join(batch_state.timings))
 
         return False
 
@@ -2675,6 +2957,10 @@ class Cmd(cmd.Cmd):
         # The ProcReader for this command
         cmd_pipe_proc_reader: Optional[utils.ProcReader] = None
 
+        # Only a command appending to a file can reuse the file kept open by the previous command in a batch
+        if self._batch_state is not None and not (self.allow_redirection and statement.output_to and not statement.pipe_to):
+            self._batch_state.close_redirect_file()
+
         if not self.allow_redirection:
             # Don't return since we set some state variables at the end of the function
             pass
@@ -2713,22 +2999,14 @@ class Cmd(cmd.Cmd):
 
             # Popen was called with shell=True so the user can chain pipe commands and redirect their output
             # like: !ls -l | grep user | wc -l > out.txt. But this makes it difficult to know if the pipe process
-            # started OK, since the shell itself always starts. Therefore, we will wait a short time and check
-            # if the pipe process is still running.
-            try:
-                proc.wait(0.2)
-            except subprocess.TimeoutExpired:
-                pass
+            # started OK, since the shell itself always starts. Rather than delaying the command while we wait
+            # to see if the pipe process exits, _restore_output() checks how the pipe process ended.
+            redir_saved_state.redirecting = True
+            cmd_pipe_proc_reader = utils.ProcReader(proc, cast(TextIO, self.stdout), sys.stderr)
+            sys.stdout = self.stdout = new_stdout
 
-            # Check if the pipe process already exited
-            if proc.returncode is not None:
-                subproc_stdin.close()
-                new_stdout.close()
-                raise RedirectionError(f'Pipe process exited with code {proc.returncode} before command could run')
-            else:
-                redir_saved_state.redirecting = True  # type: ignore[unreachable]
-                cmd_pipe_proc_reader = utils.ProcReader(proc, cast(TextIO, self.stdout), sys.stderr)
-                sys.stdout = self.stdout = new_stdout
+            # The pipe process has its own copy of the read side
+            subproc_stdin.close()
 
         elif statement.output:
             import tempfile
@@ -2740,11 +3018,20 @@ class Cmd(cmd.Cmd):
             elif statement.output_to:
                 # statement.output can only contain REDIRECTION_APPEND or REDIRECTION_OUTPUT
                 mode = 'a' if statement.output == constants.REDIRECTION_APPEND else 'w'
-                try:
-                    # Use line buffering
-                    new_stdout = cast(TextIO, open(utils.strip_quotes(statement.output_to), mode=mode, buffering=1))
-                except OSError as ex:
-                    raise RedirectionError(f'Failed to redirect because: {ex}')
+                output_path = utils.strip_quotes(statement.output_to)
+
+                reused_stdout = None
+                if self._batch_state is not None:
+                    reused_stdout = self._batch_state.reuse_redirect_file(output_path, mode)
+
+                if reused_stdout is not None:
+                    new_stdout = reused_stdout
+                else:
+                    try:
+                        # Use line buffering
+                        new_stdout = cast(TextIO, open(output_path, mode=mode, buffering=1))
+                    except OSError as ex:
+                        raise RedirectionError(f'Failed to redirect because: {ex}')
 
                 redir_saved_state.redirecting = True
                 sys.stdout = self.stdout = new_stdout
@@ -2777,9 +3064,20 @@ class Cmd(cmd.Cmd):
                 self.stdout.seek(0)
                 write_to_paste_buffer(self.stdout.read())
 
+            # A pipe process should not exit until the pipe is closed. If it already exited with an error,
+            # then it either failed to start or failed before reading all of the command's output.
+            pipe_exited_early = self._cur_pipe_proc_reader is not None and self._cur_pipe_proc_reader.poll() is not None
+
             try:
-                # Close the file or pipe that stdout was redirected to
-                self.stdout.close()
+                # Close the file or pipe that stdout was redirected to. In a batch, a file is kept open for the next command.
+                if not (
+                    self._batch_state is not None
+                    and statement.output_to
+                    and self._batch_state.keep_redirect_file(
+                        utils.strip_quotes(statement.output_to), cast(TextIO, self.stdout)
+                    )
+                ):
+                    self.stdout.close()
             except BrokenPipeError:
                 pass
 
@@ -2791,6 +3089,13 @@ class Cmd(cmd.Cmd):
             if self._cur_pipe_proc_reader is not None:
                 self._cur_pipe_proc_reader.wait()
 
+                # The pipe process may not have had time to fail before the command finished. Therefore, also
+                # check for the exit codes POSIX shells use when a command can't be found or run. Negative
+                # codes mean the process was killed by a signal, like when Ctrl-C is pressed.
+                ret_code = self._cur_pipe_proc_reader.poll()
+                if ret_code is not None and ret_code > 0 and (pipe_exited_early or ret_code in (126, 127)):
+                    self.perror(f'Pipe process exited with code {ret_code} before command output could be read')
+
         # These are restored regardless of whether the command redirected
         self._cur_pipe_proc_reader = saved_redir_state.saved_pipe_proc_reader
         self._redirecting = saved_redir_state.saved_redirecting
@@ -2844,7 +3149,7 @@ class Cmd(cmd.Cmd):
                 and statement.command not in self.disabled_commands
                 and add_to_history
             ):
-                self.history.append(statement)
+                self._add_to_history(statement)
 
             stop = func(statement)
 
@@ -2853,6 +3158,18 @@ class Cmd(cmd.Cmd):
 
         return stop if stop is not None else False
 
+    def _add_to_history(self, statement: Statement) -> None:
+        """
+        Add a statement to history. Failing to write it to an append-only persistent history file
+        is reported but does not stop the command from running.
+
+        :param statement: the statement being added
+        """
+        try:
+            self.history.append(statement)
+        except OSError as ex:
+            self.perror(f"Cannot write persistent history file '{self.persistent_history_file}': {ex}")
+
     def default(self, statement: Statement) -> Optional[bool]:  # type: ignore[override]
         """Executed when the command given isn't a recognized command implemented by a do_* method.
 
@@ -2860,7 +3177,7 @@ class Cmd(cmd.Cmd):
         """
         if self.default_to_shell:
             if 'shell' not in self.exclude_from_history:
-                self.history.append(statement)
+                self._add_to_history(statement)
 
             # noinspection PyTypeChecker
             return self.do_shell(statement.command_and_args)
@@ -3201,7 +3518,7 @@ class Cmd(cmd.Cmd):
             self.perror(f"Invalid alias name: {errmsg}")
             return
 
-        if args.name in self.get_all_commands():
+        if args.name in self._get_command_registry().commands:
             self.perror("Alias cannot have the same name as a command")
             return
 
@@ -3394,7 +3711,7 @@ class Cmd(cmd.Cmd):
             self.perror(f"Invalid macro name: {errmsg}")
             return
 
-        if args.name in self.get_all_commands():
+        if args.name in self._get_command_registry().commands:
             self.perror("Macro cannot have the same name as a command")
             return
 
@@ -3667,6 +3984,7 @@ class Cmd(cmd.Cmd):
         if size == 1:
             self.poutput(str_list[0])
             return
+        str_widths = ansi.style_aware_wcswidths(str_list)
         # Try every row count from 1 upwards
         for nrows in range(1, len(str_list)):
             ncols = (size + nrows - 1) // nrows
@@ -3678,8 +3996,7 @@ class Cmd(cmd.Cmd):
                     i = row + nrows * col
                     if i >= size:
                         break
-                    x = str_list[i]
-                    colwidth = max(colwidth, ansi.style_aware_wcswidth(x))
+                    colwidth = max(colwidth, str_widths[i])
                 colwidths.append(colwidth)
                 totwidth += colwidth + 2
                 if totwidth > display_width:
@@ -3763,7 +4080,7 @@ class Cmd(cmd.Cmd):
                 self.print_topics(header, cmds, 15, 80)
             else:
                 # Find the widest command
-                widest = max([ansi.style_aware_wcswidth(command) for command in cmds])
+                widest = max(ansi.style_aware_wcswidths(cmds))
 
                 # Define the table structure
                 name_column = Column('', width=max(widest, 20))
@@ -4008,8 +4325,7 @@ class Cmd(cmd.Cmd):
 
         # Define the table structure
         name_label = 'Name'
-        max_name_width = max([ansi.style_aware_wcswidth(param) for param in to_show])
-        max_name_width = max(max_name_width, ansi.style_aware_wcswidth(name_label))
+        max_name_width = max(ansi.style_aware_wcswidths([name_label, *to_show]))
 
         cols: List[Column] = [
             Column(name_label, width=max_name_width),
@@ -4331,6 +4647,10 @@ class Cmd(cmd.Cmd):
                     self.poutput("Now exiting Python shell...")
 
         finally:
+            # Let a command which the Python code was streaming finish
+            # noinspection PyProtectedMember
+            py_bridge._close_stream()
+
             with self.sigint_protection:
                 if saved_sys_path is not None:
                     sys.path = saved_sys_path
@@ -4458,6 +4778,10 @@ class Cmd(cmd.Cmd):
             TerminalIPythonApp.clear_instance()
             TerminalInteractiveShell.clear_instance()
 
+            # Let a command which the IPython shell was streaming finish
+            # noinspection PyProtectedMember
+            py_bridge._close_stream()
+
             return py_bridge.stop
         finally:
             self._in_py = False
@@ -4535,17 +4859,19 @@ class Cmd(cmd.Cmd):
             self.last_result = True
 
             # Clear command and readline history
-            self.history.clear()
-
-            if self.persistent_history_file:
-                try:
-                    os.remove(self.persistent_history_file)
-                except FileNotFoundError:
-                    pass
-                except OSError as ex:
-                    self.perror(f"Error removing history file '{self.persistent_history_file}': {ex}")
-                    self.last_result = False
-                    return None
+            try:
+                # This also removes an append-only history file
+                self.history.clear()
+
+                if self.persistent_history_file:
+                    try:
+                        os.remove(self.persistent_history_file)
+                    except FileNotFoundError:
+                        pass
+            except OSError as ex:
+                self.perror(f"Error removing history file '{self.persistent_history_file}': {ex}")
+                self.last_result = False
+                return None
 
             if rl_type != RlType.NONE:
                 readline.clear_history()
@@ -4630,12 +4956,16 @@ class Cmd(cmd.Cmd):
             history = self.history.span(':', args.all)
         return history
 
-    def _initialize_history(self, hist_file: str) -> None:
+    def _initialize_history(self, hist_file: str, *, append: bool = False, readline_length: Optional[int] = None) -> None:
         """Initialize history using history related attributes
 
         :param hist_file: optional path to persistent history file. If specified, then history from
                           previous sessions will be included. Additionally, all history will be written
                           to this file when the application exits.
+        :param append: if True, then use an append-only history file which each command is written to
+                       as it is added to history. See :class:`~cmd2.history.HistoryLog`.
+        :param readline_length: max number of the most recent history items to add to readline history.
+                                If None, then all of them are added.
         """
         import json
         import lzma
@@ -4663,22 +4993,45 @@ class Cmd(cmd.Cmd):
             return
 
         # Read and process history file
-        try:
-            with open(hist_file, 'rb') as fobj:
-                compressed_bytes = fobj.read()
-            history_json = lzma.decompress(compressed_bytes).decode(encoding='utf-8')
-            self.history = History.from_json(history_json)
-        except FileNotFoundError:
-            # Just use an empty history
-            pass
-        except OSError as ex:
-            self.perror(f"Cannot read persistent history file '{hist_file}': {ex}")
-            return
-        except (json.JSONDecodeError, lzma.LZMAError, KeyError, UnicodeDecodeError, ValueError) as ex:
-            self.perror(
-                f"Error processing persistent history file '{hist_file}': {ex}\n"
-                f"The history file will be recreated when this application exits."
-            )
+        if append:
+            history_log = HistoryLog(hist_file, self._persistent_history_length)
+            try:
+                self.history = history_log.load()
+            except OSError as ex:
+                self.perror(f"Cannot read persistent history file '{hist_file}': {ex}")
+                return
+            except (json.JSONDecodeError, lzma.LZMAError, KeyError, UnicodeDecodeError, ValueError) as ex:
+                self.perror(
+                    f"Error processing persistent history file '{hist_file}': {ex}\n" f"The history file will be recreated."
+                )
+                try:
+                    history_log.clear()
+                except OSError as clear_ex:
+                    self.perror(f"Error removing history file '{hist_file}': {clear_ex}")
+                    return
+                self.history = History(log=history_log)
+            if history_log.skipped_count:
+                self.pwarning(
+                    f"Skipped {history_log.skipped_count} corrupted item(s) in persistent history file '{hist_file}'"
+                )
+            self._history_log = history_log
+        else:
+            try:
+                with open(hist_file, 'rb') as fobj:
+                    compressed_bytes = fobj.read()
+                history_json = lzma.decompress(compressed_bytes).decode(encoding='utf-8')
+                self.history = History.from_json(history_json)
+            except FileNotFoundError:
+                # Just use an empty history
+                pass
+            except OSError as ex:
+                self.perror(f"Cannot read persistent history file '{hist_file}': {ex}")
+                return
+            except (json.JSONDecodeError, lzma.LZMAError, KeyError, UnicodeDecodeError, ValueError) as ex:
+                self.perror(
+                    f"Error processing persistent history file '{hist_file}': {ex}\n"
+                    f"The history file will be recreated when this application exits."
+                )
 
         self.history.start_session()
         self.persistent_history_file = hist_file
@@ -4686,7 +5039,7 @@ class Cmd(cmd.Cmd):
         # populate readline history
         if rl_type != RlType.NONE:
             last = None
-            for item in self.history:
+            for item in self._readline_history_items(readline_length):
                 # Break the command into its individual lines
                 for line in item.raw.splitlines():
                     # readline only adds a single entry for multiple sequential identical lines
@@ -4702,6 +5055,16 @@ class Cmd(cmd.Cmd):
 
         atexit.register(self._persist_history)
 
+    def _readline_history_items(self, readline_length: Optional[int]) -> Iterable[HistoryItem]:
+        """
+        Return the history items which are added to readline history at startup
+
+        :param readline_length: max number of the most recent history items to return. If None, then all are returned.
+        """
+        if readline_length is None:
+            return self.history
+        return self.history[max(len(self.history) - readline_length, 0) :]
+
     def _persist_history(self) -> None:
         """Write history out to the persistent history file as compressed JSON"""
         import lzma
@@ -4709,6 +5072,16 @@ class Cmd(cmd.Cmd):
         if not self.persistent_history_file:
             return
 
+        # An append-only history file already contains every command. It only needs to be compacted.
+        if self._history_log is not None:
+            try:
+                if self._history_log.needs_compaction:
+                    self._history_log.compact(self.history)
+                self._history_log.close()
+            except OSError as ex:
+                self.perror(f"Cannot write persistent history file '{self.persistent_history_file}': {ex}")
+            return
+
         self.history.truncate(self._persistent_history_length)
         try:
             history_json = self.history.to_json()
@@ -4895,28 +5268,33 @@ class Cmd(cmd.Cmd):
                 self.last_result = True
                 return None
 
-            # Make sure the file is ASCII or UTF-8 encoded text
-            if not utils.is_text_file(expanded_path):
-                self.perror(f"'{expanded_path}' is not an ASCII or UTF-8 encoded text file")
-                return None
-
-            # Read all lines of the script
-            with open(expanded_path, encoding='utf-8') as target:
-                script_commands = target.read().splitlines()
+            # Read the script
+            with open(expanded_path, 'rb') as target:
+                script_data = target.read()
         except OSError as ex:
             self.perror(f"Problem accessing script from '{expanded_path}': {ex}")
             return None
 
+        # Make sure the file is ASCII or UTF-8 encoded text
+        try:
+            script_commands = script_data.decode('utf-8').splitlines()
+        except UnicodeDecodeError:
+            self.perror(f"'{expanded_path}' is not an ASCII or UTF-8 encoded text file")
+            return None
+
         orig_script_dir_count = len(self._script_dir)
 
         try:
             self._script_dir.append(os.path.dirname(expanded_path))
 
+            if self.script_cache_dir:
+                self._preload_script(script_data, script_commands)
+
             if args.transcript:
                 # self.last_resort will be set by _generate_transcript()
                 self._generate_transcript(script_commands, os.path.expanduser(args.transcript))
             else:
-                stop = self.runcmds_plus_hooks(script_commands, stop_on_keyboard_interrupt=True)
+                stop = self.runcmds_plus_hooks(script_commands, stop_on_keyboard_interrupt=True, batch=True)
                 self.last_result = True
                 return stop
 
@@ -4925,8 +5303,121 @@ class Cmd(cmd.Cmd):
                 # Check if a script dir was added before an exception occurred
                 if orig_script_dir_count != len(self._script_dir):
                     self._script_dir.pop()
+
+                # Discard the commands preloaded by this script and any it ran
+                if not self._script_dir:
+                    self.statement_parser.clear_preloaded()
         return None
 
+    def _preload_script(self, script_data: bytes, script_commands: List[str]) -> None:
+        """
+        Preload the parsed commands of a script from script_cache_dir. If the script hasn't been run with the
+        current parser settings, then its commands are parsed and saved there for the next time it runs.
+
+        :param script_data: contents of the script file
+        :param script_commands: lines of the script
+        """
+        import hashlib
+        import json
+
+        # Compiled scripts are keyed on the contents of the script and the settings they were parsed with
+        key = hashlib.sha256(self.statement_parser.settings_key().encode('utf-8'))
+        key.update(script_data)
+        cache_dir = os.path.expanduser(cast(str, self.script_cache_dir))
+        compiled_path = os.path.join(cache_dir, key.hexdigest() + '.json')
+
+        try:
+            with open(compiled_path, encoding='utf-8') as compiled_file:
+                compiled = json.load(compiled_file)
+            if compiled[Cmd._compiled_script_version_field] != Cmd._compiled_script_version:
+                raise ValueError('unsupported version')
+            statements = [Statement.from_dict(d) for d in compiled[Cmd._compiled_script_statements_field]]
+
+            # Mark the compiled script as recently used so it isn't pruned
+            try:
+                os.utime(compiled_path)
+            except OSError:
+                pass
+        except (OSError, ValueError, KeyError, TypeError):
+            statements = self._compile_script(script_commands)
+            compiled = {
+                Cmd._compiled_script_version_field: Cmd._compiled_script_version,
+                Cmd._compiled_script_statements_field: [statement.to_dict() for statement in statements],
+            }
+
+            # Write to a temporary file first so a partially written file is never loaded
+            import tempfile
+
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+                try:
+                    with open(fd, 'w', encoding='utf-8') as temp_file:
+                        json.dump(compiled, temp_file)
+                    os.replace(temp_path, compiled_path)
+                except BaseException:
+                    os.remove(temp_path)
+                    raise
+            except OSError as ex:
+                self.perror(f"Cannot write compiled script to '{cache_dir}': {ex}")
+            else:
+                self._prune_script_cache(cache_dir)
+
+        self.statement_parser.preload(statements)
+
+    def _prune_script_cache(self, cache_dir: str) -> None:
+        """
+        Remove the least recently used compiled scripts from a cache directory once it holds more than
+        script_cache_max_entries of them. Other files in the directory are left alone.
+
+        :param cache_dir: the directory being pruned
+        """
+        compiled_file_pattern = re.compile(r'[0-9a-f]{64}\.json')
+        entries: List[Tuple[int, str]] = []
+        try:
+            with os.scandir(cache_dir) as dir_entries:
+                for entry in dir_entries:
+                    if compiled_file_pattern.fullmatch(entry.name):
+                        try:
+                            entries.append((entry.stat().st_mtime_ns, entry.path))
+                        except OSError:
+                            pass
+        except OSError:
+            return
+
+        if len(entries) <= self.script_cache_max_entries:
+            return
+
+        entries.sort()
+        for _, path in entries[: len(entries) - max(self.script_cache_max_entries, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _compile_script(self, script_commands: List[str]) -> List[Statement]:
+        """
+        Parse the lines of a script which are complete commands
+
+        :param script_commands: lines of the script
+        :return: a Statement for each unique line which parsed to a complete command
+        """
+        statements: Dict[str, Statement] = {}
+        for line in script_commands:
+            if line in statements:
+                continue
+
+            try:
+                statement = self.statement_parser.parse(line)
+            except Cmd2ShlexError:
+                continue
+
+            # Skip blank lines, comments, and multiline commands which continue on the next lines
+            if statement.command and (statement.terminator or not statement.multiline_command):
+                statements[line] = statement
+
+        return list(statements.values())
+
     relative_run_script_description = run_script_description
     relative_run_script_description += (
         "\n\n"
@@ -4971,6 +5462,7 @@ class Cmd(cmd.Cmd):
 
         from .transcript import (
             Cmd2TestCase,
+            run_transcripts_in_pool,
         )
 
         class TestMyAppCase(Cmd2TestCase):
@@ -4999,7 +5491,13 @@ class Cmd(cmd.Cmd):
         # noinspection PyTypeChecker
         runner = unittest.TextTestRunner(stream=stream)
         start_time = time.time()
-        test_results = runner.run(testcase)
+        if self.transcript_workers > 1:
+            app_factory = self.transcript_app_factory if self.transcript_app_factory is not None else type(self)
+            test_results = run_transcripts_in_pool(
+                app_factory, transcripts_expanded, runner, max_workers=self.transcript_workers
+            )
+        else:
+            test_results = runner.run(testcase)
         execution_time = time.time() - start_time
         if test_results.wasSuccessful():
             ansi.style_aware_write(sys.stderr, stream.read())
@@ -5263,6 +5761,9 @@ class Cmd(cmd.Cmd):
         # Grab terminal lock before the command line prompt has been drawn by readline
         self.terminal_lock.acquire()
 
+        # Save the terminal settings to restore after each command
+        self._save_termios_attrs()
+
         # Always run the preloop first
         for func in self._preloop_hooks:
             func()
@@ -5292,6 +5793,9 @@ class Cmd(cmd.Cmd):
         # This will also zero the lock count in case cmdloop() is called again
         self.terminal_lock.release()
 
+        # Commands run outside of cmdloop() will run 'stty sane' since the terminal settings may have changed
+        self._saved_termios_attrs = None
+
         # Restore the original signal handler
         signal.signal(signal.SIGINT, original_sigint_handler)
 
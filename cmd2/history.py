@@ -4,18 +4,23 @@ History management classes
 """
 
 import json
+import os
 import re
 from collections import (
     OrderedDict,
 )
 from typing import (
+    IO,
     Any,
     Callable,
     Dict,
     Iterable,
     List,
     Optional,
+    Set,
+    Tuple,
     Union,
+    cast,
     overload,
 )
 
@@ -117,6 +122,207 @@ class HistoryItem:
         return HistoryItem(Statement.from_dict(statement_dict))
 
 
+class _LazyHistoryItem(HistoryItem):
+    """
+    A HistoryItem read from a :class:`~cmd2.history.HistoryLog` file whose Statement is not
+    created until it is first accessed. This lets large history files load quickly.
+    """
+
+    _source: Optional[Dict[str, Any]]
+    _statement: Optional[Statement]
+
+    def __init__(self, source_dict: Dict[str, Any]) -> None:
+        """
+        Initializer
+
+        :param source_dict: this item's decoded JSON, which has been checked with _is_valid_item_dict()
+        """
+        # HistoryItem is frozen
+        object.__setattr__(self, '_source', source_dict)
+        object.__setattr__(self, '_statement', None)
+
+    @property  # type: ignore[misc]
+    def statement(self) -> Statement:  # type: ignore[override]
+        """The Statement for this item, which is created the first time it is accessed"""
+        statement = self._statement
+        if statement is None:
+            statement = HistoryItem.from_dict(cast(Dict[str, Any], self._source)).statement
+            object.__setattr__(self, '_statement', statement)
+            object.__setattr__(self, '_source', None)
+        return statement
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Utility method to convert this HistoryItem into a dictionary for use in persistent JSON history files"""
+        # Items which haven't been accessed are written back without creating their Statement
+        if self._source is not None:
+            return self._source
+        return super().to_dict()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, HistoryItem):
+            return self.statement == other.statement
+        return NotImplemented
+
+    __hash__ = HistoryItem.__hash__
+
+
+def _is_valid_item_dict(source_dict: Any) -> bool:
+    """
+    Check if JSON read from a history file can be converted to a HistoryItem
+
+    :param source_dict: the decoded JSON
+    :return: True if HistoryItem.from_dict() will succeed
+    """
+    if not isinstance(source_dict, dict):
+        return False
+    statement_dict = source_dict.get(HistoryItem._statement_field)
+    if not isinstance(statement_dict, dict) or Statement._args_field not in statement_dict:
+        return False
+
+    fields = attr.fields_dict(Statement)
+    for name, value in statement_dict.items():
+        field = fields.get(name)
+        if field is None or not isinstance(value, str if field.type is str else list):
+            return False
+    return True
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Return the set of 3 character substrings of a string"""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _required_regex_literals(regex: str) -> List[str]:
+    """
+    Find strings which every match of a regular expression must contain. This is conservative
+    and only finds runs of literal characters which are outside of groups and character classes.
+
+    :param regex: a valid regular expression
+    :return: the literal strings, which may be empty if none could be found
+    """
+    # Inline flags like (?i) can change how literals match
+    if '(?' in regex:
+        return []
+
+    literals: List[str] = []
+    run: List[str] = []
+    depth = 0
+    i = 0
+
+    def end_run() -> None:
+        if run:
+            literals.append(''.join(run))
+            run.clear()
+
+    while i < len(regex):
+        char = regex[i]
+        if char == '\\':
+            escaped = regex[i + 1 : i + 2]
+            if depth == 0 and escaped and not (escaped.isascii() and escaped.isalnum()):
+                # An escaped punctuation character is a literal
+                run.append(escaped)
+            else:
+                # Character classes like \d and other escapes
+                end_run()
+
+                # Skip the rest of escapes like \x41, \u00e9, \N{name} and \12
+                if escaped == 'N' and regex[i + 2 : i + 3] == '{':
+                    i = regex.find('}', i) - 1
+                elif escaped and escaped in 'xuU':
+                    i += {'x': 2, 'u': 4, 'U': 8}[escaped]
+                elif escaped.isdigit():
+                    while regex[i + 2 : i + 3].isdigit():
+                        i += 1
+            i += 2
+            continue
+
+        if char == '[':
+            # Skip the character class
+            end_run()
+            i += 1
+            if regex[i : i + 1] == '^':
+                i += 1
+            if regex[i : i + 1] == ']':
+                i += 1
+            while i < len(regex) and regex[i] != ']':
+                i += 2 if regex[i] == '\\' else 1
+            i += 1
+            continue
+
+        if char == '|' and depth == 0:
+            # Each alternative could match something different
+            return []
+
+        if char in '?*{':
+            # The preceding character is optional or repeated
+            if run:
+                run.pop()
+            end_run()
+            if char == '{':
+                # Skip the repetition count
+                closing = regex.find('}', i)
+                if closing >= 0:
+                    i = closing
+        elif char in '()':
+            depth += 1 if char == '(' else -1
+            end_run()
+        elif char in '+.^$|':
+            end_run()
+        elif depth == 0:
+            run.append(char)
+        i += 1
+
+    end_run()
+    return literals
+
+
+class _HistorySearchIndex:
+    """
+    A trigram index of history items used to narrow the items which :meth:`History.str_search` and
+    :meth:`History.regex_search` need to check. Items are identified by their 0-based index in the History.
+    """
+
+    def __init__(self) -> None:
+        # Maps each trigram to the items whose text contains it
+        self._postings: Dict[str, Set[int]] = {}
+
+        # Normalized and case-folded raw and expanded text of each item, used by str_search()
+        self.folded: List[Tuple[str, str]] = []
+
+    def add(self, history_item: HistoryItem) -> None:
+        """Add the next item in the History to the index"""
+        index = len(self.folded)
+        raw = history_item.raw
+        expanded = history_item.expanded
+        folded = (utils.norm_fold(raw), utils.norm_fold(expanded))
+        self.folded.append(folded)
+
+        # Case-folded text without normalization is included for regex_search(), which doesn't normalize
+        for text in {*folded, raw.casefold(), expanded.casefold()}:
+            for trigram in _trigrams(text):
+                self._postings.setdefault(trigram, set()).add(index)
+
+    def candidates(self, required: Iterable[str], start: int, end: int) -> Iterable[int]:
+        """
+        Find the items which could contain all the required strings
+
+        :param required: case-folded strings which an item's text must contain to be a match
+        :param start: first index to search
+        :param end: index to stop searching (exclusive)
+        :return: the candidate indexes in ascending order
+        """
+        trigrams: Set[str] = set()
+        for text in required:
+            trigrams.update(_trigrams(text))
+
+        if not trigrams:
+            return range(start, end)
+
+        postings = sorted((self._postings.get(trigram, set()) for trigram in trigrams), key=len)
+        matches = set.intersection(*postings)
+        return sorted(index for index in matches if start <= index < end)
+
+
 class History(List[HistoryItem]):
     """A list of :class:`~cmd2.history.HistoryItem` objects with additional methods
     for searching and managing the list.
@@ -136,9 +342,19 @@ class History(List[HistoryItem]):
     _history_version_field = 'history_version'
     _history_items_field = 'history_items'
 
-    def __init__(self, seq: Iterable[HistoryItem] = ()) -> None:
+    def __init__(self, seq: Iterable[HistoryItem] = (), *, log: Optional['HistoryLog'] = None) -> None:
+        """
+        Initializer
+
+        :param seq: items to initialize the history with
+        :param log: optional append-only history file which every item appended to this history is written to
+        """
         super(History, self).__init__(seq)
         self.session_start_index = 0
+        self.log = log
+
+        # Built by the first search and kept up to date by append()
+        self._search_index: Optional[_HistorySearchIndex] = None
 
     def start_session(self) -> None:
         """Start a new session, thereby setting the next index as the first index in the new session."""
@@ -168,11 +384,71 @@ class History(List[HistoryItem]):
         """
         history_item = HistoryItem(new) if isinstance(new, Statement) else new
         super(History, self).append(history_item)
+        if self._search_index is not None:
+            self._search_index.add(history_item)
+        if self.log is not None:
+            self.log.append(history_item)
 
     def clear(self) -> None:
-        """Remove all items from the History list."""
+        """Remove all items from the History list. If this history has a log, then its file is cleared too."""
         super().clear()
+        self._search_index = None
         self.start_session()
+        if self.log is not None:
+            self.log.clear()
+
+    # Any change to the list other than append() means the search index has to be rebuilt
+    def __setitem__(self, *args: Any) -> None:
+        super().__setitem__(*args)
+        self._search_index = None
+
+    def __delitem__(self, *args: Any) -> None:
+        super().__delitem__(*args)
+        self._search_index = None
+
+    def __iadd__(self, other: Iterable[HistoryItem]) -> 'History':  # type: ignore[override,misc]
+        super().__iadd__(other)
+        self._search_index = None
+        return self
+
+    def __imul__(self, count: int) -> 'History':  # type: ignore[override,misc]
+        super().__imul__(count)
+        self._search_index = None
+        return self
+
+    def extend(self, items: Iterable[HistoryItem]) -> None:
+        super().extend(items)
+        self._search_index = None
+
+    def insert(self, index: int, item: HistoryItem) -> None:  # type: ignore[override]
+        super().insert(index, item)
+        self._search_index = None
+
+    def pop(self, index: int = -1) -> HistoryItem:  # type: ignore[override]
+        item = super().pop(index)
+        self._search_index = None
+        return item
+
+    def remove(self, item: HistoryItem) -> None:
+        super().remove(item)
+        self._search_index = None
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._search_index = None
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._search_index = None
+
+    def _get_search_index(self) -> _HistorySearchIndex:
+        """Return the search index, building it if needed"""
+        if self._search_index is None:
+            search_index = _HistorySearchIndex()
+            for history_item in self:
+                search_index.add(history_item)
+            self._search_index = search_index
+        return self._search_index
 
     def get(self, index: int) -> HistoryItem:
         """Get item from the History list using 1-based indexing.
@@ -271,15 +547,16 @@ class History(List[HistoryItem]):
                  or an empty dictionary if the string was not found
         """
 
-        def isin(history_item: HistoryItem) -> bool:
-            """filter function for string search of history"""
-            sloppy = utils.norm_fold(search)
-            inraw = sloppy in utils.norm_fold(history_item.raw)
-            inexpanded = sloppy in utils.norm_fold(history_item.expanded)
-            return inraw or inexpanded
+        sloppy = utils.norm_fold(search)
+        search_index = self._get_search_index()
 
         start = 0 if include_persisted else self.session_start_index
-        return self._build_result_dictionary(start, len(self), isin)
+        results: OrderedDict[int, HistoryItem] = OrderedDict()
+        for index in search_index.candidates([sloppy], start, len(self)):
+            folded_raw, folded_expanded = search_index.folded[index]
+            if sloppy in folded_raw or sloppy in folded_expanded:
+                results[index + 1] = self[index]
+        return results
 
     def regex_search(self, regex: str, include_persisted: bool = False) -> 'OrderedDict[int, HistoryItem]':
         """Find history items which match a given regular expression
@@ -293,13 +570,18 @@ class History(List[HistoryItem]):
         if regex.startswith(r'/') and regex.endswith(r'/'):
             regex = regex[1:-1]
         finder = re.compile(regex, re.DOTALL | re.MULTILINE)
+        start = 0 if include_persisted else self.session_start_index
 
-        def isin(hi: HistoryItem) -> bool:
-            """filter function for doing a regular expression search of history"""
-            return bool(finder.search(hi.raw) or finder.search(hi.expanded))
+        # Only check the items which contain the literal text every match requires
+        required = [literal.casefold() for literal in _required_regex_literals(regex)]
+        candidates = self._get_search_index().candidates(required, start, len(self))
 
-        start = 0 if include_persisted else self.session_start_index
-        return self._build_result_dictionary(start, len(self), isin)
+        results: OrderedDict[int, HistoryItem] = OrderedDict()
+        for index in candidates:
+            hi = self[index]
+            if finder.search(hi.raw) or finder.search(hi.expanded):
+                results[index + 1] = hi
+        return results
 
     def truncate(self, max_length: int) -> None:
         """Truncate the length of the history, dropping the oldest items if necessary
@@ -361,3 +643,213 @@ class History(List[HistoryItem]):
             history.append(HistoryItem.from_dict(hi_dict))
 
         return history
+
+
+class HistoryLog:
+    """An append-only persistent history file.
+
+    Each :class:`~cmd2.history.HistoryItem` is written to the file as one line of
+    JSON as soon as it is appended to the :class:`~cmd2.history.History`. Therefore
+    nothing is lost if the application crashes and the whole history never needs to
+    be rewritten when it exits. The first line of the file is a header containing the
+    file's version.
+
+    Since items are only ever appended, the file is compacted by rewriting it with
+    just the newest items once it holds more than twice the maximum number of items.
+    """
+
+    # Used in the header line
+    _log_version = '1.0.0'
+    _log_version_field = 'history_log_version'
+
+    # Files written by History.to_json() and compressed with LZMA start with these bytes
+    _lzma_magic = b'\xfd7zXZ\x00'
+
+    def __init__(self, filename: str, max_length: int) -> None:
+        """
+        Initializer
+
+        :param filename: path to the history file
+        :param max_length: maximum number of history items to keep in the file. If this is 0 or negative,
+                           then no items are kept.
+        """
+        self.filename = filename
+        self.max_length = max_length
+
+        # Number of items currently in the file
+        self._item_count = 0
+
+        # Number of corrupted items skipped by the last call to load()
+        self.skipped_count = 0
+
+        # Opened when the first item is appended
+        self._fobj: Optional[IO[bytes]] = None
+
+    @property
+    def needs_compaction(self) -> bool:
+        """True if the file holds enough extra items that it should be compacted"""
+        return self._item_count > 2 * max(self.max_length, 0)
+
+    def load(self) -> History:
+        """
+        Read the newest items from the history file. Only the items being kept are decoded.
+        Items which can't be decoded are skipped and counted in :attr:`skipped_count`.
+
+        A file written by :meth:`History.to_json` and compressed with LZMA is converted to this format.
+        If the last line of the file was only partially written, like when the application crashed
+        while writing it, it is ignored and the file is compacted.
+
+        :return: History object whose appended items are written to this file
+        :raises OSError: if the file can't be read or compacted
+        :raises json.JSONDecodeError: if the header or a legacy file contains invalid JSON
+        :raises KeyError: if the header or a legacy file is missing required elements
+        :raises ValueError: if the file isn't a history file of a supported version
+        """
+        try:
+            fobj = open(self.filename, 'rb')
+        except FileNotFoundError:
+            return History(log=self)
+
+        with fobj:
+            header_line = fobj.readline()
+
+            # A legacy compressed history file needs to be converted
+            if header_line.startswith(self._lzma_magic):
+                import lzma
+
+                fobj.seek(0)
+                history = History.from_json(lzma.decompress(fobj.read()).decode(encoding='utf-8'))
+                history.truncate(self.max_length)
+                history.log = self
+                convert = True
+            else:
+                history = History(self._read_items(header_line, fobj), log=self)
+                convert = False
+
+        if convert or self.needs_compaction:
+            self.compact(history)
+        return history
+
+    def _read_items(self, header_line: bytes, fobj: IO[bytes]) -> List[HistoryItem]:
+        """
+        Read the items from a history log file. The file is read in one call and only the items
+        being kept are decoded. Their Statements are created when they are first accessed.
+
+        :param header_line: the first line of the file
+        :param fobj: the file, positioned after the header
+        :return: the newest max_length items in the file
+        """
+        self._item_count = 0
+        self.skipped_count = 0
+
+        # An empty file has no header yet
+        if not header_line:
+            return []
+
+        header = json.loads(header_line)
+        version = header[self._log_version_field] if isinstance(header, dict) else None
+        if version != self._log_version:
+            raise ValueError(
+                f"Unsupported history file version: {version}. This application uses version {self._log_version}."
+            )
+
+        data = fobj.read()
+        end = data.rfind(b'\n') + 1
+        num_lines = data.count(b'\n', 0, end)
+        self._item_count = num_lines
+
+        # A partially written last line is ignored. Make sure it gets compacted out of the file.
+        if end < len(data):
+            self._item_count = 2 * max(self.max_length, 0) + 1
+
+        # Find the newest valid lines by searching backwards from the end. Corrupted lines are skipped
+        # and will be compacted out of the file.
+        items: List[HistoryItem] = []
+        while end > 0 and len(items) < self.max_length:
+            start = data.rfind(b'\n', 0, end - 1) + 1
+            try:
+                source_dict = json.loads(data[start : end - 1])
+            except ValueError:
+                source_dict = None
+            if _is_valid_item_dict(source_dict):
+                items.append(_LazyHistoryItem(source_dict))
+            else:
+                self.skipped_count += 1
+            end = start
+
+        if self.skipped_count:
+            self._item_count = 2 * max(self.max_length, 0) + 1
+        items.reverse()
+        return items
+
+    def _encode(self, history_item: HistoryItem) -> bytes:
+        """Encode a HistoryItem as one line of the file"""
+        return json.dumps(history_item.to_dict(), ensure_ascii=False).encode(encoding='utf-8') + b'\n'
+
+    def _encode_header(self) -> bytes:
+        """Encode the header line of the file"""
+        return json.dumps({self._log_version_field: self._log_version}).encode(encoding='utf-8') + b'\n'
+
+    def append(self, history_item: HistoryItem) -> None:
+        """
+        Write an item to the end of the file
+
+        :param history_item: the item being written
+        :raises OSError: if the file can't be written
+        """
+        if self._fobj is None:
+            self._fobj = open(self.filename, 'ab')
+            if self._fobj.tell() == 0:
+                self._fobj.write(self._encode_header())
+
+        self._fobj.write(self._encode(history_item))
+        self._fobj.flush()
+        self._item_count += 1
+
+    def compact(self, history: History) -> None:
+        """
+        Replace the file with one containing only the newest max_length items of a history.
+        The new file is written completely before it replaces the old one.
+
+        :param history: the history being written
+        :raises OSError: if the file can't be written
+        """
+        import tempfile
+
+        self.close()
+
+        items = history[-self.max_length :] if self.max_length > 0 else []
+
+        fd, temp_filename = tempfile.mkstemp(dir=os.path.dirname(self.filename) or None)
+        try:
+            with open(fd, 'wb') as temp_fobj:
+                temp_fobj.write(self._encode_header())
+                temp_fobj.writelines(self._encode(item) for item in items)
+            os.replace(temp_filename, self.filename)
+        except BaseException:
+            try:
+                os.remove(temp_filename)
+            except OSError:
+                pass
+            raise
+
+        self._item_count = len(items)
+
+    def clear(self) -> None:
+        """
+        Delete all items by removing the file
+
+        :raises OSError: if the file can't be removed
+        """
+        self.close()
+        self._item_count = 0
+        try:
+            os.remove(self.filename)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Close the file if it's open. It will be reopened if another item is appended."""
+        if self._fobj is not None:
+            self._fobj.close()
+            self._fobj = None
@@ -4,11 +4,16 @@
 
 import re
 import shlex
+from collections import (
+    OrderedDict,
+)
 from typing import (
     Any,
+    Callable,
     Dict,
     Iterable,
     List,
+    NamedTuple,
     Optional,
     Tuple,
     Union,
@@ -36,6 +41,12 @@ def shlex_split(str_to_split: str) -> List[str]:
     return shlex.split(str_to_split, comments=False, posix=False)
 
 
+# Used by StatementParser's single-pass lexer to find the tokens shlex_split() would produce.
+# Like shlex in non-POSIX mode, a quote only starts a quoted token at the beginning of a token
+# and the closing quote ends that token. Quotes inside of a word are treated as normal characters.
+_LEXER_TOKEN_PATTERN = re.compile(r'''[ \t\r\n]*(?:("[^"]*"|'[^']*')|(["'])|([^ \t\r\n]+))''')
+
+
 @attr.s(auto_attribs=True, frozen=True)
 class MacroArg:
     """
@@ -250,6 +261,63 @@ class Statement(str):  # type: ignore[override]
         return Statement(value, **kwargs)
 
 
+class ParseCacheInfo(NamedTuple):
+    """Statistics about a StatementParser's parse cache. Returned by :meth:`StatementParser.parse_cache_info`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _ObservedDict(Dict[str, str]):
+    """A dictionary which calls a function whenever its contents are changed"""
+
+    def __init__(self, on_change: Callable[[], None], *args: Any, **kwargs: Any) -> None:
+        """
+        Initializer
+
+        :param on_change: function to call after the dictionary has been changed
+        """
+        super().__init__(*args, **kwargs)
+        self._on_change = on_change
+
+    def __setitem__(self, key: str, value: str) -> None:
+        super().__setitem__(key, value)
+        self._on_change()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._on_change()
+
+    def __ior__(self, other: Any) -> '_ObservedDict':  # type: ignore[override,misc]
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self._on_change()
+
+    def pop(self, *args: Any) -> Any:
+        value = super().pop(*args)
+        self._on_change()
+        return value
+
+    def popitem(self) -> Tuple[str, str]:
+        item = super().popitem()
+        self._on_change()
+        return item
+
+    def setdefault(self, key: str, default: str = '') -> str:
+        value = super().setdefault(key, default)
+        self._on_change()
+        return value
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._on_change()
+
+
 class StatementParser:
     """Parse user input as a string into discrete command components."""
 
@@ -259,6 +327,9 @@ class StatementParser:
         multiline_commands: Optional[Iterable[str]] = None,
         aliases: Optional[Dict[str, str]] = None,
         shortcuts: Optional[Dict[str, str]] = None,
+        *,
+        parse_cache_size: int = 0,
+        single_pass_lexer: bool = False,
     ) -> None:
         """Initialize an instance of StatementParser.
 
@@ -269,14 +340,41 @@ class StatementParser:
         :param multiline_commands: iterable containing the names of commands that accept multiline input
         :param aliases: dictionary containing aliases
         :param shortcuts: dictionary containing shortcuts
+        :param parse_cache_size: maximum number of parsed lines to keep in an LRU cache so that
+                                 repeated lines are not parsed again. The cache is cleared whenever
+                                 aliases, shortcuts, terminators, or multiline commands change.
+                                 Defaults to 0, which disables the cache.
+        :param single_pass_lexer: if ``True``, then lines are split into tokens by a lexer which
+                                  scans each line once instead of running :func:`shlex_split`
+                                  followed by :meth:`split_on_punctuation`. Both produce the
+                                  same tokens, but the single-pass lexer is faster.
+        :raises: ValueError if parse_cache_size is less than 0
         """
-        self.terminators: Tuple[str, ...]
+        if parse_cache_size < 0:
+            raise ValueError("parse_cache_size cannot be less than 0")
+
+        # Cache of parsed lines. It is keyed on the raw line and only holds Statements parsed
+        # during the current generation. The generation is incremented whenever a setting
+        # which affects parsing is changed.
+        self._generation = 0
+        self._parse_cache: 'OrderedDict[str, Statement]' = OrderedDict()
+        self._parse_cache_size = parse_cache_size
+        self._parse_cache_hits = 0
+        self._parse_cache_misses = 0
+
+        # Statements added by preload(), keyed on their raw lines. Like the parse cache,
+        # they are discarded when a setting which affects parsing is changed.
+        self._preloaded: Dict[str, Statement] = {}
+
+        self.single_pass_lexer = single_pass_lexer
+
+        self._terminators: Tuple[str, ...] = ()
         if terminators is None:
             self.terminators = (constants.MULTILINE_TERMINATOR,)
         else:
             self.terminators = tuple(terminators)
-        self.multiline_commands: Tuple[str, ...] = tuple(multiline_commands) if multiline_commands is not None else ()
-        self.aliases: Dict[str, str] = aliases if aliases is not None else {}
+        self.multiline_commands = tuple(multiline_commands) if multiline_commands is not None else ()
+        self.aliases = aliases if aliases is not None else {}
 
         if shortcuts is None:
             shortcuts = constants.DEFAULT_SHORTCUTS
@@ -285,6 +383,110 @@ class StatementParser:
         # should take precedence. (e.g., @@file should match '@@' and not '@'.
         self.shortcuts = tuple(sorted(shortcuts.items(), key=lambda x: len(x[0]), reverse=True))
 
+    @property
+    def terminators(self) -> Tuple[str, ...]:
+        """Strings which terminate commands"""
+        return self._terminators
+
+    @terminators.setter
+    def terminators(self, new_terminators: Tuple[str, ...]) -> None:
+        self._terminators = tuple(new_terminators)
+        self._build_command_pattern()
+        self._build_lexer_patterns()
+        self._invalidate_parse_cache()
+
+    @property
+    def multiline_commands(self) -> Tuple[str, ...]:
+        """Names of commands that accept multiline input"""
+        return self._multiline_commands
+
+    @multiline_commands.setter
+    def multiline_commands(self, new_multiline_commands: Tuple[str, ...]) -> None:
+        self._multiline_commands = tuple(new_multiline_commands)
+        self._invalidate_parse_cache()
+
+    @property
+    def aliases(self) -> Dict[str, str]:
+        """
+        Dictionary of aliases. Changes made to this dictionary are tracked so that
+        cached parse results which depend on aliases are discarded.
+        """
+        return self._aliases
+
+    @aliases.setter
+    def aliases(self, new_aliases: Dict[str, str]) -> None:
+        self._aliases = _ObservedDict(self._invalidate_parse_cache, new_aliases)
+        self._invalidate_parse_cache()
+
+    @property
+    def shortcuts(self) -> Tuple[Tuple[str, str], ...]:
+        """Tuple of (shortcut, expansion) pairs sorted in descending order by shortcut length"""
+        return self._shortcuts
+
+    @shortcuts.setter
+    def shortcuts(self, new_shortcuts: Tuple[Tuple[str, str], ...]) -> None:
+        self._shortcuts = tuple(new_shortcuts)
+        self._invalidate_parse_cache()
+
+    @property
+    def generation(self) -> int:
+        """Counter which is incremented every time a setting which affects parsing is changed"""
+        return self._generation
+
+    def _invalidate_parse_cache(self) -> None:
+        """Start a new generation and discard all parse results from the previous one"""
+        self._generation += 1
+        self._parse_cache.clear()
+        self._preloaded.clear()
+
+    def settings_key(self) -> str:
+        """
+        Return a key which identifies the settings that affect parsing. Parsing a line
+        with settings that have the same key always results in the same Statement.
+        """
+        import hashlib
+        import json
+
+        settings = [
+            self.terminators,
+            self.multiline_commands,
+            sorted(self.aliases.items()),
+            self.shortcuts,
+        ]
+        return hashlib.sha256(json.dumps(settings).encode('utf-8')).hexdigest()
+
+    def preload(self, statements: Iterable[Statement]) -> None:
+        """
+        Make parse() return these Statements instead of parsing their raw lines again.
+        They are discarded when a setting which affects parsing is changed.
+
+        :param statements: Statements parsed with the current settings, like those
+                           saved from an earlier parse with the same :meth:`settings_key`
+        """
+        for statement in statements:
+            self._preloaded[statement.raw] = statement
+
+    def clear_preloaded(self) -> None:
+        """Discard the Statements added by :meth:`preload`"""
+        self._preloaded.clear()
+
+    def parse_cache_info(self) -> ParseCacheInfo:
+        """Report statistics about the parse cache. These can be used to size it."""
+        return ParseCacheInfo(
+            hits=self._parse_cache_hits,
+            misses=self._parse_cache_misses,
+            maxsize=self._parse_cache_size,
+            currsize=len(self._parse_cache),
+        )
+
+    def clear_parse_cache(self) -> None:
+        """Discard all cached parse results and reset the parse cache statistics"""
+        self._parse_cache.clear()
+        self._parse_cache_hits = 0
+        self._parse_cache_misses = 0
+
+    def _build_command_pattern(self) -> None:
+        """Build the regular expression used to find the command in a line"""
         # commands have to be a word, so make a regular expression
         # that matches the first word in the line. This regex has three
         # parts:
@@ -317,6 +519,44 @@ class StatementParser:
         expr = rf'\A\s*(\S*?)({second_group})'
         self._command_pattern = re.compile(expr)
 
+    def _build_lexer_patterns(self) -> None:
+        """Build the regular expressions used by the single-pass lexer"""
+        # Only single characters are treated as punctuation. This matches split_on_punctuation(),
+        # which compares each character of a token against the terminators and redirection characters.
+        punctuation = ''.join(sorted({x for x in [*self.terminators, *constants.REDIRECTION_CHARS] if len(x) == 1}))
+        punctuation_class = re.escape(punctuation)
+
+        # Finds any punctuation character in a token
+        self._punctuation_pattern = re.compile(rf'[{punctuation_class}]')
+
+        # Splits a token into runs of a single punctuation character and runs of everything else
+        self._punctuation_split_pattern = re.compile(rf'([{punctuation_class}])\1*|[^{punctuation_class}]+')
+
+    def _lex(self, line: str) -> List[str]:
+        """
+        Split a line into tokens in a single scan. The result is identical to
+        calling :meth:`split_on_punctuation` on the results of :func:`shlex_split`.
+
+        :param line: the line being split
+        :return: A list of tokens
+        :raises: Cmd2ShlexError if a quoted token is not closed
+        """
+        tokens: List[str] = []
+
+        for match in _LEXER_TOKEN_PATTERN.finditer(line):
+            quoted, unclosed, word = match.groups()
+            if quoted is not None:
+                # Quoted tokens are never split on punctuation
+                tokens.append(quoted)
+            elif unclosed is not None:
+                raise Cmd2ShlexError('No closing quotation')
+            elif len(word) > 1 and self._punctuation_pattern.search(word):
+                tokens.extend(punc_match.group() for punc_match in self._punctuation_split_pattern.finditer(word))
+            else:
+                tokens.append(word)
+
+        return tokens
+
     def is_valid_command(self, word: str, *, is_subcommand: bool = False) -> Tuple[bool, str]:
         """Determine whether a word is a valid name for a command.
 
@@ -385,6 +625,9 @@ class StatementParser:
         if line.lstrip().startswith(constants.COMMENT_CHAR):
             return []
 
+        if self.single_pass_lexer:
+            return self._lex(line)
+
         # split on whitespace
         try:
             tokens = shlex_split(line)
@@ -401,10 +644,39 @@ class StatementParser:
         stripping comments, expanding aliases and shortcuts, and extracting output
         redirection directives.
 
+        If the parse cache is enabled, then a :class:`~cmd2.Statement` previously
+        parsed from the same line may be returned. Since Statements are shared in
+        this case, their ``arg_list`` must not be modified.
+
         :param line: the command line being parsed
-        :return: a new :class:`~cmd2.Statement` object
+        :return: a :class:`~cmd2.Statement` object
         :raises: Cmd2ShlexError if a shlex error occurs (e.g. No closing quotation)
         """
+        if self._preloaded:
+            preloaded = self._preloaded.get(line)
+            if preloaded is not None:
+                return preloaded
+
+        if not self._parse_cache_size:
+            return self._parse(line)
+
+        try:
+            statement = self._parse_cache[line]
+        except KeyError:
+            self._parse_cache_misses += 1
+        else:
+            self._parse_cache_hits += 1
+            self._parse_cache.move_to_end(line)
+            return statement
+
+        statement = self._parse(line)
+        self._parse_cache[line] = statement
+        if len(self._parse_cache) > self._parse_cache_size:
+            self._parse_cache.popitem(last=False)
+        return statement
+
+    def _parse(self, line: str) -> Statement:
+        """Parse a line without consulting the parse cache. See :meth:`parse`."""
 
         # handle the special case/hardcoded terminator of a blank line
         # we have to do this before we tokenize because tokenizing
@@ -628,7 +900,7 @@ class StatementParser:
             to_parse = self.parse(command_name + ' ' + to_parse)
 
         if preserve_quotes:
-            return to_parse, to_parse.arg_list
+            return to_parse, list(to_parse.arg_list)
         else:
             return to_parse, to_parse.argv[1:]
 
@@ -4,7 +4,9 @@ Bridges calls made inside of a Python environment to the Cmd2 host app
 while maintaining a reasonable degree of isolation between the two.
 """
 
+import codecs
 import sys
+import threading
 from contextlib import (
     redirect_stderr,
     redirect_stdout,
@@ -13,6 +15,7 @@ from typing import (
     IO,
     TYPE_CHECKING,
     Any,
+    Iterator,
     List,
     NamedTuple,
     Optional,
@@ -22,6 +25,7 @@ from typing import (
 )
 
 from .utils import (  # namedtuple_with_defaults,
+    ByteBuf,
     StdSim,
 )
 
@@ -82,6 +86,229 @@ class CommandResult(NamedTuple):
             return not self.stderr
 
 
+class _StreamStdSim(StdSim):
+    """
+    StdSim used by CommandStream. Output written by the thread reading the stream, like a pyscript printing
+    what it has read, goes straight to the inner stream. Everything else is command output and is stored.
+    """
+
+    def __init__(self, inner_stream: Union[TextIO, StdSim], *, echo: bool, max_buffered: Optional[int] = None) -> None:
+        """
+        Initializer
+
+        :param inner_stream: the wrapped stream
+        :param echo: if True, then command output will be echoed to inner_stream
+        :param max_buffered: if set, then writers wait for the stream to be read once this many bytes are stored
+        """
+        super().__init__(inner_stream, echo=echo)
+        self.buffer = _StreamByteBuf(self)
+        self.reader_thread = threading.current_thread()
+        self.max_buffered = max_buffered
+        self.reader_closed = False
+
+        # Held while the stored output is accessed. Notified when output is written or read.
+        self.cond = threading.Condition()
+
+    def write(self, s: str) -> None:
+        """Store command output and route other output to the inner stream"""
+        if threading.current_thread() is self.reader_thread:
+            self.inner_stream.write(s)
+        else:
+            with self.cond:
+                super().write(s)
+                self.wait_for_reader()
+
+    def stored_size(self) -> int:
+        """Return the number of bytes which have not been read. Call this while holding cond."""
+        # noinspection PyProtectedMember
+        return len(self._contents)
+
+    def wait_for_reader(self) -> None:
+        """Notify the reader of new output and wait if too much is stored. Call this while holding cond."""
+        if self.reader_closed:
+            # Nobody will read this
+            self.clear()
+
+        self.cond.notify_all()
+        if self.max_buffered is not None:
+            while self.stored_size() > self.max_buffered and not self.reader_closed:
+                self.cond.wait()
+
+
+class _StreamByteBuf(ByteBuf):
+    """ByteBuf used by _StreamStdSim"""
+
+    def write(self, b: bytes) -> None:
+        """Store command output and route other output to the inner stream"""
+        std_sim = cast(_StreamStdSim, self.std_sim_instance)
+        if threading.current_thread() is std_sim.reader_thread:
+            std_sim.inner_stream.buffer.write(b)
+        else:
+            with std_sim.cond:
+                super().write(b)
+                std_sim.wait_for_reader()
+
+
+class CommandStream:
+    """Streams the output of a cmd2 app command while the command runs. Returned by :meth:`PyBridge.stream`.
+
+    Iterating over a CommandStream yields chunks of the command's stdout as they are written. :meth:`lines`
+    yields it one line at a time. Output is discarded once it has been read, so large output can be processed
+    without holding all of it in memory. If the stream isn't read, then the command pauses once
+    ``max_buffered`` bytes are waiting.
+
+    Once the output has been read, :attr:`result` holds the command's :class:`CommandResult`. Its stdout
+    is empty since that output was already read from the stream.
+
+    The code would look like this::
+
+        with app.stream('history') as output:
+            for line in output.lines():
+                if 'speak' in line:
+                    print(line)
+
+        if not output.result:
+            print(output.result.stderr)
+
+    .. note::
+
+       The command runs in a separate thread while its output is read. Since only one command can run at a
+       time, running another command with the bridge first closes any unfinished stream.
+    """
+
+    # Number of bytes of output which can wait to be read before the command pauses
+    max_buffered = 65536
+
+    def __init__(self, py_bridge: 'PyBridge', command: str, *, echo: bool) -> None:
+        """
+        Start running a command
+
+        :param py_bridge: bridge to the cmd2 app running the command
+        :param command: command line being run
+        :param echo: if True, output will be echoed to stdout/stderr
+        """
+        self._py_bridge = py_bridge
+
+        # This will be used to capture _cmd2_app.stdout and sys.stdout
+        self._stdout = _StreamStdSim(
+            cast(Union[TextIO, StdSim], py_bridge._cmd2_app.stdout), echo=echo, max_buffered=self.max_buffered
+        )
+
+        # Pause the storing of stdout until onecmd_plus_hooks enables it
+        self._stdout.pause_storage = True
+
+        # This will be used to capture sys.stderr
+        self._stderr = _StreamStdSim(sys.stderr, echo=echo)
+
+        # Decodes stdout without splitting multibyte characters between chunks
+        self._decoder = codecs.getincrementaldecoder(self._stdout.encoding)(errors=self._stdout.errors)
+
+        self._finished = False
+        self._result = CommandResult()
+        self._error: Optional[BaseException] = None
+
+        self._thread = threading.Thread(target=self._run, args=(command,), daemon=True)
+        self._thread.start()
+
+    def _run(self, command: str) -> None:
+        """Run the command. This is the target of the command thread."""
+        try:
+            # noinspection PyProtectedMember
+            stop = self._py_bridge._run_command(command, self._stdout, self._stderr)
+            self._result = CommandResult(
+                stderr=self._stderr.getvalue(),
+                stop=stop,
+                data=self._py_bridge._cmd2_app.last_result,
+            )
+        except BaseException as ex:
+            self._error = ex
+        finally:
+            with self._stdout.cond:
+                self._finished = True
+                self._stdout.cond.notify_all()
+
+    def __enter__(self) -> 'CommandStream':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield chunks of stdout as the command writes them"""
+        try:
+            while True:
+                with self._stdout.cond:
+                    while not self._stdout.stored_size() and not self._finished:
+                        self._stdout.cond.wait()
+                    finished = self._finished
+                    data = self._stdout.readbytes()
+                    self._stdout.cond.notify_all()
+
+                text = self._decoder.decode(data, final=finished)
+                if text:
+                    yield text
+                if finished:
+                    break
+        finally:
+            self.close()
+
+        if self._error is not None:
+            raise self._error
+
+    def lines(self, *, keepends: bool = False) -> Iterator[str]:
+        """
+        Yield lines of stdout as the command writes them
+
+        :param keepends: if True, then the line endings are included
+        """
+        # Pieces of the line being read. A line may be split across many chunks.
+        pieces: List[str] = []
+
+        for chunk in self:
+            start = 0
+            while True:
+                end = chunk.find('\n', start)
+                if end == -1:
+                    break
+
+                pieces.append(chunk[start : end + 1 if keepends else end])
+                yield ''.join(pieces)
+                pieces.clear()
+                start = end + 1
+
+            if start < len(chunk):
+                pieces.append(chunk[start:])
+
+        if pieces:
+            yield ''.join(pieces)
+
+    def close(self) -> None:
+        """Stop reading the stream and wait for the command to finish. Any unread output is discarded."""
+        with self._stdout.cond:
+            self._stdout.reader_closed = True
+            self._stdout.clear()
+            self._stdout.cond.notify_all()
+
+        self._thread.join()
+
+        # noinspection PyProtectedMember
+        if self._py_bridge._active_stream is self:
+            self._py_bridge._active_stream = None
+
+    @property
+    def result(self) -> CommandResult:
+        """
+        Results of the command. This closes the stream, so if it hasn't been read to the end, then
+        the rest of its output is discarded.
+
+        :raises: any exception raised while running the command
+        """
+        self.close()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
 class PyBridge:
     """Provides a Python API wrapper for application commands."""
 
@@ -89,13 +316,22 @@ class PyBridge:
         self._cmd2_app = cmd2_app
         self.cmd_echo = False
 
+        # Limits on how output captured by __call__ is stored. See StdSim for their meaning.
+        self.max_retained: Optional[int] = None
+        self.spill_size: Optional[int] = None
+
         # Tells if any of the commands run via __call__ returned True for stop
         self.stop = False
 
+        # Stream returned by stream() whose command may still be running
+        self._active_stream: Optional[CommandStream] = None
+
     def __dir__(self) -> List[str]:
         """Return a custom set of attribute names"""
         attributes: List[str] = []
         attributes.insert(0, 'cmd_echo')
+        attributes.extend(['max_retained', 'spill_size'])
+        attributes.append('stream')
         return attributes
 
     def __call__(self, command: str, *, echo: Optional[bool] = None) -> CommandResult:
@@ -105,20 +341,69 @@ class PyBridge:
         :param command: command line being run
         :param echo: If provided, this temporarily overrides the value of self.cmd_echo while the
                      command runs. If True, output will be echoed to stdout/stderr. (Defaults to None)
-
+        :raises: ValueError if self.max_retained or self.spill_size is invalid
         """
+        self._close_stream()
+
         if echo is None:
             echo = self.cmd_echo
 
         # This will be used to capture _cmd2_app.stdout and sys.stdout
-        copy_cmd_stdout = StdSim(cast(Union[TextIO, StdSim], self._cmd2_app.stdout), echo=echo)
+        copy_cmd_stdout = StdSim(
+            cast(Union[TextIO, StdSim], self._cmd2_app.stdout),
+            echo=echo,
+            max_retained=self.max_retained,
+            spill_size=self.spill_size,
+        )
 
         # Pause the storing of stdout until onecmd_plus_hooks enables it
         copy_cmd_stdout.pause_storage = True
 
         # This will be used to capture sys.stderr
-        copy_stderr = StdSim(sys.stderr, echo=echo)
+        copy_stderr = StdSim(sys.stderr, echo=echo, max_retained=self.max_retained, spill_size=self.spill_size)
+
+        stop = self._run_command(command, copy_cmd_stdout, copy_stderr)
+
+        # Save the result
+        result = CommandResult(
+            stdout=copy_cmd_stdout.getvalue(),
+            stderr=copy_stderr.getvalue(),
+            stop=stop,
+            data=self._cmd2_app.last_result,
+        )
+        return result
+
+    def stream(self, command: str, *, echo: Optional[bool] = None) -> CommandStream:
+        """
+        Run an application command and read its output while it runs
+        ex: for line in app.stream('history').lines():
+        :param command: command line being run
+        :param echo: If provided, this temporarily overrides the value of self.cmd_echo while the
+                     command runs. If True, output will be echoed to stdout/stderr. (Defaults to None)
+        :return: a CommandStream which yields the command's stdout
+        """
+        self._close_stream()
+
+        if echo is None:
+            echo = self.cmd_echo
+
+        self._active_stream = CommandStream(self, command, echo=echo)
+        return self._active_stream
 
+    def _close_stream(self) -> None:
+        """Close the stream returned by stream() and wait for its command to finish"""
+        if self._active_stream is not None:
+            self._active_stream.close()
+
+    def _run_command(self, command: str, copy_cmd_stdout: StdSim, copy_stderr: StdSim) -> bool:
+        """
+        Run a command while capturing its output
+
+        :param command: command line being run
+        :param copy_cmd_stdout: captures _cmd2_app.stdout and sys.stdout
+        :param copy_stderr: captures sys.stderr
+        :return: the value of stop returned by onecmd_plus_hooks
+        """
         self._cmd2_app.last_result = None
 
         stop = False
@@ -132,11 +417,4 @@ class PyBridge:
                 self._cmd2_app.stdout = cast(IO[str], copy_cmd_stdout.inner_stream)
                 self.stop = stop or self.stop
 
-        # Save the result
-        result = CommandResult(
-            stdout=copy_cmd_stdout.getvalue(),
-            stderr=copy_stderr.getvalue(),
-            stop=stop,
-            data=self._cmd2_app.last_result,
-        )
-        return result
+        return stop
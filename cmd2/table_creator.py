@@ -15,12 +15,19 @@ from enum import (
 )
 from typing import (
     Any,
+    Callable,
     Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
     List,
     Optional,
     Sequence,
     Tuple,
+    TypeVar,
     Union,
+    cast,
 )
 
 from wcwidth import (  # type: ignore[import]
@@ -37,6 +44,11 @@ from . import (
 EMPTY = ''
 SPACE = ' '
 
+# Maximum number of row templates and generated rows each table caches
+_MAX_CACHED_ROWS = 64
+
+_CachedT = TypeVar('_CachedT')
+
 
 class HorizontalAlignment(Enum):
     """Horizontal alignment of text in a cell"""
@@ -115,6 +127,130 @@ class Column:
         self.max_data_lines = max_data_lines
 
 
+def fit_columns(
+    cols: Sequence[Column],
+    table_data: Iterable[Sequence[Any]],
+    *,
+    base_width: int = 0,
+    max_width: Optional[int] = None,
+    sample_size: Optional[int] = 1000,
+    percentile: float = 90,
+    tab_width: int = 4,
+) -> List[int]:
+    """
+    Set the width of each column which doesn't have one based on the data it will display, while keeping the
+    table within a display width. Call this before creating a table with the columns.
+
+    Each column is made wide enough for its header and for the given percentile of its data lines. Using a percentile
+    keeps a few very long values from making a column wide. Those values will wrap instead. If the columns don't fit
+    within max_width, then the widest are narrowed until they do.
+
+    Only the first sample_size rows of table_data are measured. To measure all of the data, set sample_size to None.
+    In that case, table_data should be a sequence or other iterable which can be read again to generate the table.
+    If table_data is an iterator, then the rows measured are consumed. To stream a large data set, read a sample
+    into a list, pass that to this function, and then generate the table from the sample followed by the rest of
+    the data (e.g. itertools.chain(sample, data)).
+
+    :param cols: column definitions of the table. Columns which were created without a width will have it set.
+    :param table_data: data with an entry for each data row of the table. Each entry should have data for
+                       each column in the row.
+    :param base_width: display width used by the table's borders and padding. Table classes provide this through
+                       their base_width() method (e.g. BorderedTable.base_width(len(cols))). Defaults to 0.
+    :param max_width: display width the table must fit within. Defaults to width of the terminal.
+    :param sample_size: maximum number of rows to measure or None to measure all rows. Defaults to 1000.
+    :param percentile: percentile of each column's data line widths to make the column wide enough for. Set this to
+                       100 to fit the widest line. Defaults to 90.
+    :param tab_width: tabs in the data will be counted as this many spaces. This should match the tab_width
+                      of the table. Defaults to 4.
+    :return: the width of each column
+    :raises: ValueError if sample_size is less than 1
+    :raises: ValueError if percentile is not greater than 0 and less than or equal to 100
+    :raises: ValueError if tab_width is less than 1
+    """
+    import itertools
+    import math
+    import shutil
+
+    if sample_size is not None and sample_size < 1:
+        raise ValueError("Sample size cannot be less than 1")
+    if not 0 < percentile <= 100:
+        raise ValueError("Percentile must be greater than 0 and less than or equal to 100")
+    if tab_width < 1:
+        raise ValueError("Tab width cannot be less than 1")
+
+    if max_width is None:
+        max_width = shutil.get_terminal_size().columns
+
+    tab_spaces = SPACE * tab_width
+    auto_indexes = [index for index, col in enumerate(cols) if col.width <= 0]
+    if not auto_indexes:
+        return [col.width for col in cols]
+
+    # Gather the lines of data in each column being fit
+    col_lines: Dict[int, List[str]] = {index: [] for index in auto_indexes}
+    rows = table_data if sample_size is None else itertools.islice(table_data, sample_size)
+    for row_data in rows:
+        for index in auto_indexes:
+            col_lines[index].extend(str(row_data[index]).replace('\t', tab_spaces).splitlines())
+
+    # Find how wide each column would like to be
+    desired_widths: Dict[int, int] = {}
+    for index in auto_indexes:
+        header_width = ansi.widest_line(cols[index].header.replace('\t', tab_spaces))
+        line_widths = sorted(ansi.style_aware_wcswidths(col_lines[index]))
+        if line_widths:
+            # Use the nearest-rank method
+            rank = max(1, math.ceil(percentile / 100 * len(line_widths)))
+            data_width = line_widths[rank - 1]
+        else:
+            data_width = 0
+        desired_widths[index] = max(1, header_width, data_width)
+
+    # Columns with a width set keep it. Divide the remaining space among the others, starting with
+    # the narrowest. A column which needs less than an even share gets only what it needs.
+    available = max_width - base_width - sum(col.width for col in cols if col.width > 0)
+    pending = sorted(auto_indexes, key=lambda i: desired_widths[i])
+    while pending:
+        share = max(available, 0) // len(pending)
+        index = pending[0]
+        if desired_widths[index] <= share:
+            cols[index].width = desired_widths[index]
+            available -= desired_widths[index]
+            pending.pop(0)
+            continue
+
+        # The rest of the columns are narrowed to an even share. The widest get any leftover space.
+        leftover = max(available, 0) - share * len(pending)
+        for pending_index, index in enumerate(pending):
+            extra = 1 if pending_index >= len(pending) - leftover else 0
+            cols[index].width = max(1, share + extra)
+        break
+
+    return [col.width for col in cols]
+
+
+class _RowTemplate:
+    """The parts of a table row which are the same for every row generated with them"""
+
+    def __init__(self, fill_char: str, pre_line: str, inter_cell: str, post_line: str) -> None:
+        self.fill_char = fill_char
+        self.pre_line = pre_line
+        self.inter_cell = inter_cell
+        self.post_line = post_line
+
+        # Lines of fill characters used to vertically align cells, keyed by display width
+        self._padding_lines: Dict[int, str] = {}
+
+    def padding_line(self, width: int) -> str:
+        """Return a line of fill characters with the given display width"""
+        try:
+            return self._padding_lines[width]
+        except KeyError:
+            padding_line = utils.align_left(EMPTY, fill_char=self.fill_char, width=width)
+            self._padding_lines[width] = padding_line
+            return padding_line
+
+
 class TableCreator:
     """
     Base table creation class. This class handles ANSI style sequences and characters with display widths greater than 1
@@ -145,6 +281,10 @@ class TableCreator:
         self.cols = copy.copy(cols)
         self.tab_width = tab_width
 
+        # Validated row parts passed to generate_row() and strings built from them, such as borders
+        self._row_templates: Dict[Tuple[str, str, str, str, int], _RowTemplate] = {}
+        self._cached_rows: Dict[Hashable, Any] = {}
+
         for col in self.cols:
             # Replace tabs before calculating width of header strings
             col.header = col.header.replace('\t', SPACE * self.tab_width)
@@ -394,11 +534,10 @@ class TableCreator:
         :return: Tuple(deque of cell lines, display width of the cell)
         """
         # Convert data to string and replace tabs with spaces
-        data_str = str(cell_data).replace('\t', SPACE * self.tab_width)
-
-        # Wrap text in this cell
-        max_lines = constants.INFINITY if is_header else col.max_data_lines
-        wrapped_text = self._wrap_text(data_str, col.width, max_lines)
+        if isinstance(cell_data, ansi.StyledText) and '\t' not in cell_data:
+            data_str = cell_data
+        else:
+            data_str = ansi.StyledText(str(cell_data).replace('\t', SPACE * self.tab_width))
 
         # Align the text horizontally
         horiz_alignment = col.header_horiz_align if is_header else col.data_horiz_align
@@ -409,6 +548,16 @@ class TableCreator:
         else:
             text_alignment = utils.TextAlignment.RIGHT
 
+        # Text which fits on one line doesn't need to be wrapped. This is only skipped when the cell
+        # has one line since _wrap_text() may add an ellipsis to the last line it's allowed to write.
+        max_lines = constants.INFINITY if is_header else col.max_data_lines
+        if max_lines > 1 and 0 <= data_str.width <= col.width and data_str.plain.splitlines() == [data_str.plain]:
+            aligned_line = utils.align_text(data_str, fill_char=fill_char, width=col.width, alignment=text_alignment)
+            return deque([aligned_line]), col.width
+
+        # Wrap text in this cell
+        wrapped_text = self._wrap_text(data_str, col.width, max_lines)
+
         aligned_text = utils.align_text(wrapped_text, fill_char=fill_char, width=col.width, alignment=text_alignment)
 
         # Calculate cell_width first to avoid having 2 copies of aligned_text.splitlines() in memory
@@ -448,61 +597,30 @@ class TableCreator:
                  character like a newline
         """
 
-        class Cell:
-            """Inner class which represents a table cell"""
-
-            def __init__(self) -> None:
-                # Data in this cell split into individual lines
-                self.lines: Deque[str] = deque()
-
-                # Display width of this cell
-                self.width = 0
-
         if len(row_data) != len(self.cols):
             raise ValueError("Length of row_data must match length of cols")
 
-        # Replace tabs (tabs in data strings will be handled in _generate_cell_lines())
-        fill_char = fill_char.replace('\t', SPACE)
-        pre_line = pre_line.replace('\t', SPACE * self.tab_width)
-        inter_cell = inter_cell.replace('\t', SPACE * self.tab_width)
-        post_line = post_line.replace('\t', SPACE * self.tab_width)
-
-        # Validate fill_char character count
-        if len(ansi.strip_style(fill_char)) != 1:
-            raise TypeError("Fill character must be exactly one character long")
-
-        # Look for unprintable characters
-        validation_dict = {'fill_char': fill_char, 'pre_line': pre_line, 'inter_cell': inter_cell, 'post_line': post_line}
-        for key, val in validation_dict.items():
-            if ansi.style_aware_wcswidth(val) == -1:
-                raise ValueError(f"{key} contains an unprintable character")
-
-        # Number of lines this row uses
-        total_lines = 0
+        template = self._get_row_template(fill_char, pre_line, inter_cell, post_line)
 
         # Generate the cells for this row
-        cells = list()
-
-        for col_index, col in enumerate(self.cols):
-            cell = Cell()
-            cell.lines, cell.width = self._generate_cell_lines(row_data[col_index], is_header, col, fill_char)
-            cells.append(cell)
-            total_lines = max(len(cell.lines), total_lines)
+        cells = [
+            self._generate_cell_lines(cell_data, is_header, col, template.fill_char)
+            for cell_data, col in zip(row_data, self.cols)
+        ]
 
-        row_buf = io.StringIO()
+        # Number of lines this row uses
+        total_lines = max((len(cell_lines) for cell_lines, _ in cells), default=0)
 
         # Vertically align each cell
-        for cell_index, cell in enumerate(cells):
-            col = self.cols[cell_index]
-            vert_align = col.header_vert_align if is_header else col.data_vert_align
-
+        for (cell_lines, cell_width), col in zip(cells, self.cols):
             # Check if this cell need vertical filler
-            line_diff = total_lines - len(cell.lines)
+            line_diff = total_lines - len(cell_lines)
             if line_diff == 0:
                 continue
 
             # Add vertical filler lines
-            padding_line = utils.align_left(EMPTY, fill_char=fill_char, width=cell.width)
+            padding_line = template.padding_line(cell_width)
+            vert_align = col.header_vert_align if is_header else col.data_vert_align
             if vert_align == VerticalAlignment.TOP:
                 to_top = 0
                 to_bottom = line_diff
@@ -513,29 +631,73 @@ class TableCreator:
                 to_top = line_diff
                 to_bottom = 0
 
-            for i in range(to_top):
-                cell.lines.appendleft(padding_line)
-            for i in range(to_bottom):
-                cell.lines.append(padding_line)
+            cell_lines.extendleft([padding_line] * to_top)
+            cell_lines.extend([padding_line] * to_bottom)
 
         # Build this row one line at a time
-        for line_index in range(total_lines):
-            for cell_index, cell in enumerate(cells):
-                if cell_index == 0:
-                    row_buf.write(pre_line)
+        row_lines = [
+            template.pre_line
+            + template.inter_cell.join(cell_lines[line_index] for cell_lines, _ in cells)
+            + template.post_line
+            for line_index in range(total_lines)
+        ]
+        return '\n'.join(row_lines)
+
+    def _get_row_template(self, fill_char: str, pre_line: str, inter_cell: str, post_line: str) -> _RowTemplate:
+        """
+        Validate the parts of a row passed to generate_row(). Since these usually don't change between rows,
+        the result is cached.
 
-                row_buf.write(cell.lines[line_index])
+        :raises: TypeError if fill_char is more than one character (not including ANSI style sequences)
+        :raises: ValueError if fill_char, pre_line, inter_cell, or post_line contains an unprintable
+                 character like a newline
+        """
+        key = (fill_char, pre_line, inter_cell, post_line, self.tab_width)
+        try:
+            return self._row_templates[key]
+        except KeyError:
+            pass
 
-                if cell_index < len(self.cols) - 1:
-                    row_buf.write(inter_cell)
-                if cell_index == len(self.cols) - 1:
-                    row_buf.write(post_line)
+        # Replace tabs (tabs in data strings will be handled in _generate_cell_lines())
+        fill_char = fill_char.replace('\t', SPACE)
+        pre_line = pre_line.replace('\t', SPACE * self.tab_width)
+        inter_cell = inter_cell.replace('\t', SPACE * self.tab_width)
+        post_line = post_line.replace('\t', SPACE * self.tab_width)
+
+        # Validate fill_char character count
+        if len(ansi.strip_style(fill_char)) != 1:
+            raise TypeError("Fill character must be exactly one character long")
 
-            # Add a newline if this is not the last line
-            if line_index < total_lines - 1:
-                row_buf.write('\n')
+        # Look for unprintable characters
+        validation_dict = {'fill_char': fill_char, 'pre_line': pre_line, 'inter_cell': inter_cell, 'post_line': post_line}
+        for key_name, val in validation_dict.items():
+            if ansi.style_aware_wcswidth(val) == -1:
+                raise ValueError(f"{key_name} contains an unprintable character")
+
+        # Tables only use a few distinct templates, so this limit is just a guard against unbounded growth
+        if len(self._row_templates) >= _MAX_CACHED_ROWS:
+            self._row_templates.clear()
+
+        template = _RowTemplate(fill_char, pre_line, inter_cell, post_line)
+        self._row_templates[key] = template
+        return template
+
+    def _get_cached_row(self, key: Hashable, generate: Callable[[], _CachedT]) -> _CachedT:
+        """
+        Return a cached value, such as a border, which only depends on the table's configuration
 
-        return row_buf.getvalue()
+        :param key: key which includes every setting the value depends on
+        :param generate: function which creates the value if it isn't cached
+        :return: the cached value
+        """
+        try:
+            return cast(_CachedT, self._cached_rows[key])
+        except KeyError:
+            if len(self._cached_rows) >= _MAX_CACHED_ROWS:
+                self._cached_rows.clear()
+            value = generate()
+            self._cached_rows[key] = value
+            return value
 
 
 ############################################################################################################
@@ -649,8 +811,7 @@ class SimpleTable(TableCreator):
         """Generate table header with an optional divider row"""
         header_buf = io.StringIO()
 
-        fill_char = self.apply_header_bg(SPACE)
-        inter_cell = self.apply_header_bg(self.column_spacing * SPACE)
+        fill_char, inter_cell = self._get_row_parts(self.apply_header_bg)
 
         # Apply background color to header text in Columns which allow it
         to_display: List[Any] = []
@@ -678,6 +839,18 @@ class SimpleTable(TableCreator):
 
         return utils.align_left('', fill_char=self.divider_char, width=self.total_width())
 
+    def _get_row_parts(self, apply_bg: Callable[[Any], str]) -> Tuple[str, str]:
+        """
+        Build the fill_char and inter_cell arguments to generate_row() for a header or data row.
+        These are cached for each background style since they don't depend on the row's data.
+
+        :param apply_bg: function which applies the background color of the row
+        :return: Tuple(fill_char, inter_cell)
+        """
+        fill_char = apply_bg(SPACE)
+        key = ('row_parts', fill_char, self.column_spacing)
+        return self._get_cached_row(key, lambda: (fill_char, apply_bg(self.column_spacing * SPACE)))
+
     def generate_data_row(self, row_data: Sequence[Any]) -> str:
         """
         Generate a data row
@@ -689,8 +862,7 @@ class SimpleTable(TableCreator):
         if len(row_data) != len(self.cols):
             raise ValueError("Length of row_data must match length of cols")
 
-        fill_char = self.apply_data_bg(SPACE)
-        inter_cell = self.apply_data_bg(self.column_spacing * SPACE)
+        fill_char, inter_cell = self._get_row_parts(self.apply_data_bg)
 
         # Apply background color to data text in Columns which allow it
         to_display: List[Any] = []
@@ -713,29 +885,42 @@ class SimpleTable(TableCreator):
                             each row (Defaults to 1)
         :raises: ValueError if row_spacing is less than 0
         """
+        return '\n'.join(self.iter_table(table_data, include_header=include_header, row_spacing=row_spacing))
+
+    def iter_table(
+        self, table_data: Iterable[Sequence[Any]], *, include_header: bool = True, row_spacing: int = 1
+    ) -> Iterator[str]:
+        """
+        Generate a table one row at a time. Rows are produced as table_data is consumed, so table_data can be
+        any iterable, including a generator which is too large to hold in memory.
+
+        Joining the results with newlines produces the same text as generate_table().
+
+        :param table_data: Data with an entry for each data row of the table. Each entry should have data for
+                           each column in the row.
+        :param include_header: If True, then a header will be included at top of table. (Defaults to True)
+        :param row_spacing: A number 0 or greater specifying how many blank lines to place between
+                            each row (Defaults to 1)
+        :return: iterator of the header and rows of the table. These strings do not end in a newline.
+        :raises: ValueError if row_spacing is less than 0
+        """
         if row_spacing < 0:
             raise ValueError("Row spacing cannot be less than 0")
+        return self._iter_table(table_data, include_header, row_spacing)
 
-        table_buf = io.StringIO()
-
+    def _iter_table(self, table_data: Iterable[Sequence[Any]], include_header: bool, row_spacing: int) -> Iterator[str]:
+        """Generator which does the work of iter_table() after its arguments are validated"""
         if include_header:
-            header = self.generate_header()
-            table_buf.write(header)
-            if len(table_data) > 0:
-                table_buf.write('\n')
+            yield self.generate_header()
 
-        row_divider = utils.align_left('', fill_char=self.apply_data_bg(SPACE), width=self.total_width()) + '\n'
+        row_divider = utils.align_left('', fill_char=self.apply_data_bg(SPACE), width=self.total_width())
 
         for index, row_data in enumerate(table_data):
-            if index > 0 and row_spacing > 0:
-                table_buf.write(row_spacing * row_divider)
-
-            row = self.generate_data_row(row_data)
-            table_buf.write(row)
-            if index < len(table_data) - 1:
-                table_buf.write('\n')
+            if index > 0:
+                for _ in range(row_spacing):
+                    yield row_divider
 
-        return table_buf.getvalue()
+            yield self.generate_data_row(row_data)
 
 
 class BorderedTable(TableCreator):
@@ -847,105 +1032,92 @@ class BorderedTable(TableCreator):
 
     def generate_table_top_border(self) -> str:
         """Generate a border which appears at the top of the header and data section"""
-        fill_char = '═'
-
-        pre_line = '╔' + self.padding * '═'
-
-        inter_cell = self.padding * '═'
-        if self.column_borders:
-            inter_cell += "╤"
-        inter_cell += self.padding * '═'
-
-        post_line = self.padding * '═' + '╗'
-
-        return self.generate_row(
-            self.empty_data,
-            is_header=False,
-            fill_char=self.apply_border_color(fill_char),
-            pre_line=self.apply_border_color(pre_line),
-            inter_cell=self.apply_border_color(inter_cell),
-            post_line=self.apply_border_color(post_line),
-        )
+        return self._generate_border('═', '╔', '╤', '╗')
 
     def generate_header_bottom_border(self) -> str:
         """Generate a border which appears at the bottom of the header"""
-        fill_char = '═'
+        return self._generate_border('═', '╠', '╪', '╣')
 
-        pre_line = '╠' + self.padding * '═'
+    def generate_row_bottom_border(self) -> str:
+        """Generate a border which appears at the bottom of rows"""
+        return self._generate_border('─', '╟', '┼', '╢')
 
-        inter_cell = self.padding * '═'
-        if self.column_borders:
-            inter_cell += '╪'
-        inter_cell += self.padding * '═'
+    def generate_table_bottom_border(self) -> str:
+        """Generate a border which appears at the bottom of the table"""
+        return self._generate_border('═', '╚', '╧', '╝')
 
-        post_line = self.padding * '═' + '╣'
+    def _generate_border(self, fill_char: str, left_char: str, junction_char: str, right_char: str) -> str:
+        """
+        Generate a border row. Borders are cached since they only change when the table's settings do.
 
-        return self.generate_row(
-            self.empty_data,
-            is_header=False,
-            fill_char=self.apply_border_color(fill_char),
-            pre_line=self.apply_border_color(pre_line),
-            inter_cell=self.apply_border_color(inter_cell),
-            post_line=self.apply_border_color(post_line),
-        )
+        :param fill_char: character which makes up the border line
+        :param left_char: character at the left end of the border
+        :param junction_char: character where the border meets a column border
+        :param right_char: character at the right end of the border
+        :return: border string
+        """
 
-    def generate_row_bottom_border(self) -> str:
-        """Generate a border which appears at the bottom of rows"""
-        fill_char = '─'
+        def generate() -> str:
+            pre_line = left_char + self.padding * fill_char
 
-        pre_line = '╟' + self.padding * '─'
+            inter_cell = self.padding * fill_char
+            if self.column_borders:
+                inter_cell += junction_char
+            inter_cell += self.padding * fill_char
 
-        inter_cell = self.padding * '─'
-        if self.column_borders:
-            inter_cell += '┼'
-        inter_cell += self.padding * '─'
-        inter_cell = inter_cell
+            post_line = self.padding * fill_char + right_char
 
-        post_line = self.padding * '─' + '╢'
+            return self.generate_row(
+                self.empty_data,
+                is_header=False,
+                fill_char=self.apply_border_color(fill_char),
+                pre_line=self.apply_border_color(pre_line),
+                inter_cell=self.apply_border_color(inter_cell),
+                post_line=self.apply_border_color(post_line),
+            )
 
-        return self.generate_row(
-            self.empty_data,
-            is_header=False,
-            fill_char=self.apply_border_color(fill_char),
-            pre_line=self.apply_border_color(pre_line),
-            inter_cell=self.apply_border_color(inter_cell),
-            post_line=self.apply_border_color(post_line),
+        key = (
+            'border',
+            fill_char,
+            left_char,
+            junction_char,
+            right_char,
+            self.padding,
+            self.column_borders,
+            self.border_fg,
+            self.border_bg,
+            tuple(col.width for col in self.cols),
         )
+        return self._get_cached_row(key, generate)
 
-    def generate_table_bottom_border(self) -> str:
-        """Generate a border which appears at the bottom of the table"""
-        fill_char = '═'
-
-        pre_line = '╚' + self.padding * '═'
+    def _get_row_parts(self, apply_bg: Callable[[Any], str]) -> Tuple[str, str, str, str]:
+        """
+        Build the fill_char, pre_line, inter_cell, and post_line arguments to generate_row() for a header or data row.
+        These are cached for each background style since they don't depend on the row's data.
 
-        inter_cell = self.padding * '═'
-        if self.column_borders:
-            inter_cell += '╧'
-        inter_cell += self.padding * '═'
+        :param apply_bg: function which applies the background color of the row
+        :return: Tuple(fill_char, pre_line, inter_cell, post_line)
+        """
+        fill_char = apply_bg(SPACE)
 
-        post_line = self.padding * '═' + '╝'
+        def generate() -> Tuple[str, str, str, str]:
+            pre_line = self.apply_border_color('║') + apply_bg(self.padding * SPACE)
 
-        return self.generate_row(
-            self.empty_data,
-            is_header=False,
-            fill_char=self.apply_border_color(fill_char),
-            pre_line=self.apply_border_color(pre_line),
-            inter_cell=self.apply_border_color(inter_cell),
-            post_line=self.apply_border_color(post_line),
-        )
+            inter_cell = apply_bg(self.padding * SPACE)
+            if self.column_borders:
+                inter_cell += self.apply_border_color('│')
+            inter_cell += apply_bg(self.padding * SPACE)
 
-    def generate_header(self) -> str:
-        """Generate table header"""
-        fill_char = self.apply_header_bg(SPACE)
+            post_line = apply_bg(self.padding * SPACE) + self.apply_border_color('║')
 
-        pre_line = self.apply_border_color('║') + self.apply_header_bg(self.padding * SPACE)
+            return fill_char, pre_line, inter_cell, post_line
 
-        inter_cell = self.apply_header_bg(self.padding * SPACE)
-        if self.column_borders:
-            inter_cell += self.apply_border_color('│')
-        inter_cell += self.apply_header_bg(self.padding * SPACE)
+        key = ('row_parts', fill_char, self.padding, self.column_borders, self.border_fg, self.border_bg)
+        return self._get_cached_row(key, generate)
 
-        post_line = self.apply_header_bg(self.padding * SPACE) + self.apply_border_color('║')
+    def generate_header(self) -> str:
+        """Generate table header"""
+        fill_char, pre_line, inter_cell, post_line = self._get_row_parts(self.apply_header_bg)
 
         # Apply background color to header text in Columns which allow it
         to_display: List[Any] = []
@@ -980,16 +1152,7 @@ class BorderedTable(TableCreator):
         if len(row_data) != len(self.cols):
             raise ValueError("Length of row_data must match length of cols")
 
-        fill_char = self.apply_data_bg(SPACE)
-
-        pre_line = self.apply_border_color('║') + self.apply_data_bg(self.padding * SPACE)
-
-        inter_cell = self.apply_data_bg(self.padding * SPACE)
-        if self.column_borders:
-            inter_cell += self.apply_border_color('│')
-        inter_cell += self.apply_data_bg(self.padding * SPACE)
-
-        post_line = self.apply_data_bg(self.padding * SPACE) + self.apply_border_color('║')
+        fill_char, pre_line, inter_cell, post_line = self._get_row_parts(self.apply_data_bg)
 
         # Apply background color to data text in Columns which allow it
         to_display: List[Any] = []
@@ -1011,29 +1174,34 @@ class BorderedTable(TableCreator):
                            each column in the row.
         :param include_header: If True, then a header will be included at top of table. (Defaults to True)
         """
-        table_buf = io.StringIO()
+        return '\n'.join(self.iter_table(table_data, include_header=include_header))
+
+    def iter_table(self, table_data: Iterable[Sequence[Any]], *, include_header: bool = True) -> Iterator[str]:
+        """
+        Generate a table one row at a time. Rows are produced as table_data is consumed, so table_data can be
+        any iterable, including a generator which is too large to hold in memory.
+
+        Joining the results with newlines produces the same text as generate_table().
 
+        :param table_data: Data with an entry for each data row of the table. Each entry should have data for
+                           each column in the row.
+        :param include_header: If True, then a header will be included at top of table. (Defaults to True)
+        :return: iterator of the header, rows, and borders of the table. These strings do not end in a newline.
+        """
         if include_header:
-            header = self.generate_header()
-            table_buf.write(header)
+            yield self.generate_header()
         else:
-            top_border = self.generate_table_top_border()
-            table_buf.write(top_border)
+            yield self.generate_table_top_border()
 
-        table_buf.write('\n')
+        row_bottom_border = self.generate_row_bottom_border()
 
         for index, row_data in enumerate(table_data):
             if index > 0:
-                row_bottom_border = self.generate_row_bottom_border()
-                table_buf.write(row_bottom_border)
-                table_buf.write('\n')
+                yield row_bottom_border
 
-            row = self.generate_data_row(row_data)
-            table_buf.write(row)
-            table_buf.write('\n')
+            yield self.generate_data_row(row_data)
 
-        table_buf.write(self.generate_table_bottom_border())
-        return table_buf.getvalue()
+        yield self.generate_table_bottom_border()
 
 
 class AlternatingTable(BorderedTable):
@@ -1116,29 +1284,24 @@ class AlternatingTable(BorderedTable):
         self.row_num += 1
         return row
 
-    def generate_table(self, table_data: Sequence[Sequence[Any]], *, include_header: bool = True) -> str:
+    def iter_table(self, table_data: Iterable[Sequence[Any]], *, include_header: bool = True) -> Iterator[str]:
         """
-        Generate a table from a data set
+        Generate a table one row at a time. Rows are produced as table_data is consumed, so table_data can be
+        any iterable, including a generator which is too large to hold in memory.
+
+        Joining the results with newlines produces the same text as generate_table().
 
         :param table_data: Data with an entry for each data row of the table. Each entry should have data for
                            each column in the row.
         :param include_header: If True, then a header will be included at top of table. (Defaults to True)
+        :return: iterator of the header, rows, and borders of the table. These strings do not end in a newline.
         """
-        table_buf = io.StringIO()
-
         if include_header:
-            header = self.generate_header()
-            table_buf.write(header)
+            yield self.generate_header()
         else:
-            top_border = self.generate_table_top_border()
-            table_buf.write(top_border)
-
-        table_buf.write('\n')
+            yield self.generate_table_top_border()
 
         for row_data in table_data:
-            row = self.generate_data_row(row_data)
-            table_buf.write(row)
-            table_buf.write('\n')
+            yield self.generate_data_row(row_data)
 
-        table_buf.write(self.generate_table_bottom_border())
-        return table_buf.getvalue()
+        yield self.generate_table_bottom_border()
@@ -11,11 +11,18 @@ class is used in cmd2.py::run_transcript_tests()
 """
 import re
 import unittest
+from collections import (
+    OrderedDict,
+)
 from typing import (
     TYPE_CHECKING,
-    Iterator,
+    Any,
+    Callable,
+    Dict,
     List,
+    NamedTuple,
     Optional,
+    Pattern,
     TextIO,
     Tuple,
     cast,
@@ -27,11 +34,52 @@ from . import (
 )
 
 if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import (
+        Future,
+    )
+
     from cmd2 import (
         Cmd,
     )
 
 
+class _TranscriptStep(NamedTuple):
+    """A command in a compiled transcript and the output expected from it"""
+
+    command: str
+
+    # If set, then the transcript ended in the middle of this command
+    broken_msg: str
+
+    # Where the transcript continues after the command. The expected output which follows is found
+    # using the prompt set after the command runs, so it's compiled again from here if the prompt changes.
+    resume_index: int
+    resume_line: str
+    resume_line_num: int
+
+    # Line number shown in failure messages
+    line_num: int
+
+    # False if the next line after the command is a prompt
+    expects_output: bool
+
+    # Regular expression made from the expected output, which is shown in failure messages
+    expected: str
+
+    # The expected output if it has no slashes and the default transform is used. It is compared
+    # without the regular expression.
+    literal: Optional[str]
+    pattern: Optional[Pattern[str]]
+
+    # True if the transcript ended while reading the expected output
+    finished: bool
+
+
+# Compiled transcripts keyed on the transcript's hash, the prompts, and where compiling started
+_compiled_transcripts: 'OrderedDict[Tuple[Any, ...], List[_TranscriptStep]]' = OrderedDict()
+_compiled_transcripts_max = 512
+
+
 class Cmd2TestCase(unittest.TestCase):
     """A unittest class used for transcript testing.
 
@@ -60,80 +108,208 @@ class Cmd2TestCase(unittest.TestCase):
     def runTest(self) -> None:  # was testall
         if self.cmdapp:
             its = sorted(self.transcripts.items())
-            for (fname, transcript) in its:
-                self._test_transcript(fname, transcript)
+            for (fname, (lines, digest)) in its:
+                self._test_transcript(fname, lines, digest)
 
     def _fetchTranscripts(self) -> None:
-        self.transcripts = {}
+        import hashlib
+
+        self.transcripts: Dict[str, Tuple[List[str], str]] = {}
         testfiles = cast(List[str], getattr(self.cmdapp, 'testfiles', []))
         for fname in testfiles:
-            tfile = open(fname)
-            self.transcripts[fname] = iter(tfile.readlines())
-            tfile.close()
+            with open(fname) as tfile:
+                lines = tfile.readlines()
+            digest = hashlib.sha256(''.join(lines).encode('utf-8', errors='surrogatepass')).hexdigest()
+            self.transcripts[fname] = (lines, digest)
 
-    def _test_transcript(self, fname: str, transcript: Iterator[str]) -> None:
-        if self.cmdapp is None:
-            return
+    def _get_steps(
+        self,
+        lines: List[str],
+        digest: str,
+        start_index: int,
+        start_line: str,
+        start_line_num: int,
+        command: Optional[str] = None,
+    ) -> List[_TranscriptStep]:
+        """Return the compiled steps of a transcript, compiling them if they aren't cached"""
+        # Steps depend on how expected output is transformed, so they're only shared when it isn't overridden
+        if type(self)._transform_transcript_expected is not Cmd2TestCase._transform_transcript_expected:
+            return self._compile_transcript(lines, start_index, start_line, start_line_num, command)
+
+        cmdapp = cast('Cmd', self.cmdapp)
+        key = (
+            digest,
+            cmdapp.visible_prompt,
+            cmdapp.continuation_prompt,
+            start_index,
+            start_line,
+            start_line_num,
+            command,
+        )
+        try:
+            steps = _compiled_transcripts[key]
+        except KeyError:
+            steps = self._compile_transcript(lines, start_index, start_line, start_line_num, command)
+            _compiled_transcripts[key] = steps
+            if len(_compiled_transcripts) > _compiled_transcripts_max:
+                _compiled_transcripts.popitem(last=False)
+        else:
+            _compiled_transcripts.move_to_end(key)
+        return steps
+
+    def _compile_transcript(
+        self,
+        lines: List[str],
+        start_index: int,
+        start_line: str,
+        start_line_num: int,
+        command: Optional[str] = None,
+    ) -> List[_TranscriptStep]:
+        """
+        Split a transcript into its commands and their expected output using the app's current prompts
+
+        :param lines: lines of the transcript
+        :param start_index: index of the next line to read
+        :param start_line: the current line
+        :param start_line_num: line number of the current line
+        :param command: if set, then compiling starts after this command was read from the transcript
+        :return: the steps of the transcript
+        """
+        visible_prompt = cast('Cmd', self.cmdapp).visible_prompt
+        continuation_prompt = cast('Cmd', self.cmdapp).continuation_prompt
 
-        line_num = 0
+        transform_overridden = type(self)._transform_transcript_expected is not Cmd2TestCase._transform_transcript_expected
+
+        steps: List[_TranscriptStep] = []
+        next_index = start_index
+        line = start_line
+        line_num = start_line_num
         finished = False
-        line = ansi.strip_style(next(transcript))
-        line_num += 1
         while not finished:
-            # Scroll forward to where actual commands begin
-            while not line.startswith(self.cmdapp.visible_prompt):
-                try:
-                    line = ansi.strip_style(next(transcript))
-                except StopIteration:
-                    finished = True
-                    break
-                line_num += 1
-            command_parts = [line[len(self.cmdapp.visible_prompt) :]]
-            try:
-                line = next(transcript)
-            except StopIteration:
-                line = ''
-            line_num += 1
-            # Read the entirety of a multi-line command
-            while line.startswith(self.cmdapp.continuation_prompt):
-                command_parts.append(line[len(self.cmdapp.continuation_prompt) :])
-                try:
-                    line = next(transcript)
-                except StopIteration as exc:
-                    msg = f'Transcript broke off while reading command beginning at line {line_num} with\n{command_parts[0]}'
-                    raise StopIteration(msg) from exc
+            broken_msg = ''
+            if command is None:
+                # Scroll forward to where actual commands begin
+                while not line.startswith(visible_prompt):
+                    if next_index >= len(lines):
+                        finished = True
+                        break
+                    line = ansi.strip_style(lines[next_index])
+                    next_index += 1
+                    line_num += 1
+                command_parts = [line[len(visible_prompt) :]]
+                if next_index < len(lines):
+                    line = lines[next_index]
+                    next_index += 1
+                else:
+                    line = ''
                 line_num += 1
-            command = ''.join(command_parts)
+
+                # Read the entirety of a multi-line command
+                while line.startswith(continuation_prompt):
+                    command_parts.append(line[len(continuation_prompt) :])
+                    if next_index >= len(lines):
+                        broken_msg = (
+                            f'Transcript broke off while reading command beginning at line {line_num} with\n'
+                            f'{command_parts[0]}'
+                        )
+                        finished = True
+                        break
+                    line = lines[next_index]
+                    next_index += 1
+                    line_num += 1
+                command = ''.join(command_parts)
+
+            resume_state = (next_index, line, line_num)
+
+            # Read the expected result from transcript
+            expected_parts = []
+            expects_output = not broken_msg and not ansi.strip_style(line).startswith(visible_prompt)
+            if expects_output:
+                while not ansi.strip_style(line).startswith(visible_prompt):
+                    expected_parts.append(line)
+                    if next_index >= len(lines):
+                        finished = True
+                        break
+                    line = lines[next_index]
+                    next_index += 1
+                    line_num += 1
+
+            # transform the expected text into a valid regular expression
+            expected_text = ''.join(expected_parts)
+            expected = self._transform_transcript_expected(expected_text)
+
+            # Without slashes, the default transform only matches the literal text
+            literal = expected_text if '/' not in expected_text and not transform_overridden else None
+            pattern = re.compile(expected, re.MULTILINE | re.DOTALL) if literal is None else None
+
+            steps.append(
+                _TranscriptStep(
+                    command,
+                    broken_msg,
+                    *resume_state,
+                    line_num=line_num,
+                    expects_output=expects_output,
+                    expected=expected,
+                    literal=literal,
+                    pattern=pattern,
+                    finished=finished,
+                )
+            )
+            command = None
+        return steps
+
+    def _test_transcript(self, fname: str, lines: List[str], digest: str) -> None:
+        if self.cmdapp is None:
+            return
+
+        if not lines:
+            raise StopIteration
+
+        steps = self._get_steps(lines, digest, 1, ansi.strip_style(lines[0]), 1)
+        prompts = (self.cmdapp.visible_prompt, self.cmdapp.continuation_prompt)
+        step_index = 0
+        while step_index < len(steps):
+            step = steps[step_index]
+            step_index += 1
+
+            if step.broken_msg:
+                raise StopIteration(step.broken_msg)
+
             # Send the command into the application and capture the resulting output
-            stop = self.cmdapp.onecmd_plus_hooks(command)
+            stop = self.cmdapp.onecmd_plus_hooks(step.command)
             result = self.cmdapp.stdout.read()
+
+            # The prompt marks where the expected output ends, so compile the rest of the transcript if it changed
+            if prompts != (self.cmdapp.visible_prompt, self.cmdapp.continuation_prompt):
+                prompts = (self.cmdapp.visible_prompt, self.cmdapp.continuation_prompt)
+                steps = self._get_steps(lines, digest, step.resume_index, step.resume_line, step.resume_line_num, step.command)
+                step = steps[0]
+                step_index = 1
+
             stop_msg = 'Command indicated application should quit, but more commands in transcript'
-            # Read the expected result from transcript
-            if ansi.strip_style(line).startswith(self.cmdapp.visible_prompt):
-                message = f'\nFile {fname}, line {line_num}\nCommand was:\n{command}\nExpected: (nothing)\nGot:\n{result}\n'
+            if not step.expects_output:
+                message = (
+                    f'\nFile {fname}, line {step.line_num}\nCommand was:\n{step.command}\n'
+                    f'Expected: (nothing)\nGot:\n{result}\n'
+                )
                 self.assertTrue(not (result.strip()), message)
                 # If the command signaled the application to quit there should be no more commands
                 self.assertFalse(stop, stop_msg)
                 continue
-            expected_parts = []
-            while not ansi.strip_style(line).startswith(self.cmdapp.visible_prompt):
-                expected_parts.append(line)
-                try:
-                    line = next(transcript)
-                except StopIteration:
-                    finished = True
-                    break
-                line_num += 1
 
             if stop:
                 # This should only be hit if the command that set stop to True had output text
-                self.assertTrue(finished, stop_msg)
+                self.assertTrue(step.finished, stop_msg)
 
-            # transform the expected text into a valid regular expression
-            expected = ''.join(expected_parts)
-            expected = self._transform_transcript_expected(expected)
-            message = f'\nFile {fname}, line {line_num}\nCommand was:\n{command}\nExpected:\n{expected}\nGot:\n{result}\n'
-            self.assertTrue(re.match(expected, result, re.MULTILINE | re.DOTALL), message)
+            if step.literal is not None:
+                matched = result.startswith(step.literal)
+            else:
+                matched = cast(Pattern[str], step.pattern).match(result) is not None
+            message = (
+                f'\nFile {fname}, line {step.line_num}\nCommand was:\n{step.command}\n'
+                f'Expected:\n{step.expected}\nGot:\n{result}\n'
+            )
+            self.assertTrue(matched, message)
 
     def _transform_transcript_expected(self, s: str) -> str:
         r"""Parse the string with slashed regexes into a valid regex.
@@ -228,3 +404,100 @@ class Cmd2TestCase(unittest.TestCase):
                     # slash is not escaped, this is what we are looking for
                     break
         return regex, pos, start
+
+
+class _TranscriptWorkerResult(unittest.TestResult):
+    """Records the results of a transcript run in a worker process in a form which can be sent back to the main process"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.failure_messages: List[str] = []
+        self.error_messages: List[str] = []
+
+    def addFailure(self, test: unittest.TestCase, err: Any) -> None:
+        super().addFailure(test, err)
+        # Only the assertion message is needed since it contains the transcript file and line number
+        self.failure_messages.append(str(err[1]))
+
+    def addError(self, test: unittest.TestCase, err: Any) -> None:
+        super().addError(test, err)
+        self.error_messages.append(self.errors[-1][1])
+
+
+def _run_transcript_in_worker(app_factory: Callable[[], 'Cmd'], transcript_file: str) -> Tuple[List[str], List[str]]:
+    """
+    Run a transcript file in a process pool worker
+
+    :param app_factory: creates the app which runs the transcript
+    :param transcript_file: path of the transcript file
+    :return: messages of the transcript's failures and errors
+    """
+    result = _TranscriptWorkerResult()
+    app = app_factory()
+
+    class WorkerTestCase(Cmd2TestCase):
+        cmdapp = app
+
+    setattr(app, 'testfiles', [transcript_file])
+
+    # noinspection PyProtectedMember
+    for func in app._preloop_hooks:
+        func()
+    app.preloop()
+
+    WorkerTestCase().run(result)
+
+    # noinspection PyProtectedMember
+    for func in app._postloop_hooks:
+        func()
+    app.postloop()
+
+    return result.failure_messages, result.error_messages
+
+
+class _PooledTranscriptTest(unittest.TestCase):
+    """Reports the results of a transcript which a process pool worker ran"""
+
+    def __init__(self, transcript_file: str, future: 'Future[Tuple[List[str], List[str]]]') -> None:
+        super().__init__()
+        self.transcript_file = transcript_file
+        self.future = future
+
+    def __str__(self) -> str:
+        return self.transcript_file
+
+    def runTest(self) -> None:
+        failure_messages, error_messages = self.future.result()
+        if error_messages:
+            raise RuntimeError('\n'.join(error_messages))
+        if failure_messages:
+            self.fail('\n'.join(failure_messages))
+
+
+def run_transcripts_in_pool(
+    app_factory: Callable[[], 'Cmd'],
+    transcript_files: List[str],
+    runner: unittest.TextTestRunner,
+    *,
+    max_workers: int,
+) -> unittest.TestResult:
+    """
+    Run transcript files in parallel. Each transcript is run by a new app in a process pool
+    worker and the results are reported by runner as one test per transcript.
+
+    :param app_factory: picklable callable, like a Cmd subclass, which creates the app that runs each transcript
+    :param transcript_files: paths of the transcript files
+    :param runner: reports the results
+    :param max_workers: maximum number of worker processes
+    :return: the results of the transcripts
+    """
+    from concurrent.futures import (
+        ProcessPoolExecutor,
+    )
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        suite = unittest.TestSuite(
+            _PooledTranscriptTest(fname, executor.submit(_run_transcript_in_worker, app_factory, fname))
+            for fname in transcript_files
+        )
+        return runner.run(suite)
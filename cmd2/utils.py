@@ -1,6 +1,7 @@
 # coding=utf-8
 """Shared utility functions"""
 import argparse
+import bisect
 import collections
 import functools
 import glob
@@ -8,22 +9,28 @@ import inspect
 import itertools
 import os
 import re
+import stat
 import subprocess
 import sys
 import threading
+import time
 import unicodedata
 from enum import (
     Enum,
 )
 from typing import (
+    IO,
     TYPE_CHECKING,
     Any,
     Callable,
+    Deque,
     Dict,
     Iterable,
     List,
     Optional,
+    Set,
     TextIO,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -41,6 +48,10 @@ from .argparse_custom import (
 if TYPE_CHECKING:  # pragma: no cover
     import cmd2  # noqa: F401
 
+    from . import (  # noqa: F401
+        ansi,
+    )
+
     PopenTextIO = subprocess.Popen[bytes]
 
 else:
@@ -418,9 +429,213 @@ def files_from_glob_patterns(patterns: List[str], access: int = os.F_OK) -> List
     return files
 
 
+class _PathExeIndex:
+    """
+    Index of the executables in a user's path used by get_exes_in_path(). The names of the executables in
+    each directory are cached until the directory's modification time changes. All of the names are kept
+    in a sorted list, which is rebuilt when the path or any of its directories change, so names starting
+    with a prefix can be found with a binary search.
+    """
+
+    def __init__(self) -> None:
+        # Maps each directory to its modification time when it was scanned and the names of its executables
+        self._dir_exes: Dict[str, Tuple[int, List[str]]] = {}
+
+        # The directories and modification times the sorted list was built from
+        self._index_key: Optional[List[Tuple[str, int]]] = None
+
+        # Sorted names used for searching, which are case-folded on Windows, and the names they represent
+        self._search_names: List[str] = []
+        self._names: List[str] = []
+
+    @staticmethod
+    def _search_name(name: str) -> str:
+        """Return the form of a name used for searching. This matches how glob compares file names."""
+        return os.path.normcase(name)
+
+    @staticmethod
+    def _scan_dir(path: str) -> List[str]:
+        """Return the names of the executable files in a directory"""
+        exes = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file() and os.access(entry.path, os.X_OK):
+                            exes.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return exes
+
+    def search(self, starts_with: str) -> List[str]:
+        """
+        Returns names of executables in a user's path
+
+        :param starts_with: what the exes should start with
+        :return: a sorted list of matching exe names
+        """
+        # Get every directory in the PATH environment variable and its modification time. Ignore symbolic links.
+        index_key: List[Tuple[str, int]] = []
+        env_path = os.getenv('PATH')
+        if env_path is not None:
+            for path in env_path.split(os.path.pathsep):
+                path = os.path.abspath(path)
+                try:
+                    path_stat = os.lstat(path)
+                except OSError:
+                    continue
+                if not stat.S_ISLNK(path_stat.st_mode):
+                    index_key.append((path, path_stat.st_mtime_ns))
+
+        if index_key != self._index_key:
+            self._rebuild(index_key)
+
+        # Hidden files only match if they are being searched for
+        search_prefix = self._search_name(starts_with)
+        include_hidden = starts_with.startswith('.')
+
+        matches = []
+        index = bisect.bisect_left(self._search_names, search_prefix)
+        while index < len(self._search_names) and self._search_names[index].startswith(search_prefix):
+            name = self._names[index]
+            if include_hidden or not name.startswith('.'):
+                matches.append(name)
+            index += 1
+        return matches
+
+    def _rebuild(self, index_key: List[Tuple[str, int]]) -> None:
+        """
+        Rebuild the sorted list of names
+
+        :param index_key: the directories in the path and their modification times
+        """
+        dir_exes: Dict[str, Tuple[int, List[str]]] = {}
+        names_by_search_name: Dict[str, str] = {}
+
+        for path, mtime in index_key:
+            cached = self._dir_exes.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, self._scan_dir(path))
+            dir_exes[path] = cached
+
+            # Keep the first name when the same executable is in more than one directory
+            for name in cached[1]:
+                names_by_search_name.setdefault(self._search_name(name), name)
+
+        # Directories which are no longer in the path are discarded
+        self._dir_exes = dir_exes
+        self._index_key = index_key
+        self._search_names = sorted(names_by_search_name)
+        self._names = [names_by_search_name[search_name] for search_name in self._search_names]
+
+
+_path_exe_index = _PathExeIndex()
+
+
+class _PathCompletionCache:
+    """
+    Caches used by Cmd.path_complete(). Directory listings are kept until a directory's modification time
+    changes. The users who have home directories are kept for a short time.
+    """
+
+    # Maximum number of directory listings which are kept
+    max_listings = 16
+
+    # Listings of directories modified this many nanoseconds before they were read aren't kept. Some file systems
+    # only store modification times to the second, so another change in that time wouldn't update it.
+    racy_window_ns = 2_000_000_000
+
+    # Number of seconds the list of users is kept
+    users_ttl = 60.0
+
+    def __init__(self) -> None:
+        # Maps each directory to its modification time and the names of its entries and whether they are directories
+        self._listings: 'collections.OrderedDict[str, Tuple[int, List[Tuple[str, bool]]]]' = collections.OrderedDict()
+
+        # Time the list of users was read and the names of the users whose home directories exist
+        self._users: Optional[Tuple[float, List[str]]] = None
+
+    def list_dir(self, path: str) -> List[Tuple[str, bool]]:
+        """
+        Get the entries of a directory
+
+        :param path: the directory being listed
+        :return: the name of each entry and whether it is a directory. This is empty if the directory can't be read.
+        """
+        path = os.path.abspath(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return []
+
+        cached = self._listings.get(path)
+        if cached is not None and cached[0] == mtime:
+            self._listings.move_to_end(path)
+            return cached[1]
+
+        read_time = int(time.time() * 1_000_000_000)
+        entries = []
+        try:
+            with os.scandir(path) as dir_entries:
+                for entry in dir_entries:
+                    # The entry's type is usually known without another system call
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    entries.append((entry.name, is_dir))
+        except OSError:
+            return []
+
+        if read_time - mtime > self.racy_window_ns:
+            self._listings[path] = (mtime, entries)
+            self._listings.move_to_end(path)
+            while len(self._listings) > self.max_listings:
+                self._listings.popitem(last=False)
+        return entries
+
+    def match(self, search_str: str) -> Tuple[List[str], Set[str]]:
+        """
+        Find the paths which complete a search string. Like glob, hidden files are only matched if they are being
+        searched for.
+
+        :param search_str: directory and beginning of the name being completed
+        :return: the matching paths and the subset of them which are directories
+        """
+        search_dir, search_prefix = os.path.split(search_str)
+        search_prefix = os.path.normcase(search_prefix)
+        include_hidden = search_prefix.startswith('.')
+
+        matches = []
+        dir_matches = set()
+        for name, is_dir in self.list_dir(search_dir or os.curdir):
+            if os.path.normcase(name).startswith(search_prefix) and (include_hidden or not name.startswith('.')):
+                cur_match = os.path.join(search_dir, name)
+                matches.append(cur_match)
+                if is_dir:
+                    dir_matches.add(cur_match)
+        return matches, dir_matches
+
+    def users(self) -> List[str]:
+        """Get the names of the users in the password database whose home directories exist"""
+        if self._users is None or time.monotonic() - self._users[0] >= self.users_ttl:
+            import pwd
+
+            users = [cur_pw.pw_name for cur_pw in pwd.getpwall() if os.path.isdir(cur_pw.pw_dir)]
+            self._users = (time.monotonic(), users)
+        return self._users[1]
+
+
+_path_completion_cache = _PathCompletionCache()
+
+
 def get_exes_in_path(starts_with: str) -> List[str]:
     """Returns names of executables in a user's path
 
+    The executables are cached until the path or one of its directories changes.
+
     :param starts_with: what the exes should start with. leave blank for all exes in path.
     :return: a list of matching exe names
     """
@@ -430,25 +645,164 @@ def get_exes_in_path(starts_with: str) -> List[str]:
         if wildcard in starts_with:
             return []
 
-    # Get a list of every directory in the PATH environment variable and ignore symbolic links
-    env_path = os.getenv('PATH')
-    if env_path is None:
-        paths = []
-    else:
-        paths = [p for p in env_path.split(os.path.pathsep) if not os.path.islink(p)]
+    return _path_exe_index.search(starts_with)
+
 
-    # Use a set to store exe names since there can be duplicates
-    exes_set = set()
+class _ChunkedBytes:
+    """
+    Stores the bytes written to a StdSim. Data is kept in a list of chunks, so writing doesn't copy what was
+    already written and a partial read doesn't copy what remains. Optionally only the most recent bytes are
+    kept, or older bytes are moved to a temporary file.
+    """
+
+    # Small writes are combined in a bytearray until it reaches this size and becomes a chunk
+    tail_size = 65536
+
+    def __init__(self, *, max_retained: Optional[int] = None, spill_size: Optional[int] = None) -> None:
+        """
+        Initializer
+
+        :param max_retained: if set, then only this many of the most recently written bytes are kept
+        :param spill_size: if set, then once more than this many bytes are in memory, they are moved to a temporary file
+        :raises: ValueError if both max_retained and spill_size are set or either is invalid
+        """
+        if max_retained is not None and spill_size is not None:
+            raise ValueError("max_retained and spill_size cannot both be set")
+        if max_retained is not None and max_retained < 0:
+            raise ValueError("max_retained cannot be less than 0")
+        if spill_size is not None and spill_size < 1:
+            raise ValueError("spill_size must be greater than 0")
+
+        self.max_retained = max_retained
+        self.spill_size = spill_size
+
+        # Chunks which have been filled. The first one may be a memoryview of a partially read chunk.
+        self._chunks: Deque[Union[bytes, memoryview]] = collections.deque()
+
+        # Chunk being filled by small writes
+        self._tail = bytearray()
+
+        # Number of bytes in _chunks and _tail
+        self._mem_size = 0
+
+        # Holds older bytes in spill mode. It contains unread data between _file_pos and _file_size.
+        self._file: Optional[IO[bytes]] = None
+        self._file_pos = 0
+        self._file_size = 0
+
+    def __len__(self) -> int:
+        return self._mem_size + self._file_size - self._file_pos
+
+    def append(self, data: bytes) -> None:
+        """Add bytes to the end"""
+        if len(data) >= self.tail_size:
+            self._seal_tail()
+            self._chunks.append(bytes(data))
+        else:
+            self._tail += data
+            if len(self._tail) >= self.tail_size:
+                self._seal_tail()
+        self._mem_size += len(data)
+
+        if self.max_retained is not None and self._mem_size > self.max_retained:
+            self._take(self._mem_size - self.max_retained, keep=False)
+        elif self.spill_size is not None and self._mem_size > self.spill_size:
+            self._spill()
+
+    def _seal_tail(self) -> None:
+        """Turn the bytes written to the tail into a chunk"""
+        if self._tail:
+            self._chunks.append(bytes(self._tail))
+            self._tail.clear()
+
+    def _spill(self) -> None:
+        """Move the bytes in memory to the end of the temporary file"""
+        if self._file is None:
+            import tempfile
+
+            self._file = tempfile.TemporaryFile()
+
+        self._seal_tail()
+        self._file.seek(self._file_size)
+        while self._chunks:
+            self._file_size += self._file.write(self._chunks.popleft())
+        self._mem_size = 0
+
+    def _take(self, size: int, *, keep: bool) -> bytes:
+        """
+        Remove bytes from the start
+
+        :param size: number of bytes to remove
+        :param keep: if False, then the bytes are discarded and an empty bytes object is returned
+        :return: the bytes removed
+        """
+        parts: List[Union[bytes, memoryview]] = []
+
+        if self._file is not None and self._file_pos < self._file_size:
+            from_file = min(size, self._file_size - self._file_pos)
+            if keep:
+                self._file.seek(self._file_pos)
+                parts.append(self._file.read(from_file))
+            self._file_pos += from_file
+            size -= from_file
+
+            # Reuse the file once it has been read
+            if self._file_pos == self._file_size:
+                self._file.truncate(0)
+                self._file_pos = self._file_size = 0
+
+        if size > 0 and not self._chunks:
+            self._seal_tail()
+
+        while size > 0 and self._chunks:
+            chunk = self._chunks[0]
+            if len(chunk) <= size:
+                self._chunks.popleft()
+            else:
+                # Keep the rest of the chunk without copying it, unless it's small enough that holding on
+                # to the whole chunk would waste more memory than the copy costs
+                rest = memoryview(chunk)[size:]
+                self._chunks[0] = bytes(rest) if 2 * len(rest) < len(cast(bytes, rest.obj)) else rest
+                chunk = memoryview(chunk)[:size]
+            if keep:
+                parts.append(chunk)
+            size -= len(chunk)
+            self._mem_size -= len(chunk)
+
+            if not self._chunks:
+                self._seal_tail()
+
+        return b''.join(parts)
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Remove and return bytes from the start
 
-    # Find every executable file in the user's path that matches the pattern
-    for path in paths:
-        full_path = os.path.join(path, starts_with)
-        matches = files_from_glob_pattern(full_path + '*', access=os.X_OK)
+        :param size: number of bytes to read. If negative, then everything is read.
+        """
+        if size < 0:
+            size = len(self)
+        return self._take(size, keep=True)
 
-        for match in matches:
-            exes_set.add(os.path.basename(match))
+    def getbytes(self) -> bytes:
+        """Return all of the bytes without removing them"""
+        parts: List[Union[bytes, bytearray, memoryview]] = []
+        if self._file is not None and self._file_pos < self._file_size:
+            self._file.seek(self._file_pos)
+            parts.append(self._file.read(self._file_size - self._file_pos))
+        parts.extend(self._chunks)
+        parts.append(self._tail)
+        return b''.join(parts)
 
-    return list(exes_set)
+    def clear(self) -> None:
+        """Remove all of the bytes"""
+        self._chunks.clear()
+        self._tail.clear()
+        self._mem_size = 0
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._file_pos = self._file_size = 0
 
 
 class StdSim:
@@ -464,6 +818,8 @@ class StdSim:
         echo: bool = False,
         encoding: str = 'utf-8',
         errors: str = 'replace',
+        max_retained: Optional[int] = None,
+        spill_size: Optional[int] = None,
     ) -> None:
         """
         StdSim Initializer
@@ -472,12 +828,18 @@ class StdSim:
         :param echo: if True, then all input will be echoed to inner_stream
         :param encoding: codec for encoding/decoding strings (defaults to utf-8)
         :param errors: how to handle encoding/decoding errors (defaults to replace)
+        :param max_retained: if set, then only this many of the most recently written bytes are stored.
+                             Older bytes are discarded. (defaults to None)
+        :param spill_size: if set, then once more than this many bytes are stored in memory, they are moved
+                           to a temporary file. Can't be used with max_retained. (defaults to None)
+        :raises: ValueError if both max_retained and spill_size are set or either is invalid
         """
         self.inner_stream = inner_stream
         self.echo = echo
         self.encoding = encoding
         self.errors = errors
         self.pause_storage = False
+        self._contents = _ChunkedBytes(max_retained=max_retained, spill_size=spill_size)
         self.buffer = ByteBuf(self)
 
     def write(self, s: str) -> None:
@@ -490,17 +852,17 @@ class StdSim:
             raise TypeError(f'write() argument must be str, not {type(s)}')
 
         if not self.pause_storage:
-            self.buffer.byte_buf += s.encode(encoding=self.encoding, errors=self.errors)
+            self._contents.append(s.encode(encoding=self.encoding, errors=self.errors))
         if self.echo:
             self.inner_stream.write(s)
 
     def getvalue(self) -> str:
         """Get the internal contents as a str"""
-        return self.buffer.byte_buf.decode(encoding=self.encoding, errors=self.errors)
+        return self.getbytes().decode(encoding=self.encoding, errors=self.errors)
 
     def getbytes(self) -> bytes:
         """Get the internal contents as bytes"""
-        return bytes(self.buffer.byte_buf)
+        return self._contents.getbytes()
 
     def read(self, size: Optional[int] = -1) -> str:
         """
@@ -508,24 +870,17 @@ class StdSim:
 
         :param size: Number of bytes to read from the stream
         """
-        if size is None or size == -1:
-            result = self.getvalue()
-            self.clear()
-        else:
-            result = self.buffer.byte_buf[:size].decode(encoding=self.encoding, errors=self.errors)
-            self.buffer.byte_buf = self.buffer.byte_buf[size:]
-
-        return result
+        if size is None:
+            size = -1
+        return self._contents.read(size).decode(encoding=self.encoding, errors=self.errors)
 
     def readbytes(self) -> bytes:
         """Read from the internal contents as bytes and then clear them out"""
-        result = self.getbytes()
-        self.clear()
-        return result
+        return self._contents.read()
 
     def clear(self) -> None:
         """Clear the internal contents"""
-        self.buffer.byte_buf.clear()
+        self._contents.clear()
 
     def isatty(self) -> bool:
         """StdSim only considered an interactive stream if `echo` is True and `inner_stream` is a tty."""
@@ -561,15 +916,34 @@ class ByteBuf:
     NEWLINES = [b'\n', b'\r']
 
     def __init__(self, std_sim_instance: StdSim) -> None:
-        self.byte_buf = bytearray()
         self.std_sim_instance = std_sim_instance
 
+    @property
+    def byte_buf(self) -> bytes:
+        """
+        The bytes stored by the StdSim. Use StdSim.getbytes() instead.
+
+        This is a read-only snapshot, so it can't be changed in place. Assign to this property to replace
+        the stored bytes.
+        """
+        # noinspection PyProtectedMember
+        return self.std_sim_instance._contents.getbytes()
+
+    @byte_buf.setter
+    def byte_buf(self, value: bytes) -> None:
+        """Replace the bytes stored by the StdSim"""
+        # noinspection PyProtectedMember
+        contents = self.std_sim_instance._contents
+        contents.clear()
+        contents.append(bytes(value))
+
     def write(self, b: bytes) -> None:
         """Add bytes to internal bytes buffer and if echo is True, echo contents to inner stream."""
         if not isinstance(b, bytes):
             raise TypeError(f'a bytes-like object is required, not {type(b)}')
         if not self.std_sim_instance.pause_storage:
-            self.byte_buf += b
+            # noinspection PyProtectedMember
+            self.std_sim_instance._contents.append(b)
         if self.std_sim_instance.echo:
             self.std_sim_instance.inner_stream.buffer.write(b)
 
@@ -586,28 +960,68 @@ class ProcReader:
     """
     Used to capture stdout and stderr from a Popen process if any of those were set to subprocess.PIPE.
     If neither are pipes, then the process will run normally and no output will be captured.
+
+    The pipes are read with blocking reads, so no CPU time is spent waiting on the process. On POSIX
+    systems, a single thread multiplexes both pipes. On Windows, where pipes can't be used with
+    selectors, each pipe has its own thread.
     """
 
-    def __init__(self, proc: PopenTextIO, stdout: Union[StdSim, TextIO], stderr: Union[StdSim, TextIO]) -> None:
+    # Default maximum number of bytes to read from a pipe at one time
+    DEFAULT_CHUNK_SIZE = 65536
+
+    def __init__(
+        self,
+        proc: PopenTextIO,
+        stdout: Union[StdSim, TextIO],
+        stderr: Union[StdSim, TextIO],
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
         """
         ProcReader initializer
         :param proc: the Popen process being read from
         :param stdout: the stream to write captured stdout
         :param stderr: the stream to write captured stderr
+        :param chunk_size: maximum number of bytes to read from a pipe at one time
+        :raises: ValueError if chunk_size is less than 1
         """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be greater than 0")
+
         self._proc = proc
         self._stdout = stdout
         self._stderr = stderr
+        self._chunk_size = chunk_size
 
-        self._out_thread = threading.Thread(name='out_thread', target=self._reader_thread_func, kwargs={'read_stdout': True})
+        # File descriptors of the pipes to read from and the streams their output is written to
+        streams: List[Tuple[int, Union[StdSim, TextIO]]] = []
+        for read_stream, write_stream in ((self._proc.stdout, self._stdout), (self._proc.stderr, self._stderr)):
+            if read_stream is not None:
+                fd = read_stream.fileno()
 
-        self._err_thread = threading.Thread(name='err_thread', target=self._reader_thread_func, kwargs={'read_stdout': False})
+                # Anything else can't be read here. If it has data, then wait() will collect it.
+                if isinstance(fd, int):
+                    streams.append((fd, write_stream))
 
-        # Start the reader threads for pipes only
-        if self._proc.stdout is not None:
-            self._out_thread.start()
-        if self._proc.stderr is not None:
-            self._err_thread.start()
+        self._reader_threads: List[threading.Thread] = []
+        if not streams:
+            pass
+        elif sys.platform.startswith('win'):
+            for fd, write_stream in streams:
+                self._reader_threads.append(
+                    threading.Thread(
+                        name='reader_thread',
+                        target=self._blocking_reader_thread_func,
+                        kwargs={'fd': fd, 'write_stream': write_stream},
+                    )
+                )
+        else:
+            self._reader_threads.append(
+                threading.Thread(name='reader_thread', target=self._selector_reader_thread_func, kwargs={'streams': streams})
+            )
+
+        for thread in self._reader_threads:
+            thread.start()
 
     def send_sigint(self) -> None:
         """Send a SIGINT to the process similar to if <Ctrl>+C were pressed"""
@@ -630,15 +1044,18 @@ class ProcReader:
         """Terminate the process"""
         self._proc.terminate()
 
+    def poll(self) -> Optional[int]:
+        """Check if the process has finished without waiting for it. Return its return code or None if it's running."""
+        return self._proc.poll()
+
     def wait(self) -> None:
         """Wait for the process to finish"""
-        if self._out_thread.is_alive():
-            self._out_thread.join()
-        if self._err_thread.is_alive():
-            self._err_thread.join()
+        # The reader threads run until the pipes are closed, which is normally when the process exits
+        for thread in self._reader_threads:
+            thread.join()
 
-        # Handle case where the process ended before the last read could be done.
-        # This will return None for the streams that weren't pipes.
+        # Close the pipes and set the return code. Since the readers bypass the buffers of the pipe
+        # file objects, this will only return data if the pipes were read by something else.
         out, err = self._proc.communicate()
 
         if out:
@@ -646,28 +1063,37 @@ class ProcReader:
         if err:
             self._write_bytes(self._stderr, err)
 
-    def _reader_thread_func(self, read_stdout: bool) -> None:
+    def _selector_reader_thread_func(self, streams: List[Tuple[int, Union[StdSim, TextIO]]]) -> None:
         """
-        Thread function that reads a stream from the process
-        :param read_stdout: if True, then this thread deals with stdout. Otherwise it deals with stderr.
+        Thread function that waits for output on all of the process's pipes and reads it as it arrives
+        :param streams: list of pipe file descriptors to read and the streams their output is written to
         """
-        if read_stdout:
-            read_stream = self._proc.stdout
-            write_stream = self._stdout
-        else:
-            read_stream = self._proc.stderr
-            write_stream = self._stderr
-
-        # The thread should have been started only if this stream was a pipe
-        assert read_stream is not None
-
-        # Run until process completes
-        while self._proc.poll() is None:
-            # noinspection PyUnresolvedReferences
-            available = read_stream.peek()  # type: ignore[attr-defined]
-            if available:
-                read_stream.read(len(available))
-                self._write_bytes(write_stream, available)
+        import selectors
+
+        with selectors.DefaultSelector() as selector:
+            for fd, write_stream in streams:
+                selector.register(fd, selectors.EVENT_READ, write_stream)
+
+            # Run until every pipe has reached EOF
+            while selector.get_map():
+                for key, _ in selector.select():
+                    data = os.read(key.fd, self._chunk_size)
+                    if data:
+                        self._write_bytes(key.data, data)
+                    else:
+                        selector.unregister(key.fd)
+
+    def _blocking_reader_thread_func(self, fd: int, write_stream: Union[StdSim, TextIO]) -> None:
+        """
+        Thread function that reads one of the process's pipes until it reaches EOF
+        :param fd: file descriptor of the pipe being read
+        :param write_stream: the stream its output is written to
+        """
+        while True:
+            data = os.read(fd, self._chunk_size)
+            if not data:
+                break
+            self._write_bytes(write_stream, data)
 
     @staticmethod
     def _write_bytes(stream: Union[StdSim, TextIO], to_write: bytes) -> None:
@@ -737,6 +1163,24 @@ class RedirectionSavedState:
         self.saved_redirecting = saved_redirecting
 
 
+class _StyleState:
+    """Keeps track of what text styles are enabled. Used by _remove_overridden_styles()."""
+
+    def __init__(self) -> None:
+        # Contains styles still in effect, keyed by their index in styles_to_parse
+        self.style_dict: Dict[int, str] = dict()
+
+        # Indexes into style_dict
+        self.reset_all: Optional[int] = None
+        self.fg: Optional[int] = None
+        self.bg: Optional[int] = None
+        self.intensity: Optional[int] = None
+        self.italic: Optional[int] = None
+        self.overline: Optional[int] = None
+        self.strikethrough: Optional[int] = None
+        self.underline: Optional[int] = None
+
+
 def _remove_overridden_styles(styles_to_parse: List[str]) -> List[str]:
     """
     Utility function for align_text() / truncate_line() which filters a style list down
@@ -753,31 +1197,14 @@ def _remove_overridden_styles(styles_to_parse: List[str]) -> List[str]:
         ansi,
     )
 
-    class StyleState:
-        """Keeps track of what text styles are enabled"""
-
-        def __init__(self) -> None:
-            # Contains styles still in effect, keyed by their index in styles_to_parse
-            self.style_dict: Dict[int, str] = dict()
-
-            # Indexes into style_dict
-            self.reset_all: Optional[int] = None
-            self.fg: Optional[int] = None
-            self.bg: Optional[int] = None
-            self.intensity: Optional[int] = None
-            self.italic: Optional[int] = None
-            self.overline: Optional[int] = None
-            self.strikethrough: Optional[int] = None
-            self.underline: Optional[int] = None
-
     # Read the previous styles in order and keep track of their states
-    style_state = StyleState()
+    style_state = _StyleState()
 
     for index, style in enumerate(styles_to_parse):
         # For styles types that we recognize, only keep their latest value from styles_to_parse.
         # All unrecognized style types will be retained and their order preserved.
         if style in (str(ansi.TextStyle.RESET_ALL), str(ansi.TextStyle.ALT_RESET_ALL)):
-            style_state = StyleState()
+            style_state = _StyleState()
             style_state.reset_all = index
         elif ansi.STD_FG_RE.match(style) or ansi.EIGHT_BIT_FG_RE.match(style) or ansi.RGB_FG_RE.match(style):
             if style_state.fg is not None:
@@ -869,7 +1296,6 @@ def align_text(
         raise ValueError("width must be at least 1")
 
     # Convert tabs to spaces
-    text = text.replace('\t', ' ' * tab_width)
     fill_char = fill_char.replace('\t', ' ')
 
     # Save fill_char with no styles for use later
@@ -885,10 +1311,13 @@ def align_text(
     # fill characters. Instead of repeating the style characters for each fill character, we'll wrap each sequence.
     fill_char_style_begin, fill_char_style_end = fill_char.split(stripped_fill_char)
 
-    if text:
-        lines = text.splitlines()
+    # A StyledText with one line can be used as is. Otherwise split the text into lines and their styles.
+    lines: List[ansi.StyledText]
+    if isinstance(text, ansi.StyledText) and '\t' not in text and text.plain.splitlines() == [text.plain]:
+        lines = [text]
     else:
-        lines = ['']
+        text = text.replace('\t', ' ' * tab_width)
+        lines = [ansi.StyledText(line) for line in text.splitlines()] if text else [ansi.StyledText()]
 
     text_buf = io.StringIO()
 
@@ -902,14 +1331,14 @@ def align_text(
             text_buf.write('\n')
 
         if truncate:
-            line = truncate_line(line, width)
+            line = cast(ansi.StyledText, truncate_line(line, width))
 
-        line_width = ansi.style_aware_wcswidth(line)
+        line_width = line.width
         if line_width == -1:
             raise (ValueError("Text to align contains an unprintable character"))
 
         # Get list of styles in this line
-        line_styles = list(get_styles_dict(line).values())
+        line_styles = line.styles
 
         # Calculate how wide each side of filling needs to be
         if line_width >= width:
@@ -952,8 +1381,9 @@ def align_text(
         text_buf.write(left_fill + ''.join(previous_styles) + line + right_fill)
 
         # Update list of styles that are still in effect for the next line
-        previous_styles.extend(line_styles)
-        previous_styles = _remove_overridden_styles(previous_styles)
+        if line_styles:
+            previous_styles.extend(line_styles)
+            previous_styles = _remove_overridden_styles(previous_styles)
 
     return text_buf.getvalue()
 
@@ -1041,6 +1471,8 @@ def truncate_line(line: str, max_width: int, *, tab_width: int = 4) -> str:
     sequences makes sure the style is in the same state had the entire string been printed. align_text() relies on this
     behavior when preserving style over multiple lines.
 
+    If line is an ansi.StyledText, then it isn't searched for style sequences again and an ansi.StyledText is returned.
+
     :param line: text to truncate
     :param max_width: the maximum display width the resulting string is allowed to have
     :param tab_width: any tabs in the text will be replaced with this many spaces
@@ -1048,62 +1480,57 @@ def truncate_line(line: str, max_width: int, *, tab_width: int = 4) -> str:
     :raises: ValueError if text contains an unprintable character like a newline
     :raises: ValueError if max_width is less than 1
     """
-    import io
-
     from . import (
         ansi,
     )
 
     # Handle tabs
-    line = line.replace('\t', ' ' * tab_width)
+    if isinstance(line, ansi.StyledText) and '\t' not in line:
+        styled_line = line
+    else:
+        styled_line = ansi.StyledText(line.replace('\t', ' ' * tab_width))
 
-    if ansi.style_aware_wcswidth(line) == -1:
+    if styled_line.width == -1:
         raise (ValueError("text contains an unprintable character"))
 
     if max_width < 1:
         raise ValueError("max_width must be at least 1")
 
-    if ansi.style_aware_wcswidth(line) <= max_width:
-        return line
-
-    # Find all style sequences in the line
-    styles_dict = get_styles_dict(line)
+    truncated = _truncate_styled_text(styled_line, max_width)
+    return truncated if isinstance(line, ansi.StyledText) else str(truncated)
 
-    # Add characters one by one and preserve all style sequences
-    done = False
-    index = 0
-    total_width = 0
-    truncated_buf = io.StringIO()
 
-    while not done:
-        # Check if a style sequence is at this index. These don't count toward display width.
-        if index in styles_dict:
-            truncated_buf.write(styles_dict[index])
-            style_len = len(styles_dict[index])
-            styles_dict.pop(index)
-            index += style_len
-            continue
+def _truncate_styled_text(line: 'ansi.StyledText', max_width: int) -> 'ansi.StyledText':
+    """
+    Does the work of truncate_line() after its arguments are validated
 
-        char = line[index]
-        char_width = ansi.style_aware_wcswidth(char)
+    :param line: text to truncate which contains no tabs
+    :param max_width: the maximum display width the resulting string is allowed to have
+    :return: line that has a display width less than or equal to width
+    """
+    from . import (
+        ansi,
+    )
 
-        # This char will make the text too wide, add the ellipsis instead
-        if char_width + total_width >= max_width:
-            char = constants.HORIZONTAL_ELLIPSIS
-            char_width = ansi.style_aware_wcswidth(char)
-            done = True
+    if line.width <= max_width:
+        return line
 
-        total_width += char_width
-        truncated_buf.write(char)
-        index += 1
+    # The first character which makes the text too wide is replaced by the ellipsis
+    cumulative_widths = list(itertools.accumulate(ansi.style_aware_wcswidths(line.plain)))
+    trunc_index = bisect.bisect_left(cumulative_widths, max_width)
 
-    # Filter out overridden styles from the remaining ones
-    remaining_styles = _remove_overridden_styles(list(styles_dict.values()))
+    # Keep all style sequences which occur up to the ellipsis
+    num_kept_styles = bisect.bisect_right(line.style_indexes, trunc_index)
+    style_indexes = line.style_indexes[:num_kept_styles]
+    styles = line.styles[:num_kept_styles]
 
-    # Append the remaining styles to the truncated text
-    truncated_buf.write(''.join(remaining_styles))
+    # Filter out overridden styles from the remaining ones and append them to the truncated text
+    truncated_text = line.plain[:trunc_index] + constants.HORIZONTAL_ELLIPSIS
+    for style in _remove_overridden_styles(line.styles[num_kept_styles:]):
+        style_indexes.append(len(truncated_text))
+        styles.append(style)
 
-    return truncated_buf.getvalue()
+    return ansi.StyledText.from_parts(truncated_text, style_indexes, styles)
 
 
 def get_styles_dict(text: str) -> Dict[int, str]:
@@ -0,0 +1,39 @@
+# flake8: noqa F821
+# Tests app.stream()
+expected = app('help').stdout
+
+# Printing while reading the stream goes to the pyscript's stdout instead of the stream
+chunks = []
+for chunk in app.stream('help'):
+    chunks.append(chunk)
+    print("READ CHUNK")
+
+if ''.join(chunks) == expected:
+    print("PASSED")
+else:
+    print("FAILED")
+
+if list(app.stream('help').lines(keepends=True)) == expected.splitlines(keepends=True):
+    print("PASSED")
+else:
+    print("FAILED")
+
+# Stop reading early and then run another command
+stream = app.stream('help')
+for line in stream.lines():
+    break
+
+result = stream.result
+if result and not result.stdout and not result.stop:
+    print("PASSED")
+else:
+    print("FAILED")
+
+# stderr is captured in the result
+with app.stream('fake') as stream:
+    lines = list(stream.lines())
+
+if not lines and 'is not a recognized command' in stream.result.stderr:
+    print("PASSED")
+else:
+    print("FAILED")
@@ -28,6 +28,78 @@ def test_style_aware_wcswidth():
     assert ansi.style_aware_wcswidth('i have a newline\n') == -1
 
 
+@pytest.mark.parametrize(
+    'text',
+    [
+        '',
+        HELLO_WORLD,
+        ansi.style(HELLO_WORLD, fg=ansi.Fg.GREEN),
+        'i have a tab\t',
+        '\x1b',
+        '日本語',
+        ansi.style('日本語', bg=ansi.Bg.BLUE) + ' text',
+        'cafe\u0301',
+        'null\x00',
+        '\u2764\ufe0f',
+        '\U0001F468\u200d\U0001F469\u200d\U0001F467',
+    ],
+)
+def test_style_aware_wcswidth_matches_wcswidth(text):
+    from wcwidth import (
+        wcswidth,
+    )
+
+    expected = wcswidth(ansi.strip_style(text))
+    assert ansi.style_aware_wcswidth(text) == expected
+    assert ansi.style_aware_wcswidths([text, text]) == [expected, expected]
+
+
+def test_style_aware_wcswidths():
+    assert ansi.style_aware_wcswidths([]) == []
+    texts = [HELLO_WORLD, ansi.style(HELLO_WORLD, fg=ansi.Fg.GREEN), '日本', 'tab\t']
+    assert ansi.style_aware_wcswidths(texts) == [13, 13, 4, -1]
+    assert ansi.style_aware_wcswidths(iter(texts)) == [13, 13, 4, -1]
+
+
+def test_styled_text():
+    text = 'a' + ansi.style('日本', fg=ansi.Fg.RED) + 'b' + str(ansi.TextStyle.RESET_ALL)
+    styled = ansi.StyledText(text)
+    assert isinstance(styled, str)
+    assert styled == text
+    assert styled.plain == ansi.strip_style(text) == ansi.strip_style(styled) == 'a日本b'
+    assert styled.styles == [str(ansi.Fg.RED), str(ansi.Fg.RESET), str(ansi.TextStyle.RESET_ALL)]
+    assert styled.style_indexes == [1, 3, 4]
+    assert styled.width == ansi.style_aware_wcswidth(styled) == ansi.style_aware_wcswidth(text) == 6
+    assert styled.segments == [
+        ansi.StyledSegment('', 'a', 1),
+        ansi.StyledSegment(str(ansi.Fg.RED), '日本', 4),
+        ansi.StyledSegment(str(ansi.Fg.RESET), 'b', 1),
+        ansi.StyledSegment(str(ansi.TextStyle.RESET_ALL), '', 0),
+    ]
+
+    # Creating a StyledText from a StyledText or its parts gives the same result
+    copied = ansi.StyledText(styled)
+    assert copied == styled
+    assert copied.styles == styled.styles
+    assert ansi.StyledText.from_parts(styled.plain, styled.style_indexes, styled.styles) == styled
+
+    # Concatenation keeps the style sequences of both strings
+    combined = styled + ansi.style('c', bold=True)
+    assert isinstance(combined, ansi.StyledText)
+    assert combined == text + ansi.style('c', bold=True)
+    assert combined.plain == 'a日本bc'
+    assert combined.style_indexes == [1, 3, 4, 4, 5]
+
+    # Consecutive style sequences are combined in one segment
+    assert ansi.StyledText(ansi.style('x', fg=ansi.Fg.RED, bg=ansi.Bg.BLUE)).segments == [
+        ansi.StyledSegment(str(ansi.Fg.RED) + str(ansi.Bg.BLUE), 'x', 1),
+        ansi.StyledSegment(str(ansi.Fg.RESET) + str(ansi.Bg.RESET), '', 0),
+    ]
+
+    assert ansi.StyledText().segments == []
+    assert ansi.StyledText('tab\t').width == -1
+
+
 def test_widest_line():
     text = ansi.style('i have\n3 lines\nThis is the longest one', fg=ansi.Fg.GREEN)
     assert ansi.widest_line(text) == ansi.style_aware_wcswidth("This is the longest one")
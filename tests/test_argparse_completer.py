@@ -5,6 +5,8 @@ Unit/functional testing for argparse completer in cmd2
 """
 import argparse
 import numbers
+import threading
+import time
 from typing import (
     Dict,
     List,
@@ -720,6 +722,117 @@ def test_autocomp_blank_token(ac_app):
     assert sorted(completions) == sorted(ArgparseCompleterTester.completions_for_pos_2)
 
 
+def test_action_tables_cached():
+    parser = Cmd2ArgumentParser()
+    parser.add_argument('--flag')
+    app = cmd2.Cmd()
+
+    completer = argparse_completer.ArgparseCompleter(parser, app)
+    assert completer._flags == ['-h', '--help', '--flag']
+
+    # The tables are reused by the next completer of the parser
+    assert argparse_completer.ArgparseCompleter(parser, app)._flags is completer._flags
+
+    # Adding an argument rebuilds them
+    parser.add_argument('pos')
+    completer = argparse_completer.ArgparseCompleter(parser, app)
+    assert completer._flags == ['-h', '--help', '--flag']
+    assert [action.dest for action in completer._positional_actions] == ['pos']
+
+    # Replacing an action or changing its flags without changing the number of actions also rebuilds them
+    parser._actions[-1].option_strings = ['--pos']
+    assert argparse_completer.ArgparseCompleter(parser, app)._flags == ['-h', '--help', '--flag', '--pos']
+    flag_action = parser._actions[1]
+    parser._actions[1] = argparse._StoreAction(['--other'], 'other')
+    assert argparse_completer.ArgparseCompleter(parser, app)._flags == ['-h', '--help', '--other', '--pos']
+    parser._actions[1] = flag_action
+
+    # They can also be explicitly discarded
+    argparse_completer._invalidate_action_tables(parser)
+    assert argparse_completer.ArgparseCompleter(parser, app)._flags is not completer._flags
+
+
+def test_choices_provider_cache(mocker):
+    calls = []
+
+    def provider(cli, arg_tokens):
+        calls.append(arg_tokens['first'])
+        return ['apple', 'banana']
+
+    parser = Cmd2ArgumentParser()
+    parser.add_argument('first')
+    parser.add_argument('second', choices_provider=provider, choices_cache_ttl=60)
+    app = cmd2.Cmd()
+
+    def complete(text):
+        completer = argparse_completer.ArgparseCompleter(parser, app)
+        line = 'cmd fruit {}'.format(text)
+        return completer.complete(text, line, len(line) - len(text), len(line), ['fruit', text])
+
+    assert complete('a') == ['apple']
+    assert complete('a') == ['apple']
+    assert len(calls) == 1
+
+    # Different arg_tokens are cached separately
+    assert complete('b') == ['banana']
+    assert len(calls) == 2
+
+    # Expired results are replaced
+    mocker.patch('time.monotonic', return_value=time.monotonic() + 61)
+    assert complete('a') == ['apple']
+    assert len(calls) == 3
+
+
+def test_choices_provider_timeout():
+    release = threading.Event()
+    results = ['apple']
+
+    def provider(cli):
+        release.wait()
+        return list(results)
+
+    parser = Cmd2ArgumentParser()
+    parser.add_argument('fruit', choices_provider=provider, choices_timeout=0.05)
+    choices_cache = parser._actions[-1].get_choices_provider_cache()
+    app = cmd2.Cmd()
+
+    def complete():
+        app._reset_completion_defaults()
+        completer = argparse_completer.ArgparseCompleter(parser, app)
+        return completer.complete('', 'cmd ', 4, 4, [''])
+
+    # With no previous results, the timeout is reported
+    with pytest.raises(CompletionError) as excinfo:
+        complete()
+    assert 'Timed out' in str(excinfo.value)
+
+    # The call keeps running and its results are shown once it finishes
+    release.set()
+    assert complete() == ['apple']
+    assert not app.completion_notice
+
+    # After a timeout, previous results are shown with a notice
+    release.clear()
+    results.append('banana')
+    assert complete() == ['apple']
+    assert 'out of date' in app.completion_notice
+
+    release.set()
+    while choices_cache._pending:
+        time.sleep(0.01)
+    assert complete() == ['apple', 'banana']
+
+
+def test_choices_provider_cache_invalid():
+    parser = Cmd2ArgumentParser()
+    with pytest.raises(ValueError):
+        parser.add_argument('arg', completer=cmd2.Cmd.path_complete, choices_cache_ttl=1)
+    with pytest.raises(ValueError):
+        parser.add_argument('arg', choices_provider=lambda cli: [], choices_cache_ttl=0)
+    with pytest.raises(ValueError):
+        parser.add_argument('arg', choices_provider=lambda cli: [], choices_timeout=-1)
+
+
 def test_completion_items(ac_app):
     # First test CompletionItems created from strings
     text = ''
@@ -333,6 +333,96 @@ def test_run_script(base_app, request):
     assert script_err == manual_err
 
 
+def test_run_script_compiled(base_app, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    base_app.script_cache_dir = str(cache_dir)
+
+    script = tmp_path / 'script.txt'
+    script.write_text('# comment\nhelp history\nhelp history\nalias create hh help history\nhh\n')
+
+    parser = base_app.statement_parser
+    with mock.patch.object(parser, '_parse', wraps=parser._parse) as parse_mock:
+        first_out, first_err = run_cmd(base_app, f'run_script {script}')
+        assert base_app.last_result is True
+        compiled_files = list(cache_dir.iterdir())
+        assert len(compiled_files) == 1
+        assert parser._preloaded == {}
+
+        # Running the script again with the same settings loads its commands from the compiled file
+        run_cmd(base_app, 'alias delete hh')
+        parse_mock.reset_mock()
+        second_out, second_err = run_cmd(base_app, f'run_script {script}')
+        assert list(cache_dir.iterdir()) == compiled_files
+
+        # Only 'hh' is parsed, since creating the alias discarded the preloaded commands
+        parsed_lines = [c.args[0] for c in parse_mock.call_args_list]
+        assert 'help history' not in parsed_lines
+        assert 'hh' in parsed_lines
+
+    assert second_out == first_out
+    assert second_err == first_err
+    assert second_out.count(normalize(HELP_HISTORY)[0]) == 3
+
+    # Different parser settings use a different compiled file
+    run_cmd(base_app, 'alias delete hh')
+    run_cmd(base_app, 'alias create other help')
+    run_cmd(base_app, f'run_script {script}')
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_run_script_compiled_pruned(base_app, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    (cache_dir / 'other.txt').write_text('not a compiled script')
+    base_app.script_cache_dir = str(cache_dir)
+    base_app.script_cache_max_entries = 2
+
+    scripts = []
+    for command in ['help', 'help history', 'help alias']:
+        script = tmp_path / f'{len(scripts)}.txt'
+        script.write_text(command + '\n')
+        scripts.append(script)
+
+    run_cmd(base_app, f'run_script {scripts[0]}')
+    first_compiled = next(path for path in cache_dir.iterdir() if path.suffix == '.json')
+    run_cmd(base_app, f'run_script {scripts[1]}')
+    second_compiled = next(path for path in cache_dir.iterdir() if path.suffix == '.json' and path != first_compiled)
+    os.utime(first_compiled, (1000, 1000))
+    os.utime(second_compiled, (2000, 2000))
+
+    # Loading a compiled script marks it as recently used, so the least recently used one is removed
+    run_cmd(base_app, f'run_script {scripts[0]}')
+    run_cmd(base_app, f'run_script {scripts[2]}')
+    remaining = set(cache_dir.iterdir())
+    assert len(remaining) == 3
+    assert first_compiled in remaining
+    assert second_compiled not in remaining
+    assert cache_dir / 'other.txt' in remaining
+
+
+def test_run_script_compiled_bad_file(base_app, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    base_app.script_cache_dir = str(cache_dir)
+
+    script = tmp_path / 'script.txt'
+    script.write_text('help history\n')
+    run_cmd(base_app, f'run_script {script}')
+    compiled_file = next(cache_dir.iterdir())
+
+    # A corrupt compiled file is replaced
+    compiled_file.write_text('{"compiled_script_version": "1.0.0", "statements": [{}]}')
+    out, err = run_cmd(base_app, f'run_script {script}')
+    assert out == normalize(HELP_HISTORY)
+    assert '"raw": "help history"' in compiled_file.read_text()
+
+    # Failing to write the compiled file doesn't stop the script
+    compiled_file.unlink()
+    with mock.patch('tempfile.mkstemp', side_effect=OSError('no space')):
+        out, err = run_cmd(base_app, f'run_script {script}')
+    assert out == normalize(HELP_HISTORY)
+    assert err[0].startswith('Cannot write compiled script')
+
+
 def test_run_script_with_empty_args(base_app):
     out, err = run_cmd(base_app, 'run_script')
     assert "the following arguments are required" in err[1]
@@ -480,6 +570,90 @@ def test_runcmds_plus_hooks_ctrl_c(base_app, capsys):
     assert len(base_app.history) == 2
 
 
+def test_runcmds_plus_hooks_batch(base_app, capsys, tmp_path):
+    import types
+
+    postparsing_lines = []
+
+    def postparsing_hook(data: plugin.PostparsingData) -> plugin.PostparsingData:
+        postparsing_lines.append(data.statement.raw)
+        return data
+
+    base_app.register_postparsing_hook(postparsing_hook)
+
+    opened_files = []
+
+    def do_write(self, arg):
+        opened_files.append(self.stdout)
+        self.poutput(arg)
+
+    setattr(base_app, 'do_write', types.MethodType(do_write, base_app))
+
+    out_file = tmp_path / 'out.txt'
+    other_file = tmp_path / 'other.txt'
+    cmds = [
+        '',
+        '# a comment',
+        f'write one > {out_file}',
+        f'write two >> {out_file}',
+        f'write three >> {out_file}',
+        f'write four > {other_file}',
+        f'write five >> {out_file}',
+        f'write six > {out_file}',
+        f'write seven >> {out_file}',
+        'write eight',
+    ]
+
+    base_app.history.clear()
+    base_app.timing = True
+    assert not base_app.runcmds_plus_hooks(cmds, batch=True)
+    _, err = capsys.readouterr()
+
+    # Blank lines and comments don't run hooks or get added to history
+    assert postparsing_lines == [line for line in cmds if line and not line.startswith('#')]
+    assert len(base_app.history) == 8
+
+    # Consecutive commands appending to the same file reuse it
+    assert opened_files[2] is opened_files[1]
+    assert len(set(map(id, opened_files))) == len(opened_files) - 1
+    assert all(f.closed for f in opened_files[:7])
+    assert base_app._batch_state is None
+
+    assert out_file.read_text() == 'six\nseven\n'
+    assert other_file.read_text() == 'four\n'
+
+    # Timings are printed after all commands run
+    timings = err.splitlines()
+    assert len(timings) == 8
+    assert timings[-1].startswith('Elapsed: ') and timings[-1].endswith('write eight')
+
+
+def test_batch_state_replaced_file(tmp_path):
+    from cmd2.cmd2 import (
+        _BatchState,
+    )
+
+    out_file = str(tmp_path / 'out.txt')
+    batch_state = _BatchState()
+
+    # Files opened for overwriting aren't kept
+    redirect_file = open(out_file, 'w')
+    assert not batch_state.keep_redirect_file(out_file, redirect_file)
+    redirect_file.close()
+
+    redirect_file = open(out_file, 'a')
+    assert batch_state.keep_redirect_file(out_file, redirect_file)
+    assert batch_state.reuse_redirect_file(out_file, 'a') is redirect_file
+    assert batch_state.keep_redirect_file(out_file, redirect_file)
+
+    # The file isn't reused once something else replaces it
+    os.remove(out_file)
+    open(out_file, 'w').close()
+    assert batch_state.reuse_redirect_file(out_file, 'a') is None
+    assert redirect_file.closed
+    assert batch_state.redirect_file is None
+
+
 def test_relative_run_script(base_app, request):
     test_dir = os.path.dirname(request.module.__file__)
     filename = os.path.join(test_dir, 'script.txt')
@@ -708,7 +882,21 @@ def test_pipe_to_shell_error(base_app):
     # Try to pipe command output to a shell command that doesn't exist in order to produce an error
     out, err = run_cmd(base_app, 'help | foobarbaz.this_does_not_exist')
     assert not out
-    assert "Pipe process exited with code" in err[0]
+
+    # The shell's error is followed by cmd2's error since the pipe process is checked after the command runs
+    assert "Pipe process exited with code" in err[-1]
+
+
+def test_pipe_to_shell_early_exit(base_app):
+    # A pipe process which successfully exits before reading all of the output is not an error
+    if sys.platform == "win32":
+        command = 'help | exit 0'
+    else:
+        command = 'help | true'
+
+    out, err = run_cmd(base_app, command)
+    assert not out
+    assert not err
 
 
 @pytest.mark.skipif(not clipboard.can_clip, reason="Pyperclip could not find a copy/paste mechanism for your system")
@@ -947,6 +1135,42 @@ def test_stty_sane(base_app, monkeypatch):
         m.assert_called_once_with(['stty', 'sane'])
 
 
+@pytest.mark.skipif(sys.platform.startswith('win'), reason="termios only used on Linux/Mac")
+def test_restore_termios_attrs(base_app, monkeypatch):
+    """Make sure saved terminal settings are restored in-process instead of running stty sane"""
+    import termios
+
+    saved_attrs = [1, 2, 3]
+    cur_attrs = saved_attrs
+
+    tcgetattr_mock = mock.MagicMock(name='tcgetattr', side_effect=lambda fd: cur_attrs)
+    tcsetattr_mock = mock.MagicMock(name='tcsetattr')
+    popen_mock = mock.MagicMock(name='Popen')
+    monkeypatch.setattr("termios.tcgetattr", tcgetattr_mock)
+    monkeypatch.setattr("termios.tcsetattr", tcsetattr_mock)
+    monkeypatch.setattr("subprocess.Popen", popen_mock)
+
+    with mock.patch('sys.stdin.isatty', mock.MagicMock(name='isatty', return_value=True)):
+        with mock.patch('sys.stdin.fileno', mock.MagicMock(name='fileno', return_value=0)):
+            base_app._save_termios_attrs()
+            assert base_app._saved_termios_attrs == saved_attrs
+
+            # Nothing is restored if the settings did not change
+            base_app.onecmd_plus_hooks('help')
+            tcsetattr_mock.assert_not_called()
+
+            # Changed settings are restored
+            cur_attrs = [4, 5, 6]
+            base_app.onecmd_plus_hooks('help')
+            tcsetattr_mock.assert_called_once_with(0, termios.TCSANOW, saved_attrs)
+
+            # The old behavior can be kept
+            base_app.always_run_stty_sane = True
+            base_app.onecmd_plus_hooks('help')
+            popen_mock.assert_called_once_with(['stty', 'sane'])
+            assert tcsetattr_mock.call_count == 1
+
+
 def test_sigint_handler(base_app):
     # No KeyboardInterrupt should be raised when using sigint_protection
     with base_app.sigint_protection:
@@ -1820,6 +2044,17 @@ def test_poutput_ansi_never(outsim_app):
     assert out == expected
 
 
+@pytest.mark.parametrize('allow_style, stripped', [(ansi.AllowStyle.ALWAYS, False), (ansi.AllowStyle.NEVER, True)])
+def test_poutput_styled_text(outsim_app, allow_style, stripped):
+    msg = 'Hello World'
+    ansi.allow_style = allow_style
+    colored_msg = ansi.StyledText(ansi.style(msg, fg=ansi.Fg.CYAN))
+    outsim_app.poutput(colored_msg, end=ansi.style('!', bold=True) + '\n')
+    out = outsim_app.stdout.getvalue()
+    expected = msg + '!\n' if stripped else colored_msg + ansi.style('!', bold=True) + '\n'
+    assert out == expected
+
+
 # These are invalid names for aliases and macros
 invalid_command_name = [
     '""',  # Blank name
@@ -2419,6 +2654,67 @@ def test_get_all_commands(base_app):
     assert commands == expected_commands
 
 
+def test_get_all_commands_dynamic(base_app):
+    # Verify the command list stays in sync with command functions added and removed after initialization
+    import types
+
+    def do_dynamic(self, _):
+        pass
+
+    def help_dynamic(self):
+        pass
+
+    assert 'dynamic' not in base_app.get_all_commands()
+    setattr(base_app, 'do_dynamic', types.MethodType(do_dynamic, base_app))
+    setattr(base_app, 'help_dynamic', types.MethodType(help_dynamic, base_app))
+    assert 'dynamic' in base_app.get_all_commands()
+    assert 'dynamic' in base_app.get_help_topics()
+
+    delattr(base_app, 'do_dynamic')
+    delattr(base_app, 'help_dynamic')
+    assert 'dynamic' not in base_app.get_all_commands()
+    assert 'dynamic' not in base_app.get_help_topics()
+
+    # Deleting an instance attribute which hides a class command should restore that command
+    setattr(base_app, 'do_shortcuts', None)
+    assert 'shortcuts' not in base_app.get_all_commands()
+    delattr(base_app, 'do_shortcuts')
+    assert 'shortcuts' in base_app.get_all_commands()
+
+
+def test_get_all_commands_added_to_class():
+    class TestApp(cmd2.Cmd):
+        pass
+
+    def do_later(self, _):
+        pass
+
+    app = TestApp()
+    assert 'later' not in app.get_all_commands()
+    TestApp.do_later = do_later
+    assert 'later' in app.get_all_commands()
+
+    # Replacing one command with another keeps the number of class attributes the same
+    del TestApp.do_later
+    TestApp.do_other = do_later
+    commands = app.get_all_commands()
+    assert 'later' not in commands
+    assert 'other' in commands
+
+
+def test_get_all_commands_overridden_get_names():
+    class TestApp(cmd2.Cmd):
+        def do_excluded(self, _):
+            pass
+
+        def get_names(self):
+            return [name for name in super().get_names() if name != 'do_excluded']
+
+    app = TestApp()
+    assert 'excluded' not in app.get_all_commands()
+    assert 'help' in app.get_all_commands()
+
+
 def test_get_help_topics(base_app):
     # Verify that the base app has no additional help_foo methods
     custom_help = base_app.get_help_topics()
@@ -9,6 +9,7 @@ file system paths, and shell commands.
 import enum
 import os
 import sys
+import time
 from unittest import (
     mock,
 )
@@ -588,6 +589,63 @@ def test_path_completion_directories_only(cmd2_app, request):
     assert cmd2_app.path_complete(text, line, begidx, endidx, path_filter=os.path.isdir) == expected
 
 
+def test_path_completion_hidden_files(cmd2_app, tmp_path):
+    (tmp_path / 'visible').write_text('')
+    (tmp_path / '.hidden').write_text('')
+
+    text = str(tmp_path) + os.path.sep
+    line = 'shell cat {}'.format(text)
+    endidx = len(line)
+    begidx = endidx - len(text)
+    assert cmd2_app.path_complete(text, line, begidx, endidx) == [text + 'visible']
+
+    text += '.'
+    line += '.'
+    assert cmd2_app.path_complete(text, line, begidx, endidx + 1) == [text + 'hidden']
+
+
+def test_path_completion_listing_cache(cmd2_app, tmp_path):
+    (tmp_path / 'file1').write_text('')
+
+    # Make the directory look old enough for its listing to be cached
+    now = int(time.time() * 1_000_000_000)
+
+    def set_dir_mtime(mtime):
+        os.utime(tmp_path, ns=(mtime, mtime))
+
+    set_dir_mtime(now - 10_000_000_000)
+    text = os.path.join(str(tmp_path), 'file')
+    line = 'shell cat {}'.format(text)
+    endidx = len(line)
+    begidx = endidx - len(text)
+    assert cmd2_app.path_complete(text, line, begidx, endidx) == [text + '1']
+
+    # A change to the directory which doesn't update its modification time isn't seen
+    (tmp_path / 'file2').write_text('')
+    set_dir_mtime(now - 10_000_000_000)
+    assert cmd2_app.path_complete(text, line, begidx, endidx) == [text + '1']
+
+    # Once it is modified, the directory is listed again
+    set_dir_mtime(now - 5_000_000_000)
+    assert cmd2_app.path_complete(text, line, begidx, endidx) == [text + '1', text + '2']
+
+
+@pytest.mark.skipif(sys.platform.startswith('win'), reason="Windows doesn't have the pwd module")
+def test_path_completion_users_cached(cmd2_app, mocker):
+    import pwd
+
+    getpwall = mocker.patch('pwd.getpwall', wraps=pwd.getpwall)
+    mocker.patch.object(cmd2.utils._path_completion_cache, '_users', None)
+
+    text = '~'
+    line = 'shell fake {}'.format(text)
+    endidx = len(line)
+    begidx = endidx - len(text)
+    first = cmd2_app.path_complete(text, line, begidx, endidx)
+    assert cmd2_app.path_complete(text, line, begidx, endidx) == first
+    assert getpwall.call_count == 1
+
+
 def test_basic_completion_single(cmd2_app):
     text = 'Pi'
     line = 'list_food -f {}'.format(text)
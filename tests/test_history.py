@@ -315,6 +315,67 @@ def test_history_regex_search(hist):
     assert items[2].statement.raw == 'second'
 
 
+def _brute_force_search(hist, regex):
+    import re
+
+    finder = re.compile(regex, re.DOTALL | re.MULTILINE)
+    return [i + 1 for i, hi in enumerate(hist) if finder.search(hi.raw) or finder.search(hi.expanded)]
+
+
+@pytest.mark.parametrize(
+    'regex',
+    [
+        'third',
+        'th?ird',
+        'f(ir|our)',
+        'second|fourth',
+        r'\w+rth',
+        'fo{1,2}urth',
+        '[fs]econd',
+        '(?i)THIRD',
+        r'Caf\u00e9',
+        'cafe\u0301',
+    ],
+)
+def test_history_regex_search_matches_scan(hist, regex):
+    from cmd2.parsing import (
+        Statement,
+    )
+
+    hist.append(Statement('', raw='Caf\u00e9 fourth'))
+    hist.append(Statement('', raw='cafe\u0301'))
+    assert list(hist.regex_search(regex, include_persisted=True)) == _brute_force_search(hist, regex)
+
+
+def test_history_search_index_updates(hist):
+    from cmd2.history import (
+        HistoryItem,
+    )
+    from cmd2.parsing import (
+        Statement,
+    )
+
+    assert list(hist.str_search('fourth')) == [4]
+
+    # Appended items are added to the index
+    hist.append(Statement('', raw='FOURTH again'))
+    assert list(hist.str_search('fourth')) == [4, 5]
+    assert list(hist.regex_search('again')) == [5]
+
+    # Other changes rebuild it
+    hist[0] = HistoryItem(Statement('', raw='fourth replaced'))
+    assert list(hist.str_search('fourth')) == [1, 4, 5]
+
+    hist.truncate(2)
+    assert list(hist.str_search('fourth')) == [1, 2]
+
+    # Searches only cover the current session unless asked to include persisted items
+    hist.start_session()
+    hist.append(Statement('', raw='fourth session'))
+    assert list(hist.str_search('fourth')) == [3]
+    assert list(hist.str_search('fourth', include_persisted=True)) == [1, 2, 3]
+
+
 def test_history_max_length_zero(hist):
     hist.truncate(0)
     assert len(hist) == 0
@@ -961,3 +1022,194 @@ def test_persist_history_permission_error(hist_file, mocker, capsys):
     out, err = capsys.readouterr()
     assert not out
     assert 'Cannot write' in err
+
+
+#
+# test the append-only persistent history file
+#
+@pytest.fixture
+def hist_log_file(tmp_path):
+    return str(tmp_path / 'hist_log')
+
+
+def test_history_log_written_as_commands_run(hist_log_file):
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True)
+    run_cmd(app, 'help')
+    run_cmd(app, 'alias')
+
+    # Every command is in the file before the history is persisted at exit
+    with open(hist_log_file, 'rb') as fobj:
+        lines = fobj.read().splitlines()
+    assert len(lines) == 3
+
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True)
+    assert len(app.history) == 2
+    assert app.history.get(1).statement.raw == 'help'
+    assert app.history.get(2).statement.raw == 'alias'
+    assert app.history.session_start_index == 2
+
+
+def test_history_log_ignores_partial_line(hist_log_file):
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True)
+    run_cmd(app, 'help')
+    app._persist_history()
+
+    # Simulate a crash while writing an item
+    with open(hist_log_file, 'ab') as fobj:
+        fobj.write(b'{"statement": ')
+
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True)
+    assert len(app.history) == 1
+    assert app.history.get(1).statement.raw == 'help'
+
+    # The partial line was compacted out of the file
+    with open(hist_log_file, 'rb') as fobj:
+        assert fobj.read().endswith(b'\n')
+
+
+def test_history_log_compaction(hist_log_file):
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, persistent_history_length=2, append_persistent_history=True)
+    for _ in range(5):
+        run_cmd(app, 'help')
+    assert app._history_log.needs_compaction
+    app._persist_history()
+    assert not app._history_log.needs_compaction
+
+    with open(hist_log_file, 'rb') as fobj:
+        assert len(fobj.read().splitlines()) == 3
+
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, persistent_history_length=2, append_persistent_history=True)
+    assert len(app.history) == 2
+
+
+def test_history_log_converts_compressed_file(hist_log_file):
+    app = cmd2.Cmd(persistent_history_file=hist_log_file)
+    run_cmd(app, 'help')
+    run_cmd(app, 'alias')
+    app._persist_history()
+
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True)
+    assert len(app.history) == 2
+    assert app.history.get(2).statement.raw == 'alias'
+
+    with open(hist_log_file, 'rb') as fobj:
+        assert not fobj.read().startswith(cmd2.history.HistoryLog._lzma_magic)
+
+
+def test_history_log_bad_version(hist_log_file, capsys):
+    with open(hist_log_file, 'wb') as fobj:
+        fobj.write(b'{"history_log_version": "0.0.0"}\n')
+
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True)
+    _, err = capsys.readouterr()
+    assert 'Error processing persistent history file' in err
+    assert not os.path.exists(hist_log_file)
+
+    # The file is recreated when a command runs
+    run_cmd(app, 'help')
+    assert os.path.exists(hist_log_file)
+
+
+def test_history_log_corrupted_item(hist_log_file, capsys):
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True)
+    run_cmd(app, 'help')
+    app._persist_history()
+
+    with open(hist_log_file, 'ab') as fobj:
+        fobj.write(b'{"statement": not json}\n')
+        fobj.write(b'{"statement": {"args": 5}}\n')
+        fobj.write(b'\xff\n')
+    run_cmd(app, 'alias')
+    app._persist_history()
+
+    # Corrupted items are skipped even when they aren't loaded into readline history
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True, readline_history_length=1)
+    _, err = capsys.readouterr()
+    assert 'Skipped 3 corrupted item(s)' in err
+    assert [item.raw for item in app.history] == ['help', 'alias']
+    out, err = run_cmd(app, 'history')
+    assert not err
+
+    # They were dropped from the file when it was compacted
+    with open(hist_log_file, 'rb') as fobj:
+        assert len(fobj.read().splitlines()) == 3
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True)
+    _, err = capsys.readouterr()
+    assert 'corrupted' not in err
+    assert [item.raw for item in app.history] == ['help', 'alias']
+
+
+def test_history_log_clear(hist_log_file):
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True)
+    run_cmd(app, 'help')
+    assert os.path.exists(hist_log_file)
+    run_cmd(app, 'history --clear')
+    assert not os.path.exists(hist_log_file)
+    assert len(app.history) == 0
+
+
+def test_history_log_decodes_lazily(hist_log_file):
+    from cmd2.history import (
+        HistoryItem,
+    )
+
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True)
+    run_cmd(app, 'help')
+    run_cmd(app, 'alias')
+    app._persist_history()
+
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True, readline_history_length=1)
+    first, second = app.history
+    assert first._statement is None
+    assert second._statement is not None
+
+    # Items are decoded when accessed
+    assert app.history.get(1).statement.raw == 'help'
+    assert first._statement is not None
+    assert first._source is None
+    assert first == HistoryItem(first.statement)
+    assert HistoryItem(first.statement) == first
+
+
+def test_history_log_writes_undecoded_items(hist_log_file):
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, persistent_history_length=2, append_persistent_history=True)
+    for command in ['help', 'alias', 'macro', 'shortcuts', 'help']:
+        run_cmd(app, command)
+    app._persist_history()
+
+    app = cmd2.Cmd(
+        persistent_history_file=hist_log_file,
+        persistent_history_length=2,
+        append_persistent_history=True,
+        readline_history_length=0,
+    )
+    assert all(item._statement is None for item in app.history)
+    app._history_log.compact(app.history)
+    assert all(item._statement is None for item in app.history)
+
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, append_persistent_history=True)
+    assert [item.raw for item in app.history] == ['shortcuts', 'help']
+
+
+def test_readline_history_length(hist_log_file):
+    app = cmd2.Cmd(persistent_history_file=hist_log_file)
+    run_cmd(app, 'help')
+    run_cmd(app, 'shortcuts')
+    run_cmd(app, 'alias')
+    app._persist_history()
+
+    from cmd2.rl_utils import (
+        readline,
+    )
+
+    readline.clear_history()
+    app = cmd2.Cmd(persistent_history_file=hist_log_file, readline_history_length=2)
+    assert len(app.history) == 3
+    assert readline.get_current_history_length() == 2
+    assert readline.get_history_item(1) == 'shortcuts'
+    assert readline.get_history_item(2) == 'alias'
+
+
+def test_readline_history_length_invalid():
+    with pytest.raises(ValueError):
+        cmd2.Cmd(readline_history_length=-1)
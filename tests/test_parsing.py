@@ -19,8 +19,9 @@ from cmd2.parsing import (
 )
 
 
-@pytest.fixture
-def parser():
+# Run every parser test with both the shlex-based lexer and the single-pass lexer
+@pytest.fixture(params=[False, True], ids=['shlex', 'single_pass'])
+def parser(request):
     parser = StatementParser(
         terminators=[';', '&'],
         multiline_commands=['multiline'],
@@ -32,13 +33,14 @@ def parser():
             'fake': 'run_pyscript',
         },
         shortcuts={'?': 'help', '!': 'shell'},
+        single_pass_lexer=request.param,
     )
     return parser
 
 
-@pytest.fixture
-def default_parser():
-    parser = StatementParser()
+@pytest.fixture(params=[False, True], ids=['shlex', 'single_pass'])
+def default_parser(request):
+    parser = StatementParser(single_pass_lexer=request.param)
     return parser
 
 
@@ -965,6 +967,175 @@ def test_statement_as_dict(parser):
         Statement.from_dict(statement_dict)
 
 
+@pytest.mark.parametrize(
+    'line',
+    [
+        'command',
+        'command   with \t whitespace\r\n',
+        'command "quoted arg" \'single quoted\'',
+        '"quoted"adjacent"other;quote"',
+        'mid"word quote" test',
+        'word;"quote after punctuation"',
+        'command;;&&|>>>| end',
+        'command arg;suffix&&more',
+        'cmd "unclosed',
+        'cmd unclosed"',
+        'cmd \'unclosed',
+    ],
+)
+def test_single_pass_lexer_matches_shlex(line):
+    shlex_parser = StatementParser(terminators=[';', '&'])
+    single_pass_parser = StatementParser(terminators=[';', '&'], single_pass_lexer=True)
+
+    try:
+        expected = shlex_parser.tokenize(line)
+    except exceptions.Cmd2ShlexError as ex:
+        with pytest.raises(exceptions.Cmd2ShlexError) as excinfo:
+            single_pass_parser.tokenize(line)
+        assert str(excinfo.value) == str(ex)
+    else:
+        assert single_pass_parser.tokenize(line) == expected
+
+
+def test_single_pass_lexer_terminator_change():
+    parser = StatementParser(single_pass_lexer=True)
+    assert parser.tokenize('command arg&suffix') == ['command', 'arg&suffix']
+    parser.terminators = (';', '&')
+    assert parser.tokenize('command arg&suffix') == ['command', 'arg', '&', 'suffix']
+
+
+def test_parse_cache_disabled(parser):
+    statement = parser.parse('command with args')
+    assert parser.parse('command with args') is not statement
+
+    cache_info = parser.parse_cache_info()
+    assert cache_info.hits == 0
+    assert cache_info.misses == 0
+    assert cache_info.maxsize == 0
+    assert cache_info.currsize == 0
+
+
+def test_preload(parser):
+    statement = Statement.from_dict(parser.parse('command with args').to_dict())
+    parser.preload([statement])
+    assert parser.parse('command with args') is statement
+
+    # Changing a setting which affects parsing discards preloaded Statements
+    parser.aliases['other'] = 'help'
+    assert parser.parse('command with args') is not statement
+
+    parser.preload([statement])
+    parser.clear_preloaded()
+    assert parser.parse('command with args') is not statement
+
+
+def test_settings_key(parser):
+    key = parser.settings_key()
+    assert parser.settings_key() == key
+
+    parser.aliases['other'] = 'help'
+    assert parser.settings_key() != key
+    del parser.aliases['other']
+    assert parser.settings_key() == key
+
+    parser.multiline_commands = ('other',)
+    assert parser.settings_key() != key
+
+
+def test_parse_cache_invalid_size():
+    with pytest.raises(ValueError) as excinfo:
+        StatementParser(parse_cache_size=-1)
+    assert 'parse_cache_size cannot be less than 0' in str(excinfo.value)
+
+
+def test_parse_cache_hits_and_eviction():
+    parser = StatementParser(parse_cache_size=2)
+
+    first = parser.parse('first arg')
+    assert parser.parse('first arg') is first
+    parser.parse('second arg')
+
+    # first was used more recently than second, so second is evicted
+    assert parser.parse('first arg') is first
+    parser.parse('third arg')
+    assert parser.parse('first arg') is first
+
+    cache_info = parser.parse_cache_info()
+    assert cache_info.hits == 3
+    assert cache_info.misses == 3
+    assert cache_info.maxsize == 2
+    assert cache_info.currsize == 2
+
+    parser.parse('second arg')
+    assert parser.parse_cache_info().misses == 4
+
+    parser.clear_parse_cache()
+    cache_info = parser.parse_cache_info()
+    assert cache_info.hits == 0
+    assert cache_info.misses == 0
+    assert cache_info.currsize == 0
+
+
+def test_parse_cache_errors_not_cached():
+    parser = StatementParser(parse_cache_size=10)
+    with pytest.raises(exceptions.Cmd2ShlexError):
+        parser.parse('command with "unclosed')
+    assert parser.parse_cache_info().currsize == 0
+
+
+def test_parse_cache_invalidated_by_aliases():
+    parser = StatementParser(parse_cache_size=10)
+    assert parser.parse('fake arg').command == 'fake'
+
+    generation = parser.generation
+    parser.aliases['fake'] = 'run_pyscript'
+    assert parser.generation > generation
+    assert parser.parse_cache_info().currsize == 0
+    assert parser.parse('fake arg').command == 'run_pyscript'
+
+    del parser.aliases['fake']
+    assert parser.parse('fake arg').command == 'fake'
+
+    parser.aliases.update({'fake': 'help'})
+    assert parser.parse('fake arg').command == 'help'
+
+    parser.aliases.clear()
+    assert parser.parse('fake arg').command == 'fake'
+
+    parser.aliases = {'fake': 'shell'}
+    assert parser.parse('fake arg').command == 'shell'
+
+
+def test_parse_cache_invalidated_by_settings():
+    parser = StatementParser(parse_cache_size=10)
+    assert parser.parse('cmd arg & suffix').terminator == ''
+    parser.terminators = ('&',)
+    assert parser.parse('cmd arg & suffix').terminator == '&'
+
+    assert parser.parse('cmd arg').multiline_command == ''
+    parser.multiline_commands = ('cmd',)
+    assert parser.parse('cmd arg').multiline_command == 'cmd'
+
+    assert parser.parse('^ arg').command == '^'
+    parser.shortcuts = (('^', 'help'),)
+    assert parser.parse('^ arg').command == 'help'
+
+
+def test_parse_cache_arg_list_not_shared():
+    parser = StatementParser(parse_cache_size=10)
+    for _ in range(2):
+        statement, arg_list = parser.get_command_arg_list('cmd', parser.parse('cmd "one" two'), preserve_quotes=True)
+        assert arg_list == ['"one"', 'two']
+        arg_list.pop()
+    assert statement.arg_list == ['"one"', 'two']
+
+    statement = Statement.from_dict(parser.parse('cmd "one" two').to_dict())
+    parser.preload([statement])
+    _, arg_list = parser.get_command_arg_list('cmd', parser.parse('cmd "one" two'), preserve_quotes=True)
+    arg_list.clear()
+    assert statement.arg_list == ['"one"', 'two']
+
+
 def test_is_valid_command_invalid(mocker, parser):
     # Non-string command
     # noinspection PyTypeChecker
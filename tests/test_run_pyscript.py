@@ -112,7 +112,7 @@ def test_run_pyscript_dir(base_app, request):
     python_script = os.path.join(test_dir, 'pyscript', 'pyscript_dir.py')
 
     out, err = run_cmd(base_app, 'run_pyscript {}'.format(python_script))
-    assert out[0] == "['cmd_echo']"
+    assert out[0] == "['cmd_echo', 'max_retained', 'spill_size', 'stream']"
 
 
 def test_run_pyscript_stdout_capture(base_app, request):
@@ -191,3 +191,89 @@ def test_run_pyscript_app_echo(base_app, request):
 
     # Only the edit help text should have been echoed to pytest's stdout
     assert out[0] == "Usage: edit [-h] [file_path]"
+
+
+def test_run_pyscript_stream(base_app, request):
+    test_dir = os.path.dirname(request.module.__file__)
+    python_script = os.path.join(test_dir, 'pyscript', 'stream.py')
+    out, err = run_cmd(base_app, 'run_pyscript {}'.format(python_script))
+
+    assert out[0] == "READ CHUNK"
+    assert out[-4:] == ["PASSED"] * 4
+    assert base_app._in_py is False
+
+
+def test_py_bridge_stream_large_output():
+    import cmd2
+    from cmd2.py_bridge import (
+        CommandStream,
+        PyBridge,
+    )
+
+    class StreamApp(cmd2.Cmd):
+        def do_count(self, _):
+            for i in range(20000):
+                self.poutput(f'line {i} ' + 'x' * 20)
+            self.last_result = 'counted'
+
+    app = StreamApp()
+    app.stdout = utils.StdSim(app.stdout)
+    py_bridge = PyBridge(app)
+
+    stream = py_bridge.stream('count')
+    num_lines = 0
+    for line in stream.lines():
+        assert line == f'line {num_lines} ' + 'x' * 20
+        num_lines += 1
+
+        # The command waits for the output to be read
+        assert stream._stdout.stored_size() <= CommandStream.max_buffered
+
+    assert num_lines == 20000
+    assert stream.result.data == 'counted'
+    assert app.stdout.getvalue() == ''
+
+    # Closing the stream early lets the command finish
+    stream = py_bridge.stream('count')
+    next(iter(stream))
+    py_bridge('help')
+    assert stream._thread.is_alive() is False
+    assert stream.result.data == 'counted'
+    assert py_bridge._active_stream is None
+
+    # Exceptions are raised in the reading thread
+    with mock.patch.object(app, 'onecmd_plus_hooks', side_effect=RuntimeError):
+        stream = py_bridge.stream('count')
+        with pytest.raises(RuntimeError):
+            list(stream)
+        with pytest.raises(RuntimeError):
+            stream.result
+
+
+def test_py_bridge_output_limits():
+    import cmd2
+    from cmd2.py_bridge import (
+        PyBridge,
+    )
+
+    class OutputApp(cmd2.Cmd):
+        def do_count(self, _):
+            for i in range(1000):
+                self.poutput(f'line {i}')
+
+    app = OutputApp()
+    py_bridge = PyBridge(app)
+    assert py_bridge('count').stdout.startswith('line 0\n')
+
+    # Only the end of the output is kept
+    py_bridge.max_retained = 9
+    assert py_bridge('count').stdout == 'line 999\n'
+
+    # Output is moved to a temporary file but still returned in full
+    py_bridge.max_retained = None
+    py_bridge.spill_size = 100
+    assert py_bridge('count').stdout.count('\n') == 1000
+
+    py_bridge.max_retained = 100
+    with pytest.raises(ValueError):
+        py_bridge('count')
@@ -19,6 +19,7 @@ from cmd2.table_creator import (
     SimpleTable,
     TableCreator,
     VerticalAlignment,
+    fit_columns,
 )
 
 # Turn off black formatting for entire file so multiline strings
@@ -299,6 +300,22 @@ def test_wrap_long_char_wider_than_max_width():
     assert row == '…'
 
 
+def test_generate_row_styled_text():
+    from cmd2 import (
+        StyledText,
+    )
+
+    column_1 = Column("Col 1", width=10)
+    column_2 = Column("Col 2", width=10, max_data_lines=1)
+    tc = TableCreator([column_1, column_2])
+
+    # A StyledText renders the same as a str, whether or not it needs to be wrapped
+    for data in (ansi.style('short', fg=Fg.RED), ansi.style('a much longer value', bg=Bg.BLUE), 'tab\there'):
+        row_data = [data, data]
+        expected = tc.generate_row(row_data, is_header=False)
+        assert tc.generate_row([StyledText(cell) for cell in row_data], is_header=False) == expected
+
+
 def test_generate_row_exceptions():
     column_1 = Column("Col 1")
     tc = TableCreator([column_1])
@@ -742,3 +759,155 @@ def test_alternating_table_creation():
         '║\x1b[101m \x1b[49m\x1b[0m\x1b[101mCol 1 Row 2\x1b[49m\x1b[0m\x1b[101m    \x1b[49m\x1b[0m\x1b[101m \x1b[49m│\x1b[101m \x1b[49m\x1b[0mCol 2 Row 2\x1b[0m\x1b[101m    \x1b[49m\x1b[0m\x1b[101m \x1b[49m║\n'
         '╚═════════════════╧═════════════════╝'
     )
+
+
+def test_iter_table():
+    column_1 = Column("Col 1", width=15)
+    column_2 = Column("Col 2", width=15)
+
+    row_data = list()
+    row_data.append(["Col 1 Row 1", "Col 2 Row 1"])
+    row_data.append(["Col 1 Row 2", "Col 2 Row 2"])
+    row_data.append(["Col 1 Row 3", "Col 2 Row 3"])
+
+    def make_tables():
+        return [SimpleTable([column_1, column_2]), BorderedTable([column_1, column_2]),
+                AlternatingTable([column_1, column_2])]
+
+    # Joining the rows produces the same text as generate_table(). Any iterable of rows is accepted.
+    for include_header in (True, False):
+        for table, iter_table in zip(make_tables(), make_tables()):
+            expected = table.generate_table(row_data, include_header=include_header)
+            assert '\n'.join(iter_table.iter_table(iter(row_data), include_header=include_header)) == expected
+
+    for row_spacing in (0, 2):
+        st = SimpleTable([column_1, column_2])
+        expected = st.generate_table(row_data, row_spacing=row_spacing)
+        assert '\n'.join(st.iter_table(iter(row_data), row_spacing=row_spacing)) == expected
+
+    # Empty data sets
+    assert list(SimpleTable([column_1, column_2]).iter_table([], include_header=False)) == []
+    assert '\n'.join(BorderedTable([column_1, column_2]).iter_table([], include_header=False)) == (
+        '╔═════════════════╤═════════════════╗\n'
+        '╚═════════════════╧═════════════════╝'
+    )
+
+    # Rows are generated as the data is consumed
+    consumed = []
+
+    def data_gen():
+        for row in row_data:
+            consumed.append(row)
+            yield row
+
+    bt = BorderedTable([column_1, column_2])
+    rows = bt.iter_table(data_gen())
+    assert next(rows) == bt.generate_header()
+    assert next(rows) == bt.generate_data_row(row_data[0])
+    assert consumed == row_data[:1]
+
+    # Invalid row_spacing is reported before any rows are generated
+    with pytest.raises(ValueError) as excinfo:
+        SimpleTable([column_1, column_2]).iter_table(row_data, row_spacing=-1)
+    assert "Row spacing cannot be less than 0" in str(excinfo.value)
+
+
+def test_cached_row_parts():
+    column_1 = Column("Col 1", width=5)
+    column_2 = Column("Col 2", width=5)
+
+    # Row parts are validated once and reused
+    tc = TableCreator([column_1, column_2])
+    row = tc.generate_row(['a', 'b'], is_header=False, fill_char='\t', pre_line='|', post_line='|')
+    assert row == '|a      b    |'
+    template = tc._get_row_template('\t', '|', 2 * ' ', '|')
+    assert tc._get_row_template('\t', '|', 2 * ' ', '|') is template
+    assert template.fill_char == ' '
+
+    # Invalid parts raise an exception every time
+    for _ in range(2):
+        with pytest.raises(ValueError) as excinfo:
+            tc.generate_row(['a', 'b'], is_header=False, post_line='\n')
+        assert "post_line contains an unprintable character" in str(excinfo.value)
+
+    # Borders and row parts reflect changes to the table's settings
+    bt = BorderedTable([column_1, column_2])
+    assert bt.generate_table_top_border() == '╔═══════╤═══════╗'
+    assert bt.generate_data_row(['a', 'b']) == '║ a     │ b     ║'
+
+    bt.padding = 0
+    bt.column_borders = False
+    assert bt.generate_table_top_border() == '╔══════════╗'
+    assert bt.generate_data_row(['a', 'b']) == '║a    b    ║'
+
+    bt.cols[0].width = 2
+    assert bt.generate_table_top_border() == '╔═══════╗'
+
+    bt.border_fg = Fg.RED
+    new_bt = BorderedTable([Column("Col 1", width=2), column_2], column_borders=False, padding=0, border_fg=Fg.RED)
+    assert bt.generate_table_top_border() == new_bt.generate_table_top_border()
+    assert bt.generate_data_row(['a', 'b']) == new_bt.generate_data_row(['a', 'b'])
+
+
+def test_fit_columns():
+    row_data = list()
+    row_data.append(["Col 1 Row 1", "Short", 1])
+    row_data.append(["Col 1 Row 2", "A much longer value than the others", 2])
+    row_data.append(["Col 1\nRow 3", ansi.style("Styled", fg=Fg.RED), 3])
+    row_data.append(["Col 1 Row 4", "Tab\there", 4])
+
+    # Columns with a width keep it. The others fit their data.
+    cols = [Column("Col 1"), Column("Col 2"), Column("Col 3", width=8)]
+    assert fit_columns(cols, row_data, max_width=100, percentile=100) == [11, 35, 8]
+    assert [col.width for col in cols] == [11, 35, 8]
+
+    # A percentile keeps one long value from widening the column, but headers always fit
+    cols = [Column("Col 1"), Column("Col 2 Header")]
+    assert fit_columns(cols, [row[:2] for row in row_data], max_width=100, percentile=75) == [11, 12]
+
+    # Tabs count as tab_width spaces
+    cols = [Column("Col 1"), Column("Col 2")]
+    assert fit_columns(cols, [row_data[3][:2]], max_width=100, tab_width=8)[1] == 15
+
+    # Columns are narrowed to fit within max_width. Columns needing less than an even share keep their width.
+    cols = [Column("A"), Column("Col 2"), Column("Col 3")]
+    data = [["a", "x" * 30, "y" * 40]]
+    base_width = BorderedTable.base_width(3)
+    assert fit_columns(cols, data, base_width=base_width, max_width=base_width + 31, percentile=100) == [1, 15, 15]
+    assert fit_columns([Column("A"), Column("B")], [["a" * 10, "b" * 10]], max_width=15, percentile=100) == [7, 8]
+
+    # Columns are never narrower than 1
+    assert fit_columns([Column("Col 1"), Column("Col 2")], row_data, max_width=1) == [1, 1]
+
+    # Only sample_size rows are read from the data
+    def data_gen():
+        yield ["short", "a"]
+        yield ["a much longer value", "b"]
+
+    rows = data_gen()
+    assert fit_columns([Column(""), Column("")], rows, sample_size=1, max_width=100) == [5, 1]
+    assert next(rows) == ["a much longer value", "b"]
+    assert fit_columns([Column(""), Column("")], data_gen(), sample_size=None, max_width=100, percentile=100) == [19, 1]
+
+    # No data
+    assert fit_columns([Column("Col 1"), Column("")], [], max_width=100) == [5, 1]
+
+    # The fitted columns can be used by a table
+    cols = [Column("Col 1"), Column("Col 2")]
+    fit_columns(cols, [row[:2] for row in row_data], base_width=SimpleTable.base_width(2), max_width=30)
+    st = SimpleTable(cols)
+    assert st.total_width() <= 30
+
+    # Invalid arguments
+    with pytest.raises(ValueError) as excinfo:
+        fit_columns(cols, row_data, sample_size=0)
+    assert "Sample size cannot be less than 1" in str(excinfo.value)
+
+    for percentile in (0, 101):
+        with pytest.raises(ValueError) as excinfo:
+            fit_columns(cols, row_data, percentile=percentile)
+        assert "Percentile must be greater than 0 and less than or equal to 100" in str(excinfo.value)
+
+    with pytest.raises(ValueError) as excinfo:
+        fit_columns(cols, row_data, tab_width=0)
+    assert "Tab width cannot be less than 1" in str(excinfo.value)
@@ -289,6 +289,106 @@ def test_parse_transcript_expected(expected, transformed):
     assert testcase._transform_transcript_expected(expected) == transformed
 
 
+def run_transcript_text(app, tmp_path, text):
+    import unittest
+
+    transcript_file = tmp_path / 'transcript.txt'
+    transcript_file.write_text(text)
+
+    class TestMyAppCase(transcript.Cmd2TestCase):
+        cmdapp = app
+
+    app.testfiles = [str(transcript_file)]
+    test_results = unittest.TestResult()
+    TestMyAppCase().run(test_results)
+    return test_results
+
+
+def test_compile_transcript():
+    app = CmdLineApp(allow_cli_args=False)
+
+    class TestMyAppCase(transcript.Cmd2TestCase):
+        cmdapp = app
+
+    lines = [
+        'intro\n',
+        '(Cmd) say hello\n',
+        'hello\n',
+        '(Cmd) say /h.llo/\n',
+        '/h.llo/\n',
+        '(Cmd) nothing\n',
+        '(Cmd) orate hello\n',
+        '> world;\n',
+        'hello world\n',
+    ]
+    testcase = TestMyAppCase()
+    steps = testcase._get_steps(lines, 'digest', 1, lines[0], 1)
+    assert testcase._get_steps(lines, 'digest', 1, lines[0], 1) is steps
+
+    assert [step.command for step in steps] == ['say hello\n', 'say /h.llo/\n', 'nothing\n', 'orate hello\nworld;\n']
+    assert [step.line_num for step in steps] == [4, 6, 7, 9]
+
+    # Expected output without slashes is compared as plain text
+    assert steps[0].literal == 'hello\n'
+    assert steps[0].pattern is None
+    assert steps[1].literal is None
+    assert steps[1].pattern.match('hello\n')
+    assert not steps[2].expects_output
+    assert steps[3].finished
+
+    # Test case classes created for each run share the compiled steps
+    class OtherAppCase(transcript.Cmd2TestCase):
+        cmdapp = app
+
+    assert OtherAppCase()._get_steps(lines, 'digest', 1, lines[0], 1) is steps
+
+
+def test_transcript_overridden_transform(tmp_path):
+    import unittest
+
+    transcript_file = tmp_path / 'transcript.txt'
+    transcript_file.write_text('(Cmd) say hello\nHELLO\n')
+
+    app = CmdLineApp(allow_cli_args=False)
+    app.testfiles = [str(transcript_file)]
+
+    class TestMyAppCase(transcript.Cmd2TestCase):
+        cmdapp = app
+
+        def _transform_transcript_expected(self, s):
+            return '(?i)' + re.escape(s)
+
+    test_results = unittest.TestResult()
+    TestMyAppCase().run(test_results)
+    assert test_results.wasSuccessful()
+
+
+def test_transcript_prompt_change(tmp_path):
+    class PromptApp(CmdLineApp):
+        def do_newprompt(self, arg):
+            self.prompt = arg + ' '
+
+    app = PromptApp(allow_cli_args=False)
+    text = '(Cmd) newprompt new:\nnew: say hello\nhello\nnew: say hello\n/h.llo/\n'
+
+    # The expected output of each command ends at the prompt which is set after the command runs
+    test_results = run_transcript_text(app, tmp_path, text)
+    assert test_results.wasSuccessful()
+
+    app.prompt = '(Cmd) '
+    test_results = run_transcript_text(app, tmp_path, text.replace('say hello\nhello', 'say hello\nbye'))
+    assert len(test_results.failures) == 1
+    assert 'File ' in test_results.failures[0][1]
+    assert ', line 4\nCommand was:\nsay hello\n' in test_results.failures[0][1]
+
+
+def test_transcript_broken_command(tmp_path):
+    app = CmdLineApp(allow_cli_args=False)
+    test_results = run_transcript_text(app, tmp_path, '(Cmd) say hello\nhello\n(Cmd) orate hello\n> world\n')
+    assert len(test_results.errors) == 1
+    assert 'Transcript broke off while reading command beginning at line 4 with\norate hello' in test_results.errors[0][1]
+
+
 def test_transcript_failure(request, capsys):
     # Get location of the transcript
     test_dir = os.path.dirname(request.module.__file__)
@@ -332,3 +432,50 @@ def test_transcript_no_file(request, capsys):
     expected = 'No test files found - nothing to test\n'
     _, err = capsys.readouterr()
     assert err == expected
+
+
+def test_run_transcripts_in_pool(request):
+    import functools
+    import unittest
+
+    test_dir = os.path.dirname(request.module.__file__)
+    transcript_files = [
+        os.path.join(test_dir, 'transcripts', filename)
+        for filename in ('bol_eol.txt', 'failure.txt', 'characterclass.txt', 'spaces.txt')
+    ]
+
+    app_factory = functools.partial(CmdLineApp, allow_cli_args=False)
+    stream = StdSim(sys.stderr)
+    runner = unittest.TextTestRunner(stream=stream)
+    test_results = transcript.run_transcripts_in_pool(app_factory, transcript_files, runner, max_workers=2)
+
+    # Each transcript is reported as its own test
+    assert test_results.testsRun == 4
+    assert not test_results.errors
+    assert len(test_results.failures) == 1
+    assert str(test_results.failures[0][0]) == transcript_files[1]
+
+    output = stream.read()
+    assert output.startswith('.F..\n')
+    assert f'AssertionError: False is not true : \nFile {transcript_files[1]}, line ' in output
+    assert output.endswith('\n\nFAILED (failures=1)\n')
+
+
+def test_run_transcripts_in_pool_error(request):
+    import unittest
+
+    test_dir = os.path.dirname(request.module.__file__)
+    transcript_file = os.path.join(test_dir, 'transcripts', 'does_not_exist.txt')
+
+    stream = StdSim(sys.stderr)
+    runner = unittest.TextTestRunner(stream=stream)
+    test_results = transcript.run_transcripts_in_pool(CmdLineApp, [transcript_file], runner, max_workers=1)
+
+    assert len(test_results.errors) == 1
+    assert 'FileNotFoundError' in stream.read()
+
+
+def test_transcript_workers_invalid():
+    with pytest.raises(ValueError) as excinfo:
+        CmdLineApp(allow_cli_args=False, transcript_workers=0)
+    assert 'transcript_workers must be greater than 0' in str(excinfo.value)
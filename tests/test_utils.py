@@ -249,6 +249,103 @@ def test_stdsim_pause_storage(stdout_sim):
     assert stdout_sim.getbytes() == b''
 
 
+def test_stdsim_chunked_reads():
+    stdsim = cu.StdSim(sys.stdout)
+    chunk = b'a' * cu._ChunkedBytes.tail_size
+    stdsim.buffer.write(chunk)
+    stdsim.buffer.write(b'bc')
+    stdsim.write('de')
+
+    # Read across the boundaries of chunks and the tail
+    assert stdsim.read(10) == 'a' * 10
+    assert stdsim.read(len(chunk) - 9) == 'a' * (len(chunk) - 10) + 'b'
+    assert stdsim.getvalue() == 'cde'
+    assert stdsim.read(None) == 'cde'
+    assert stdsim.read() == ''
+
+
+def test_stdsim_max_retained():
+    stdsim = cu.StdSim(sys.stdout, max_retained=5)
+    stdsim.write('Hello')
+    stdsim.write(' World')
+    assert stdsim.getvalue() == 'World'
+
+    stdsim.buffer.write(b'a' * (cu._ChunkedBytes.tail_size * 2))
+    stdsim.write('xyz')
+    assert stdsim.readbytes() == b'aaxyz'
+
+    stdsim = cu.StdSim(sys.stdout, max_retained=0)
+    stdsim.write('Hello')
+    assert stdsim.getvalue() == ''
+
+
+def test_stdsim_max_retained_memory():
+    import gc
+    import tracemalloc
+
+    stdsim = cu.StdSim(sys.stdout, max_retained=1024)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        stdsim.buffer.write(b'a' * 5_000_000)
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # The trimmed output doesn't keep the large write alive
+    assert current < 100_000
+    assert stdsim.getbytes() == b'a' * 1024
+
+
+def test_stdsim_spill():
+    stdsim = cu.StdSim(sys.stdout, spill_size=4)
+    stdsim.write('Hel')
+    assert stdsim._contents._file is None
+    stdsim.write('lo World')
+    assert stdsim._contents._file is not None
+    stdsim.write('!')
+    assert stdsim.getvalue() == 'Hello World!'
+
+    # Read from the file and then memory
+    assert stdsim.read(4) == 'Hell'
+    assert stdsim.read(8) == 'o World!'
+    assert stdsim.getvalue() == ''
+
+    stdsim.write('Hello World')
+    assert stdsim.read() == 'Hello World'
+    stdsim.write('Hello World')
+    stdsim.clear()
+    assert stdsim._contents._file is None
+    assert stdsim.getvalue() == ''
+
+
+@pytest.mark.parametrize(
+    'kwargs',
+    [
+        dict(max_retained=-1),
+        dict(spill_size=0),
+        dict(max_retained=10, spill_size=10),
+    ],
+)
+def test_stdsim_invalid_limits(kwargs):
+    with pytest.raises(ValueError):
+        cu.StdSim(sys.stdout, **kwargs)
+
+
+def test_stdsim_byte_buf(stdout_sim):
+    stdout_sim.write('Hello')
+    assert stdout_sim.buffer.byte_buf == b'Hello'
+
+    # The value is read-only, so changes must be made by assigning to the property
+    with pytest.raises(AttributeError):
+        stdout_sim.buffer.byte_buf.clear()
+    stdout_sim.buffer.byte_buf += b' World'
+    assert stdout_sim.getvalue() == 'Hello World'
+    stdout_sim.buffer.byte_buf = b'World'
+    assert stdout_sim.getvalue() == 'World'
+
+
 def test_stdsim_line_buffering(base_app):
     # This exercises the case of writing binary data that contains new lines/carriage returns to a StdSim
     # when line buffering is on. The output should immediately be flushed to the underlying stream.
@@ -271,6 +368,34 @@ def test_stdsim_line_buffering(base_app):
     assert os.path.getsize(file.name) == saved_size + len(bytes_to_write)
 
 
+@pytest.mark.skipif(sys.platform.startswith('win'), reason="Windows doesn't use the executable bit")
+def test_get_exes_in_path(tmp_path, monkeypatch):
+    def make_file(name, executable=True):
+        path = tmp_path / name
+        path.write_text('')
+        path.chmod(0o755 if executable else 0o644)
+
+    make_file('foo')
+    make_file('foobar')
+    make_file('.foo_hidden')
+    make_file('foo_not_exe', executable=False)
+    (tmp_path / 'foo_dir').mkdir()
+
+    monkeypatch.setenv('PATH', str(tmp_path))
+    assert cu.get_exes_in_path('foo') == ['foo', 'foobar']
+    assert cu.get_exes_in_path('.foo') == ['.foo_hidden']
+    assert cu.get_exes_in_path('fo*') == []
+
+    # Changing a directory updates the index
+    make_file('food')
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1_000_000_000))
+    assert cu.get_exes_in_path('foo') == ['foo', 'foobar', 'food']
+
+    # Changing PATH updates the index
+    monkeypatch.setenv('PATH', str(tmp_path / 'foo_dir'))
+    assert cu.get_exes_in_path('foo') == []
+
+
 @pytest.fixture
 def pr_none():
     import subprocess
@@ -328,6 +453,30 @@ def test_proc_reader_terminate(pr_none):
         assert ret_code == -signal.SIGTERM
 
 
+def test_proc_reader_capture():
+    import subprocess
+
+    command = f'{sys.executable} -c "import sys; sys.stdout.write(\'out\' * 1000); sys.stderr.write(\'err\')"'
+    proc = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    stdout_sim = cu.StdSim(sys.stdout)
+    stderr_sim = cu.StdSim(sys.stderr)
+    pr = cu.ProcReader(proc, stdout_sim, stderr_sim, chunk_size=7)
+    pr.wait()
+
+    assert proc.returncode == 0
+    assert stdout_sim.getvalue() == 'out' * 1000
+    assert stderr_sim.getvalue() == 'err'
+
+
+def test_proc_reader_invalid_chunk_size(pr_none):
+    with pytest.raises(ValueError) as excinfo:
+        cu.ProcReader(pr_none._proc, None, None, chunk_size=0)
+    assert 'chunk_size must be greater than 0' in str(excinfo.value)
+    pr_none.terminate()
+    pr_none.wait()
+
+
 @pytest.fixture
 def context_flag():
     return cu.ContextFlag()
@@ -498,6 +647,43 @@ def test_truncate_with_style():
     truncated = cu.truncate_line(line, max_width)
     assert truncated == 'lo' + HORIZONTAL_ELLIPSIS + filtered_after_text
 
+    # Styles at the point of truncation are kept and styles after it are appended
+    line = 'lo' + Fg.RED + 'ng' + Fg.GREEN + 'er'
+    max_width = 3
+    truncated = cu.truncate_line(line, max_width)
+    assert truncated == 'lo' + Fg.RED + HORIZONTAL_ELLIPSIS + Fg.GREEN
+
+    # Zero width characters stay with the character they follow
+    line = before_text + 'e\u0301e\u0301e\u0301e\u0301' + after_text
+    max_width = 3
+    truncated = cu.truncate_line(line, max_width)
+    assert truncated == before_text + 'e\u0301e\u0301' + HORIZONTAL_ELLIPSIS + filtered_after_text
+
+
+def test_truncate_styled_text():
+    from cmd2 import (
+        Fg,
+        StyledText,
+    )
+
+    line = StyledText(Fg.BLUE + 'long' + Fg.RESET)
+    truncated = cu.truncate_line(line, 3)
+    assert isinstance(truncated, StyledText)
+    assert truncated == Fg.BLUE + 'lo' + HORIZONTAL_ELLIPSIS + Fg.RESET
+    assert truncated.plain == 'lo' + HORIZONTAL_ELLIPSIS
+    assert truncated.width == 3
+
+    # A StyledText which fits is returned as is
+    assert cu.truncate_line(line, 4) is line
+
+    # Tabs are replaced
+    truncated = cu.truncate_line(StyledText('has\ttab'), 9)
+    assert isinstance(truncated, StyledText)
+    assert truncated == 'has    t' + HORIZONTAL_ELLIPSIS
+
+    # A str is returned when a str is passed in
+    assert type(cu.truncate_line(str(line), 3)) is str
+
 
 def test_align_text_fill_char_is_tab():
     text = 'foo'
@@ -555,6 +741,23 @@ def test_align_text_with_style():
     assert aligned == (left_fill + line_1_text + right_fill + '\n' + left_fill + line_2_text + right_fill)
 
 
+@pytest.mark.parametrize(
+    'text',
+    ['line1', 'has\ttab', ansi.style('line1', fg=ansi.Fg.LIGHT_BLUE), ansi.style('line1\nline2', bg=ansi.Bg.BLUE)],
+)
+@pytest.mark.parametrize('truncate', [False, True])
+def test_align_text_styled_text(text, truncate):
+    from cmd2 import (
+        StyledText,
+    )
+
+    # A StyledText is aligned the same way as a str
+    for width in (3, 12):
+        expected = cu.align_text(text, cu.TextAlignment.CENTER, fill_char='-', width=width, truncate=truncate)
+        aligned = cu.align_text(StyledText(text), cu.TextAlignment.CENTER, fill_char='-', width=width, truncate=truncate)
+        assert aligned == expected
+
+
 def test_align_text_width_is_too_small():
     text = 'foo'
     fill_char = '-'